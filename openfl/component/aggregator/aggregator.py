@@ -5,11 +5,13 @@
 
 import logging
 import queue
-import time
-from threading import Lock
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import get_context
+from threading import Event, Lock
 from typing import List, Optional
 
 import openfl.callbacks as callbacks_module
+from openfl.component.aggregator.process_aggregation import ProcessPoolAggregation
 from openfl.component.aggregator.straggler_handling import CutoffTimePolicy, StragglerPolicy
 from openfl.databases import PersistentTensorDB, TensorDB
 from openfl.interface.aggregation_functions import WeightedAverage
@@ -20,6 +22,9 @@ from openfl.utilities import TaskResultKey, TensorKey, change_tags
 
 logger = logging.getLogger(__name__)
 
+# Seconds a request for a tensor that is not aggregated yet waits for it
+AGGREGATED_TENSOR_TIMEOUT = 60
+
 
 class Aggregator:
     """An Aggregator is the central node in federated learning.
@@ -58,6 +63,14 @@ class Aggregator:
             results.
         collaborator_task_weight (dict): Dict of col task weight.
         lock: A threading Lock object used to ensure thread-safe operations.
+        incremental_aggregation* (bool): If True, task results are decoded
+            and folded into the running aggregates on a worker pool as they
+            arrive. The collaborator is answered once its task results are
+            folded, so that it resends them if this fails.
+        aggregation_workers* (int): Number of workers that aggregate the
+            tensors of a task in parallel at the end of the round.
+        aggregation_executor* (str): Kind of the aggregation workers,
+            'thread' or 'process'.
 
     .. note::
         - plan setting
@@ -84,6 +97,11 @@ class Aggregator:
         callbacks: Optional[List] = None,
         persist_checkpoint=True,
         persistent_db_path=None,
+        persistent_db_sidecar_threshold=None,
+        persist_decoded_task_results=False,
+        incremental_aggregation=False,
+        aggregation_workers=1,
+        aggregation_executor="thread",
     ):
         """Initializes the Aggregator.
 
@@ -109,7 +127,30 @@ class Aggregator:
                 Defaults to 1.
             initial_tensor_dict (dict, optional): Initial tensor dictionary.
             callbacks: List of callbacks to be used during the experiment.
+            persistent_db_sidecar_threshold (int, optional): Size in bytes
+                from which the persistent checkpoint stores tensors in .npy
+                files next to the database. Defaults to None, i.e. all
+                tensors are stored in the database.
+            persist_decoded_task_results (bool, optional): Whether to also
+                store the decoded tensors of each task result in the
+                persistent checkpoint, so that recovery does not decode them
+                again. This writes a float copy of every task result to the
+                database as it is processed. Defaults to False.
+            incremental_aggregation (bool, optional): Whether to process task
+                results on a worker pool as they arrive. Defaults to False.
+            aggregation_workers (int, optional): Number of workers that
+                aggregate the tensors of a task in parallel. Defaults to 1.
+            aggregation_executor (str, optional): 'thread' to aggregate on a
+                thread pool, or 'process' to additionally run stateless
+                aggregation functions in worker processes. Defaults to
+                'thread'.
         """
+        if aggregation_executor not in ("thread", "process"):
+            raise ValueError(
+                f"Unknown aggregation executor {aggregation_executor!r}, "
+                "expected 'thread' or 'process'"
+            )
+
         self.round_number = 0
         self.next_model_round_number = 0
 
@@ -141,6 +182,11 @@ class Aggregator:
 
         self.quit_job_sent_to = []
 
+        # Callbacks of long-polling GetTasks requests, called when the round
+        # ends. [(round_number, callback)]
+        self._round_callbacks = []
+        self._round_callbacks_lock = Lock()
+
         self.tensor_db = TensorDB()
         if persist_checkpoint:
             persistent_db_path = persistent_db_path or "tensor.db"
@@ -148,10 +194,13 @@ class Aggregator:
                 "Persistent checkpoint is enabled, setting persistent db at path %s",
                 persistent_db_path,
             )
-            self.persistent_db = PersistentTensorDB(persistent_db_path)
+            self.persistent_db = PersistentTensorDB(
+                persistent_db_path, sidecar_threshold=persistent_db_sidecar_threshold
+            )
         else:
             logger.info("Persistent checkpoint is disabled")
             self.persistent_db = None
+        self.persist_decoded_task_results = persist_decoded_task_results
         # FIXME: I think next line generates an error on the second round
         # if it is set to 1 for the aggregator.
         self.db_store_rounds = db_store_rounds
@@ -180,6 +229,38 @@ class Aggregator:
         self.lock = Lock()
         self.use_delta_updates = use_delta_updates
 
+        # In incremental mode, task results that have been received but are
+        # still being folded into the running aggregates
+        self.incremental_aggregation = incremental_aggregation
+        self._pending_task_results = {}  # {TaskResultKey: Future}
+        if incremental_aggregation:
+            self._aggregation_executor = ThreadPoolExecutor(thread_name_prefix="aggregation")
+        else:
+            self._aggregation_executor = None
+
+        # Pools that aggregate the tensors of a task in parallel. These are
+        # separate from the incremental aggregation pool, whose workers may
+        # end the round and wait on them.
+        self.aggregation_workers = aggregation_workers
+        self._tensor_executor = None
+        self._process_executor = None
+        if aggregation_workers > 1:
+            self._tensor_executor = ThreadPoolExecutor(
+                max_workers=aggregation_workers, thread_name_prefix="tensor_aggregation"
+            )
+            if aggregation_executor == "process":
+                self._process_executor = ProcessPoolExecutor(
+                    max_workers=aggregation_workers, mp_context=get_context("spawn")
+                )
+
+        # Checkpoints are written in the order they are taken on a single
+        # background thread, so that saving the model does not hold up the
+        # round.
+        self._checkpoint_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint"
+        )
+        self._checkpoint_future = None
+
         self.model = None  # Initialize the model attribute to None
 
         # Callbacks
@@ -257,31 +338,56 @@ class Aggregator:
             return recovered
 
         logger.info("Recovery - Replaying saved task results")
-        task_id = 1
-        while True:
-            task_result = self.persistent_db.get_task_result_by_id(task_id)
-            if not task_result:
-                break
-            recovered = True
-            collaborator_name = task_result["collaborator_name"]
-            round_number = task_result["round_number"]
-            task_name = task_result["task_name"]
-            data_size = task_result["data_size"]
-            serialized_tensors = task_result["named_tensors"]
-            named_tensors = [
-                NamedTensor.FromString(serialized_tensor)
-                for serialized_tensor in serialized_tensors
-            ]
-            logger.info(
-                "Recovery - Replaying task results %s %s %s",
-                collaborator_name,
-                round_number,
-                task_name,
-            )
-            self.process_task_results(
-                collaborator_name, round_number, task_name, data_size, named_tensors
-            )
-            task_id += 1
+        # Task results that were decoded before the restart are restored in
+        # parallel from their decoded tensors, the others are decoded again
+        decoded_task_results = self.persistent_db.load_decoded_task_results()
+        with ThreadPoolExecutor(thread_name_prefix="recovery") as executor:
+            restored = []
+            for task_result in self.persistent_db.list_task_results():
+                recovered = True
+                collaborator_name = task_result["collaborator_name"]
+                round_number = task_result["round_number"]
+                task_name = task_result["task_name"]
+                data_size = task_result["data_size"]
+                tensors = decoded_task_results.get((collaborator_name, round_number, task_name))
+                if tensors is not None:
+                    logger.info(
+                        "Recovery - Restoring decoded task results %s %s %s",
+                        collaborator_name,
+                        round_number,
+                        task_name,
+                    )
+                    restored.append(
+                        executor.submit(
+                            self._restore_task_results,
+                            collaborator_name,
+                            round_number,
+                            task_name,
+                            data_size,
+                            tensors,
+                        )
+                    )
+                    continue
+
+                serialized_tensors = self.persistent_db.get_task_result_by_id(task_result["id"])[
+                    "named_tensors"
+                ]
+                named_tensors = [
+                    NamedTensor.FromString(serialized_tensor)
+                    for serialized_tensor in serialized_tensors
+                ]
+                logger.info(
+                    "Recovery - Replaying task results %s %s %s",
+                    collaborator_name,
+                    round_number,
+                    task_name,
+                )
+                self.process_task_results(
+                    collaborator_name, round_number, task_name, data_size, named_tensors
+                )
+            for future in restored:
+                future.result()
+        self._wait_for_pending_task_results()
         return recovered
 
     def _load_initial_tensors(self):
@@ -332,6 +438,10 @@ class Aggregator:
     def _save_model(self, round_number, file_path):
         """Save the best or latest model.
 
+        The tensors of the model are taken from TensorDB right away, while the
+        model file and the persistent checkpoint are written in the
+        background.
+
         Args:
             round_number (int): Model round to be saved.
             file_path (str): Either the best model or latest model file path.
@@ -340,12 +450,9 @@ class Aggregator:
             None
         """
         # Extract the model from TensorDB and set it to the new model
-        og_tensor_dict, _ = utils.deconstruct_model_proto(
-            self.model, compression_pipeline=self.compression_pipeline
-        )
         tensor_keys = [
-            TensorKey(k, self.uuid, round_number, False, ("model",))
-            for k, v in og_tensor_dict.items()
+            TensorKey(tensor.name, self.uuid, round_number, False, ("model",))
+            for tensor in self.model.tensors
         ]
         tensor_dict = {}
         tensor_tuple_dict = {}
@@ -363,25 +470,71 @@ class Aggregator:
                 return
         if file_path == self.best_state_path:
             self.best_tensor_dict = tensor_dict
+        persist = False
         if file_path == self.last_state_path:
-            # Transaction to persist/delete all data needed to increment the round
             if self.persistent_db:
+                persist = True
                 if self.next_model_round_number > 0:
                     next_round_tensors = self.tensor_db.get_tensors_by_round_and_tags(
                         self.next_model_round_number, ("model",)
                     )
-                self.persistent_db.finalize_round(
-                    tensor_tuple_dict, next_round_tensors, round_number, self.best_model_score
-                )
-                logger.info(
-                    "Persist model and clean task result for round %s",
-                    round_number,
-                )
             self.last_tensor_dict = tensor_dict
-        self.model = utils.construct_model_proto(
-            tensor_dict, round_number, self.compression_pipeline
+        future = self._checkpoint_executor.submit(
+            self._write_model,
+            round_number,
+            file_path,
+            tensor_dict,
+            tensor_tuple_dict if persist else None,
+            next_round_tensors,
+            self.best_model_score,
         )
-        utils.dump_proto(self.model, file_path)
+        future.add_done_callback(self._log_checkpoint_error)
+        self._checkpoint_future = future
+
+    def _write_model(
+        self,
+        round_number,
+        file_path,
+        tensor_dict,
+        tensor_tuple_dict,
+        next_round_tensors,
+        best_model_score,
+    ):
+        """Write a model taken by `_save_model` to its file.
+
+        Args:
+            round_number (int): Model round to be saved.
+            file_path (str): Either the best model or latest model file path.
+            tensor_dict (dict): Tensors of the model by name.
+            tensor_tuple_dict (dict): Tensors of the model by TensorKey, to
+                persist the round with, or None.
+            next_round_tensors (dict): Tensors of the next round model.
+            best_model_score (float): Best model score to persist.
+        """
+        if tensor_tuple_dict is not None:
+            # Transaction to persist/delete all data needed to increment the round
+            self.persistent_db.finalize_round(
+                tensor_tuple_dict, next_round_tensors, round_number, best_model_score
+            )
+            logger.info(
+                "Persist model and clean task result for round %s",
+                round_number,
+            )
+        model = utils.construct_model_proto(tensor_dict, round_number, self.compression_pipeline)
+        utils.dump_proto(model, file_path)
+        self.model = model
+
+    @staticmethod
+    def _log_checkpoint_error(future):
+        """Log the error of a failed checkpoint, which has no caller to raise to."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Failed to save model", exc_info=future.exception())
+
+    def _wait_for_checkpoints(self):
+        """Wait until all models taken so far are written."""
+        future = self._checkpoint_future
+        if future is not None:
+            wait([future])
 
     def valid_collaborator_cn_and_id(self, cert_common_name, collaborator_common_name):
         """
@@ -438,9 +591,82 @@ class Aggregator:
         """
         return self.round_number >= self.rounds_to_train
 
-    def get_tasks(self, collaborator_name):
+    def add_round_callback(self, round_number, callback):
+        """Call `callback` once round `round_number` is over.
+
+        The callback is called right away if the round is already over.
+        Otherwise it is called by the thread that ends the round, so it must
+        return quickly.
+
+        Args:
+            round_number (int): The round to wait for.
+            callback (Callable[[], None]): The function to call.
+        """
+        with self._round_callbacks_lock:
+            if self.round_number == round_number:
+                self._round_callbacks.append((round_number, callback))
+                return
+        callback()
+
+    def remove_round_callback(self, round_number, callback):
+        """Remove a callback added with `add_round_callback` that was not called yet.
+
+        Args:
+            round_number (int): The round of the callback.
+            callback (Callable[[], None]): The function to remove.
+        """
+        with self._round_callbacks_lock:
+            if (round_number, callback) in self._round_callbacks:
+                self._round_callbacks.remove((round_number, callback))
+
+    def _call_round_callbacks(self):
+        """Call the callbacks waiting for the end of the round."""
+        with self._round_callbacks_lock:
+            round_callbacks, self._round_callbacks = self._round_callbacks, []
+        for _, callback in round_callbacks:
+            callback()
+
+    def get_tasks(self, collaborator_name, wait_timeout=0):
         """RPC called by a collaborator to determine which tasks to perform.
 
+        If there are no tasks for the collaborator in the current round, e.g.
+        because it already completed them, the call is held for up to
+        `wait_timeout` seconds until the round ends (long polling). This
+        starts the next round on the collaborator as soon as the current one
+        is over, instead of after it slept for `sleep_time`.
+
+        Args:
+            collaborator_name (str): Requested collaborator name.
+            wait_timeout (float, optional): Seconds to wait for tasks.
+                Defaults to 0.
+
+        Returns:
+            tasks (list[str]): List of tasks to be performed by the requesting
+                collaborator for the current round.
+            round_number (int): Actual round number.
+            sleep_time (int): Sleep time. 0 if the collaborator waited for
+                tasks and can ask again right away.
+            time_to_quit (bool): Whether it's time to quit.
+        """
+        tasks, round_number, sleep_time, time_to_quit = self._get_tasks(collaborator_name)
+        if tasks or time_to_quit or wait_timeout <= 0:
+            return tasks, round_number, sleep_time, time_to_quit
+
+        round_over = Event()
+        self.add_round_callback(round_number, round_over.set)
+        try:
+            round_over.wait(wait_timeout)
+        finally:
+            self.remove_round_callback(round_number, round_over.set)
+
+        tasks, round_number, sleep_time, time_to_quit = self._get_tasks(collaborator_name)
+        if not tasks:
+            sleep_time = 0
+        return tasks, round_number, sleep_time, time_to_quit
+
+    def _get_tasks(self, collaborator_name):
+        """Determine which tasks the collaborator performs in the current round.
+
         Args:
             collaborator_name (str): Requested collaborator name.
 
@@ -486,7 +712,7 @@ class Aggregator:
             tasks = [
                 t
                 for t in tasks
-                if not self._collaborator_task_completed(collaborator_name, t, self.round_number)
+                if not self._collaborator_task_received(collaborator_name, t, self.round_number)
             ]
             if collaborator_name in self.stragglers:
                 tasks = []
@@ -495,7 +721,7 @@ class Aggregator:
             tasks = [
                 t
                 for t in tasks
-                if not self._collaborator_task_completed(
+                if not self._collaborator_task_received(
                     collaborator_name, t.name, self.round_number
                 )
             ]
@@ -535,6 +761,8 @@ class Aggregator:
             f"Applying {self.straggler_handling_policy.__class__.__name__} policy."
         )
 
+        # Results that arrived before the cutoff still count
+        self._wait_for_pending_task_results()
         with self.lock:
             # Check if minimum collaborators reported results
             self._end_of_round_with_stragglers_check()
@@ -578,6 +806,34 @@ class Aggregator:
         else:
             compress_lossless = False
 
+        agg_tensor_key = self.get_aggregated_tensor_key(tensor_name, round_number, report, tags)
+
+        nparray = self.tensor_db.get_tensor_from_cache(agg_tensor_key)
+        if nparray is None:
+            logger.debug("Waiting for tensor_key %s", agg_tensor_key)
+            nparray = self.tensor_db.wait_for_tensor(
+                agg_tensor_key, timeout=AGGREGATED_TENSOR_TIMEOUT
+            )
+
+        if nparray is None:
+            raise ValueError(f"Aggregator does not have an aggregated tensor for {agg_tensor_key}")
+
+        return self._get_named_tensor(
+            agg_tensor_key, nparray, send_model_deltas=True, compress_lossless=compress_lossless
+        )
+
+    def get_aggregated_tensor_key(self, tensor_name, round_number, report, tags):
+        """Resolve the TensorDB key of the tensor served for a collaborator request.
+
+        Args:
+            tensor_name (str): Name of the tensor.
+            round_number (int): Actual round number.
+            report (bool): Whether to report.
+            tags (tuple[str, ...]): Tags.
+
+        Returns:
+            agg_tensor_key (TensorKey): The key of the tensor in the TensorDB.
+        """
         # TODO the TensorDB doesn't support compressed data yet.
         #  The returned tensor will
         # be recompressed anyway.
@@ -586,34 +842,40 @@ class Aggregator:
         if "lossy_compressed" in tags:
             tags = change_tags(tags, remove_field="lossy_compressed")
 
-        tensor_key = TensorKey(tensor_name, self.uuid, round_number, report, tags)
+        tensor_key = TensorKey(tensor_name, self.uuid, round_number, report, tuple(tags))
         tensor_name, origin, round_number, report, tags = tensor_key
 
         if "aggregated" in tags and "delta" in tags and round_number != 0:
-            agg_tensor_key = TensorKey(tensor_name, origin, round_number, report, ("aggregated",))
-        else:
-            agg_tensor_key = tensor_key
+            return TensorKey(tensor_name, origin, round_number, report, ("aggregated",))
+        return tensor_key
 
-        nparray = self.tensor_db.get_tensor_from_cache(agg_tensor_key)
-
-        start_retrieving_time = time.time()
-        while nparray is None:
-            logger.debug("Waiting for tensor_key %s", agg_tensor_key)
-            time.sleep(5)
-            nparray = self.tensor_db.get_tensor_from_cache(agg_tensor_key)
-            if (time.time() - start_retrieving_time) > 60:
-                break
+    def _get_named_tensor(self, tensor_key, nparray, send_model_deltas, compress_lossless):
+        """Get the NamedTensor Protobuf of a tensor, building it on a cache miss.
 
-        if nparray is None:
-            raise ValueError(f"Aggregator does not have an aggregated tensor for {tensor_key}")
+        The same tensor is requested by every collaborator, so the NamedTensor
+        is cached in the TensorDB and only built (delta, compression and
+        serialization) once per round.
 
-        # quite a bit happens in here, including compression, delta handling,
-        # etc...
-        # we might want to cache these as well
-        named_tensor = self._nparray_to_named_tensor(
-            agg_tensor_key, nparray, send_model_deltas=True, compress_lossless=compress_lossless
-        )
+        Args:
+            tensor_key (TensorKey): Tensor key.
+            nparray (np.array): Numpy array.
+            send_model_deltas (bool): Whether to send model deltas.
+            compress_lossless (bool): Whether to compress lossless.
 
+        Returns:
+            named_tensor (protobuf): The NamedTensor. It is shared between
+                requests and must not be modified.
+        """
+        encoding = (send_model_deltas, compress_lossless)
+        named_tensor = self.tensor_db.get_encoded_tensor_from_cache(tensor_key, encoding)
+        if named_tensor is None:
+            named_tensor = self._nparray_to_named_tensor(
+                tensor_key,
+                nparray,
+                send_model_deltas=send_model_deltas,
+                compress_lossless=compress_lossless,
+            )
+            self.tensor_db.cache_encoded_tensor(tensor_key, encoding, named_tensor)
         return named_tensor
 
     def _nparray_to_named_tensor(self, tensor_key, nparray, send_model_deltas, compress_lossless):
@@ -636,19 +898,25 @@ class Aggregator:
         tensor_name, origin, round_number, report, tags = tensor_key
         # if we have an aggregated tensor, we can make a delta
         if "aggregated" in tags and send_model_deltas:
-            # Should get the pretrained model to create the delta. If training
-            # has happened, Model should already be stored in the TensorDB
-            model_tk = TensorKey(tensor_name, origin, round_number - 1, report, ("model",))
+            # The delta is cached by _prepare_trained. Otherwise, get the
+            # pretrained model to create it. If training has happened, Model
+            # should already be stored in the TensorDB
+            delta_tensor_key = TensorKey(
+                tensor_name, origin, round_number, report, change_tags(tags, add_field="delta")
+            )
+            delta_nparray = self.tensor_db.get_tensor_from_cache(delta_tensor_key)
+            if delta_nparray is None:
+                model_tk = TensorKey(tensor_name, origin, round_number - 1, report, ("model",))
 
-            model_nparray = self.tensor_db.get_tensor_from_cache(model_tk)
+                model_nparray = self.tensor_db.get_tensor_from_cache(model_tk)
 
-            assert model_nparray is not None, (
-                "The original model layer should be present if the latest "
-                "aggregated model is present"
-            )
-            delta_tensor_key, delta_nparray = self.tensor_codec.generate_delta(
-                tensor_key, nparray, model_nparray
-            )
+                assert model_nparray is not None, (
+                    "The original model layer should be present if the latest "
+                    "aggregated model is present"
+                )
+                delta_tensor_key, delta_nparray = self.tensor_codec.generate_delta(
+                    tensor_key, nparray, model_nparray
+                )
             delta_comp_tensor_key, delta_comp_nparray, metadata = self.tensor_codec.compress(
                 delta_tensor_key, delta_nparray, lossless=compress_lossless
             )
@@ -693,6 +961,26 @@ class Aggregator:
         task_key = TaskResultKey(task_name, collaborator, round_num)
         return task_key in self.collaborator_tasks_results
 
+    def _collaborator_task_received(self, collaborator, task_name, round_num):
+        """Check if the results of a task have been received, even if they
+        are still being processed.
+
+        Args:
+         collaborator (str): Collaborator to check.
+         task_name (str): The name of the task (TaskRunner function).
+         round_num (int): Round number.
+
+         Returns:
+             bool: Whether or not the aggregator has received the results of
+                 the task for this round.
+        """
+        task_key = TaskResultKey(task_name, collaborator, round_num)
+        return task_key in self.collaborator_tasks_results or task_key in self._pending_task_results
+
+    def _wait_for_pending_task_results(self):
+        """Block until all task results received so far have been processed."""
+        wait(list(self._pending_task_results.values()))
+
     def send_local_task_results(
         self,
         collaborator_name,
@@ -719,6 +1007,9 @@ class Aggregator:
         # Save task and its metadata for recovery
         serialized_tensors = [tensor.SerializeToString() for tensor in named_tensors]
         if self.persistent_db:
+            # The checkpoint of the previous round deletes its task results,
+            # so it has to be written before any of the next round are saved
+            self._wait_for_checkpoints()
             self.persistent_db.save_task_results(
                 collaborator_name, round_number, task_name, data_size, serialized_tensors
             )
@@ -729,9 +1020,13 @@ class Aggregator:
             f"Collaborator {collaborator_name} is sending task results "
             f"for {task_name}, round {round_number}"
         )
-        self.process_task_results(
+        future = self.process_task_results(
             collaborator_name, round_number, task_name, data_size, named_tensors
         )
+        if future is not None:
+            # The collaborator only resends the task results if processing
+            # them fails before it is answered
+            future.result()
 
     def process_task_results(
         self,
@@ -741,29 +1036,167 @@ class Aggregator:
         data_size,
         named_tensors,
     ):
+        """Process the task results of a collaborator.
+
+        In incremental mode, the task results are processed on the worker
+        pool.
+
+        Args:
+            collaborator_name (str): Collaborator name.
+            round_number (int): Round number.
+            task_name (str): Task name.
+            data_size (int): Data size.
+            named_tensors (protobuf NamedTensor): Named tensors.
+
+        Returns:
+            Future: The future of the processing on the worker pool, or None
+                if the task results were processed or ignored.
+        """
+        task_key = self._accept_task_results(collaborator_name, round_number, task_name)
+        if task_key is None:
+            return None
+
+        if self.incremental_aggregation:
+            future = self._aggregation_executor.submit(
+                self._fold_pending_task_results, task_key, data_size, named_tensors
+            )
+            self._pending_task_results[task_key] = future
+            future.add_done_callback(lambda f: self._on_task_results_folded(task_key, f))
+            return future
+
+        self._fold_task_results(task_key, data_size, named_tensors)
+        return None
+
+    def _accept_task_results(self, collaborator_name, round_number, task_name):
+        """Check whether task results are expected from a collaborator.
+
+        Args:
+            collaborator_name (str): Collaborator name.
+            round_number (int): Round number.
+            task_name (str): Task name.
+
+        Returns:
+            TaskResultKey: The task result key, or None if the task results
+                must be ignored.
+        """
         if self._time_to_quit() or collaborator_name in self.stragglers:
             logger.warning(
                 f"STRAGGLER: Collaborator {collaborator_name} is reporting results "
                 f"after task {task_name} has finished."
             )
-            return
+            return None
 
         if self.round_number != round_number:
             logger.warning(
                 f"Collaborator {collaborator_name} is reporting results"
                 f" for the wrong round: {round_number}. Ignoring..."
             )
-            return
+            return None
 
         task_key = TaskResultKey(task_name, collaborator_name, round_number)
 
         # we mustn't have results already
-        if self._collaborator_task_completed(collaborator_name, task_name, round_number):
+        if self._collaborator_task_received(collaborator_name, task_name, round_number):
             logger.warning(
                 f"Aggregator already has task results from collaborator {collaborator_name}"
                 f" for task {task_key}"
             )
+            return None
+
+        return task_key
+
+    def _restore_task_results(self, collaborator_name, round_number, task_name, data_size, tensors):
+        """Process task results restored from their decoded tensors.
+
+        Args:
+            collaborator_name (str): Collaborator name.
+            round_number (int): Round number.
+            task_name (str): Task name.
+            data_size (int): Data size.
+            tensors (dict): The decoded tensors, {TensorKey: np.ndarray}.
+        """
+        task_key = self._accept_task_results(collaborator_name, round_number, task_name)
+        if task_key is None:
             return
+        self.tensor_db.cache_tensor(tensors)
+        self._fold_decoded_task_results(task_key, data_size, tensors)
+
+    def _on_task_results_folded(self, task_key, future):
+        """Forget a processed task result, logging any processing error.
+
+        Args:
+            task_key (TaskResultKey): The task result key.
+            future (Future): The future of the `_fold_pending_task_results`
+                call.
+        """
+        self._pending_task_results.pop(task_key, None)
+        if future.exception() is not None:
+            logger.error(
+                "Could not process task results %s",
+                task_key,
+                exc_info=future.exception(),
+            )
+
+    def _fold_pending_task_results(self, task_key, data_size, named_tensors):
+        """Fold task results on the worker pool.
+
+        If this fails, the task results are forgotten before the future
+        completes, so that the collaborator can send them again.
+
+        Args:
+            task_key (TaskResultKey): The task result key.
+            data_size (int): Data size.
+            named_tensors (protobuf NamedTensor): Named tensors.
+        """
+        try:
+            self._fold_task_results(task_key, data_size, named_tensors)
+        except Exception:
+            self._pending_task_results.pop(task_key, None)
+            raise
+
+    def _fold_task_results(self, task_key, data_size, named_tensors):
+        """Decode task results, fold them into the running aggregates, and
+        check for the end of the round.
+
+        Args:
+            task_key (TaskResultKey): The task result key.
+            data_size (int): Data size.
+            named_tensors (protobuf NamedTensor): Named tensors.
+
+        Returns:
+            None
+        """
+        task_name, collaborator_name, round_number = task_key
+
+        tensors = {}
+        for named_tensor in named_tensors:
+            # quite a bit happens in here, including decompression, delta
+            # handling, etc...
+            tensor_key, value = self._process_named_tensor(named_tensor, collaborator_name)
+            tensors[tensor_key] = value
+
+        if self.persistent_db and self.persist_decoded_task_results:
+            # Recovery restores these instead of decoding the task results
+            # again
+            self.persistent_db.save_decoded_task_results(
+                collaborator_name, round_number, task_name, tensors
+            )
+
+        self._fold_decoded_task_results(task_key, data_size, tensors)
+
+    def _fold_decoded_task_results(self, task_key, data_size, tensors):
+        """Fold decoded task results into the running aggregates, and check
+        for the end of the round.
+
+        Args:
+            task_key (TaskResultKey): The task result key.
+            data_size (int): Data size.
+            tensors (dict): The decoded tensors, {TensorKey: np.ndarray}.
+
+        Returns:
+            None
+        """
+        task_name, collaborator_name, round_number = task_key
 
         # By giving task_key it's own weight, we can support different
         # training/validation weights
@@ -774,11 +1207,20 @@ class Aggregator:
         # initialize the list of tensors that go with this task
         # Setting these incrementally is leading to missing values
         task_results = []
+        task_agg_function = self.assigner.get_aggregation_type_for_task(task_name)
 
-        for named_tensor in named_tensors:
-            # quite a bit happens in here, including decompression, delta
-            # handling, etc...
-            tensor_key, value = self._process_named_tensor(named_tensor, collaborator_name)
+        for tensor_key, value in tensors.items():
+            # Fold the tensor into the running aggregate, so that linear
+            # aggregation functions don't have to stack all collaborator
+            # tensors at the end of the round
+            tensor_name, origin, fl_round, report, tags = tensor_key
+            if collaborator_name in tags:
+                agg_tags = change_tags(tags, remove_field=collaborator_name)
+                agg_tensor_key = TensorKey(tensor_name, origin, fl_round, report, agg_tags)
+                agg_function = WeightedAverage() if "metric" in tags else task_agg_function
+                self.tensor_db.accumulate_tensor(
+                    agg_tensor_key, collaborator_name, value, data_size, agg_function
+                )
 
             if "metric" in tensor_key.tags:
                 # Caution: This schema must be followed. It is also used in
@@ -794,9 +1236,15 @@ class Aggregator:
 
             task_results.append(tensor_key)
 
-        self.collaborator_tasks_results[task_key] = task_results
-
         with self.lock:
+            if self.round_number != round_number or collaborator_name in self.stragglers:
+                logger.warning(
+                    f"Discarding task results {task_key}: the round has finished "
+                    "while they were being processed."
+                )
+                return
+            self.collaborator_tasks_results[task_key] = task_results
+
             self._is_collaborator_done(collaborator_name, round_number)
 
             self._end_of_round_with_stragglers_check()
@@ -935,10 +1383,15 @@ class Aggregator:
         # Create delta and save it in TensorDB
         base_model_tk = TensorKey(tensor_name, origin, round_number, report, ("model",))
         base_model_nparray = self.tensor_db.get_tensor_from_cache(base_model_tk)
-        if base_model_nparray is not None and self.use_delta_updates:
-            delta_tk, delta_nparray = self.tensor_codec.generate_delta(
+        if base_model_nparray is not None:
+            raw_delta_tk, raw_delta_nparray = self.tensor_codec.generate_delta(
                 agg_tag_tk, agg_results, base_model_nparray
             )
+            # The NamedTensor of the aggregated delta is built on request,
+            # when the base model may already be cleaned up
+            self.tensor_db.cache_tensor({raw_delta_tk: raw_delta_nparray})
+        if base_model_nparray is not None and self.use_delta_updates:
+            delta_tk, delta_nparray = raw_delta_tk, raw_delta_nparray
         else:
             # This condition is possible for base model
             # optimizer states (i.e. Adam/iter:0, SGD, etc.)
@@ -1040,22 +1493,22 @@ class Aggregator:
         task_agg_function = self.assigner.get_aggregation_type_for_task(task_name)
         task_key = TaskResultKey(task_name, collaborators_for_task[0], self.round_number)
 
-        metrics = {}
-        for tensor_key in self.collaborator_tasks_results[task_key]:
-            tensor_name, origin, round_number, report, tags = tensor_key
-            assert collaborators_for_task[0] in tags, (
-                f"Tensor {tensor_key} in task {task_name} has not been processed correctly"
-            )
-            # Strip the collaborator label, and lookup aggregated tensor
-            new_tags = change_tags(tags, remove_field=collaborators_for_task[0])
-            agg_tensor_key = TensorKey(tensor_name, origin, round_number, report, new_tags)
-            agg_function = WeightedAverage() if "metric" in tags else task_agg_function
-            agg_results = self.tensor_db.get_aggregated_tensor(
-                agg_tensor_key,
-                collaborator_weight_dict,
-                aggregation_function=agg_function,
+        def aggregate(tensor_key):
+            return self._aggregate_task_tensor(
+                tensor_key, collaborators_for_task[0], collaborator_weight_dict, task_agg_function
             )
 
+        # Tensors are aggregated in parallel, but their results are reported
+        # in the order the collaborator sent them
+        tensor_keys = self.collaborator_tasks_results[task_key]
+        if self._tensor_executor is not None:
+            all_agg_results = self._tensor_executor.map(aggregate, tensor_keys)
+        else:
+            all_agg_results = map(aggregate, tensor_keys)
+
+        metrics = {}
+        for tensor_key, agg_results in zip(tensor_keys, all_agg_results):
+            tensor_name, origin, round_number, report, tags = tensor_key
             if report:
                 # Metric must be a scalar.
                 value = float(agg_results)
@@ -1081,11 +1534,47 @@ class Aggregator:
                         )
                         self.best_model_score = agg_results
                         self._save_model(round_number, self.best_state_path)
-            if "trained" in tags:
-                self._prepare_trained(tensor_name, origin, round_number, report, agg_results)
 
         return metrics
 
+    def _aggregate_task_tensor(
+        self, tensor_key, collaborator_name, collaborator_weight_dict, task_agg_function
+    ):
+        """Aggregate a tensor of a task and, if trained, prepare the next model.
+
+        Args:
+            tensor_key (TensorKey): Key of the tensor sent by the collaborator.
+            collaborator_name (str): Name of the collaborator that sent the
+                tensor.
+            collaborator_weight_dict (dict): Normalized weights of the
+                collaborators included in the aggregation.
+            task_agg_function (AggregationFunction): Aggregation function of
+                the task.
+
+        Returns:
+            np.ndarray: The aggregated tensor.
+        """
+        tensor_name, origin, round_number, report, tags = tensor_key
+        assert collaborator_name in tags, f"Tensor {tensor_key} has not been processed correctly"
+        # Strip the collaborator label, and lookup aggregated tensor
+        new_tags = change_tags(tags, remove_field=collaborator_name)
+        agg_tensor_key = TensorKey(tensor_name, origin, round_number, report, new_tags)
+        agg_function = WeightedAverage() if "metric" in tags else task_agg_function
+        if self._process_executor is not None and not any(
+            getattr(agg_function, attr, False)
+            for attr in ("_privileged", "_streaming", "_stateful")
+        ):
+            agg_function = ProcessPoolAggregation(agg_function, self._process_executor)
+        agg_results = self.tensor_db.get_aggregated_tensor(
+            agg_tensor_key,
+            collaborator_weight_dict,
+            aggregation_function=agg_function,
+        )
+
+        if "trained" in tags:
+            self._prepare_trained(tensor_name, origin, round_number, report, agg_results)
+        return agg_results
+
     def _end_of_round_check(self):
         """Check if the round complete.
 
@@ -1126,6 +1615,7 @@ class Aggregator:
         # TODO This needs to be fixed!
         if self._time_to_quit():
             logger.info("Experiment Completed. Cleaning up...")
+            self._wait_for_checkpoints()
         else:
             logger.info("Starting round %s...", self.round_number)
             # https://github.com/securefederatedai/openfl/pull/1195#discussion_r1879479537
@@ -1136,6 +1626,9 @@ class Aggregator:
         # Reset straggler handling policy for the next round.
         self.straggler_handling_policy.reset_policy_for_round()
 
+        # Hand out the tasks of the next round to long-polling collaborators
+        self._call_round_callbacks()
+
     def _is_collaborator_done(self, collaborator_name: str, round_number: int) -> None:
         """
         Check if all tasks given to the collaborator are completed then,
@@ -1192,6 +1685,14 @@ class Aggregator:
         # End of experiment callbacks.
         self.callbacks.on_experiment_end()
 
+        if self._aggregation_executor is not None:
+            self._aggregation_executor.shutdown(wait=False, cancel_futures=True)
+        for executor in (self._tensor_executor, self._process_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        # Models already taken are still written
+        self._checkpoint_executor.shutdown(wait=True)
+
         # This code does not actually send `quit` tasks to collaborators,
         # it just mimics it by filling arrays.
         for collaborator_name in filter(lambda c: c != failed_collaborator, self.authorized_cols):
@@ -1200,3 +1701,6 @@ class Aggregator:
                 collaborator_name,
             )
             self.quit_job_sent_to.append(collaborator_name)
+
+        # Release the long-polling collaborators
+        self._call_round_callbacks()
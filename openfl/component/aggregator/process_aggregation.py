@@ -0,0 +1,144 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""Run aggregation functions in worker processes."""
+
+from logging import getLogger
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from openfl.utilities import LocalTensor
+
+logger = getLogger(__name__)
+
+# Offsets of the tensors in the shared memory block are aligned to this many
+# bytes
+ALIGNMENT = 64
+
+
+def _run_aggregation(aggregation_function, shm_name, specs, history, tensor_name, fl_round, tags):
+    """Call an aggregation function on tensors stored in shared memory.
+
+    Runs in the worker process.
+
+    Args:
+        aggregation_function (AggregationFunction): The aggregation function.
+        shm_name (str): Name of the shared memory block holding the tensors.
+        specs (list): (col_name, weight, offset, shape, dtype) of each local
+            tensor.
+        history (list): TensorDB rows of the aggregated tensor.
+        tensor_name (str): Name of the tensor.
+        fl_round (int): Round number.
+        tags (tuple): Tags of the aggregated tensor.
+
+    Returns:
+        np.ndarray: The aggregated tensor.
+    """
+    shm = SharedMemory(name=shm_name)
+    # The block is owned (and unlinked) by the aggregator process
+    resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        local_tensors = [
+            LocalTensor(
+                col_name=col_name,
+                tensor=np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset),
+                weight=weight,
+            )
+            for col_name, weight, offset, shape, dtype in specs
+        ]
+        agg_nparray = aggregation_function(
+            local_tensors, iter(history), tensor_name, fl_round, tags
+        )
+        # Copy the result out of shared memory before it is released
+        agg_nparray = np.array(agg_nparray)
+    finally:
+        local_tensors = None
+        try:
+            shm.close()
+        except BufferError:
+            logger.debug("Shared memory %s is still referenced by %s", shm_name, tensor_name)
+    return agg_nparray
+
+
+class ProcessPoolAggregation:
+    """Wrapper that runs an aggregation function in a process pool.
+
+    Local tensors are copied once into a shared memory block that the worker
+    process maps, instead of being pickled. This pays off for aggregation
+    functions that hold the GIL, e.g. ones written in pure Python.
+
+    The wrapped function must be stateless: it runs on a copy in the worker
+    process, so changes to its attributes are lost. Its `db_iterator` only
+    contains the TensorDB rows of the tensor being aggregated.
+
+    Attributes:
+        aggregation_function (AggregationFunction): The wrapped function.
+        executor (concurrent.futures.ProcessPoolExecutor): The process pool.
+    """
+
+    def __init__(self, aggregation_function, executor):
+        """Initialize the wrapper.
+
+        Args:
+            aggregation_function (AggregationFunction): The function to wrap.
+            executor (concurrent.futures.ProcessPoolExecutor): The process
+                pool to run it in.
+        """
+        self.aggregation_function = aggregation_function
+        self.executor = executor
+
+    def __call__(self, local_tensors, db_iterator, tensor_name, fl_round, tags):
+        """Aggregate tensors in a worker process.
+
+        Args:
+            local_tensors (list[openfl.utilities.LocalTensor]): List of local
+                tensors to aggregate.
+            db_iterator: An iterator over history of the tensor, which
+                TensorDB already restricts to the rows of `tensor_name`.
+            tensor_name: name of the tensor
+            fl_round: round number
+            tags: tuple of tags for this tensor
+        Returns:
+            np.ndarray: aggregated tensor
+        """
+        history = list(db_iterator)
+        arrays = [np.ascontiguousarray(local_tensor.tensor) for local_tensor in local_tensors]
+        if any(array.dtype.kind not in "biufc" for array in arrays):
+            # Non-numeric tensors can't be placed in shared memory
+            return self.aggregation_function(
+                local_tensors, iter(history), tensor_name, fl_round, tags
+            )
+
+        specs = []
+        offset = 0
+        for local_tensor, array in zip(local_tensors, arrays):
+            specs.append(
+                (local_tensor.col_name, local_tensor.weight, offset, array.shape, array.dtype.str)
+            )
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        shm = SharedMemory(create=True, size=max(offset, 1))
+        try:
+            for (_, _, array_offset, _, _), array in zip(specs, arrays):
+                shared = np.ndarray(
+                    array.shape, dtype=array.dtype, buffer=shm.buf, offset=array_offset
+                )
+                shared[...] = array
+                del shared
+            future = self.executor.submit(
+                _run_aggregation,
+                self.aggregation_function,
+                shm.name,
+                specs,
+                history,
+                tensor_name,
+                fl_round,
+                tags,
+            )
+            return future.result()
+        finally:
+            shm.close()
+            shm.unlink()
@@ -5,18 +5,26 @@
 """Collaborator module."""
 
 import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
+from functools import partial
 from time import sleep
 from typing import List, Optional, Tuple
 
 import openfl.callbacks as callbacks_module
-from openfl.databases import TensorDB
+from openfl.databases import ModelCache, TensorDB
 from openfl.pipelines import NoCompressionPipeline, TensorCodec
 from openfl.protocols import utils
 from openfl.utilities import TensorKey
 
 logger = logging.getLogger(__name__)
 
+# Seconds between two attempts at prefetching the model of the next round
+PREFETCH_RETRY_INTERVAL = 1
+
 
 class DevicePolicy(Enum):
     """Device assignment policy.
@@ -47,6 +55,37 @@ class OptTreatment(Enum):
     CONTINUE_GLOBAL = 3
 
 
+class _NamedTensorStream:
+    """Named tensors built as they are iterated over.
+
+    The tensors built are kept, so that a send that is retried iterates over
+    the same tensors again.
+    """
+
+    def __init__(self, build, items):
+        """Initialize the stream.
+
+        Args:
+            build: The function building the named tensor of an item.
+            items: The iterable of the arguments of `build`.
+        """
+        self._build = build
+        self._items = iter(items)
+        self._built = []
+
+    def __iter__(self):
+        """Iterate over the tensors built so far, then build the others."""
+        i = 0
+        while True:
+            if i == len(self._built):
+                item = next(self._items, None)
+                if item is None:
+                    return
+                self._built.append(self._build(*item))
+            yield self._built[i]
+            i += 1
+
+
 class Collaborator:
     r"""The Collaborator object class.
 
@@ -65,6 +104,14 @@ class Collaborator:
         db_store_rounds (int): The number of rounds to store in the database.
         single_col_cert_common_name (str): The common name for the single
             column certificate.
+        pipelined_send (bool)*: If True, the results of a task are compressed
+            and sent in the background while the next tasks run.
+        fetch_concurrency (int)*: The number of tensors resolved at once for
+            a task.
+        prefetch_next_round (bool)*: If True, the model of the next round is
+            fetched in the background as soon as a round ends.
+        model_cache (ModelCache): The last global model on local disk, or
+            None.
 
     .. note::
         \* - Plan setting.
@@ -86,6 +133,11 @@ class Collaborator:
         log_memory_usage=False,
         write_logs=False,
         callbacks: Optional[List] = None,
+        pipelined_send=False,
+        fetch_concurrency=1,
+        prefetch_next_round=False,
+        model_cache_path=None,
+        model_cache_max_size=None,
     ):
         """Initialize the Collaborator object.
 
@@ -108,6 +160,27 @@ class Collaborator:
             db_store_rounds (int, optional): The number of rounds to store in
                 the database. Defaults to 1.
             callbacks (list, optional): List of callbacks. Defaults to None.
+            pipelined_send (bool, optional): If True, the results of a task
+                are compressed and streamed to the aggregator tensor by
+                tensor in the background, while the next tasks of the round
+                run. Defaults to False.
+            fetch_concurrency (int, optional): The number of tensors resolved
+                at once for a task. Above 1, tensors are requested from the
+                aggregator and decompressed in parallel, and decompressed as
+                soon as they are received. Defaults to 1.
+            prefetch_next_round (bool, optional): If True, once a round
+                ends, the model tensors it used are requested for the next
+                round in the background, while waiting for the next tasks.
+                The aggregator answers as soon as it has aggregated them, and
+                they are decompressed into the TensorDB, so that the next
+                round finds them there. Defaults to False.
+            model_cache_path (str, optional): Directory where the last global
+                model is kept across rounds and restarts, so that the model
+                deltas of the next round can always be applied. Defaults to
+                None, i.e. the model is only kept in the TensorDB for
+                `db_store_rounds` rounds.
+            model_cache_max_size (int, optional): Maximum number of bytes of
+                the model cache. Defaults to None, i.e. no bound.
         """
         self.single_col_cert_common_name = None
 
@@ -123,14 +196,44 @@ class Collaborator:
         self.tensor_codec = TensorCodec(self.compression_pipeline)
         self.tensor_db = TensorDB()
         self.db_store_rounds = db_store_rounds
+        self.model_cache = None
+        if model_cache_path is not None:
+            self.model_cache = ModelCache(
+                os.path.join(model_cache_path, federation_uuid), model_cache_max_size
+            )
+        # Bytes of the tensors received from the aggregator in the round
+        self._bytes_downloaded = 0
+        self._bytes_downloaded_lock = threading.Lock()
 
         self.task_runner = task_runner
         self.delta_updates = delta_updates
 
         self.client = client
+        self.fetch_concurrency = fetch_concurrency
+        # Aggregated tensors fetched ahead of time by
+        # get_numpy_dict_for_tensorkeys. {TensorKey: NamedTensor}, or
+        # {TensorKey: Future} while they are being fetched
+        self._prefetched_tensors = {}
+
+        # The model tensors used in the round, which are fetched for the next
+        # round in the background by the thread _next_round_prefetch
+        self.prefetch_next_round = prefetch_next_round
+        self._round_model_tensorkeys = set()
+        self._next_round_prefetch = None
+        self._stop_next_round_prefetch = threading.Event()
 
         self.task_config = task_config
 
+        # Sends of task results run in order on a single background thread
+        self.pipelined_send = pipelined_send
+        self._send_executor = None
+        if self.pipelined_send:
+            self._send_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="send")
+        self._pending_sends = []
+        # Seconds spent in each phase of each task of the round,
+        # {task_name: {phase: seconds}}
+        self._phase_timings = {}
+
         # RESET/CONTINUE_LOCAL/CONTINUE_GLOBAL
         if hasattr(OptTreatment, opt_treatment):
             self.opt_treatment = OptTreatment[opt_treatment]
@@ -181,6 +284,7 @@ class Collaborator:
                 continue
 
             # Round begin
+            self.wait_for_next_round_prefetch()
             logger.info("Received Tasks: %s", tasks)
             self.callbacks.on_round_begin(round_num)
 
@@ -189,12 +293,21 @@ class Collaborator:
             for task in tasks:
                 metrics = self.do_task(task, round_num)
                 logs.update(metrics)
+            self.wait_for_sends()
+            logs.update(self._pop_phase_timings())
+            logs.update(self._pop_bytes_downloaded())
 
             # Round end
             self.tensor_db.clean_up(self.db_store_rounds)
             self.callbacks.on_round_end(round_num, logs)
+            self._start_next_round_prefetch(round_num)
 
         # Experiment end
+        # An attempt in flight is not waited for: the aggregator may be gone
+        self._stop_next_round_prefetch.set()
+        self._next_round_prefetch = None
+        if self._send_executor is not None:
+            self._send_executor.shutdown(wait=True)
         self.callbacks.on_experiment_end()
         logger.info("Received shutdown signal. Exiting...")
 
@@ -209,12 +322,15 @@ class Collaborator:
             if time_to_quit:
                 logger.info("End of Federation reached. Exiting...")
                 break
-            elif sleep_time > 0:
+            elif not tasks:
                 sleep(sleep_time)  # some sleep function
             else:
                 logger.info("Received the following tasks: %s", tasks)
                 for task in tasks:
                     self.do_task(task, round_number)
+                self.wait_for_sends()
+                self._pop_phase_timings()
+                self._pop_bytes_downloaded()
                 logger.info(
                     f"All tasks completed on {self.collaborator_name} for round {round_number}..."
                 )
@@ -294,7 +410,10 @@ class Collaborator:
 
         # print('Required tensorkeys = {}'.format(
         # [tk[0] for tk in required_tensorkeys]))
+        self._add_round_model_tensorkeys(required_tensorkeys)
+        start = time.monotonic()
         input_tensor_dict = self.get_numpy_dict_for_tensorkeys(required_tensorkeys)
+        self._record_phase(task_name, "fetch", time.monotonic() - start)
 
         # now we have whatever the model needs to do the task
         if hasattr(self.task_runner, "TASK_REGISTRY"):
@@ -321,12 +440,14 @@ class Collaborator:
             func = getattr(self.task_runner, func_name)
             logger.debug("Using TaskRunner subclassing API")
 
+        start = time.monotonic()
         global_output_tensor_dict, local_output_tensor_dict = func(
             col_name=self.collaborator_name,
             round_num=round_number,
             input_tensor_dict=input_tensor_dict,
             **kwargs,
         )
+        self._record_phase(task_name, "compute", time.monotonic() - start)
 
         # Save global and local output_tensor_dicts to TensorDB
         self.tensor_db.cache_tensor(global_output_tensor_dict)
@@ -334,9 +455,135 @@ class Collaborator:
 
         # send the results for this tasks; delta and compression will occur in
         # this function
-        metrics = self.send_task_results(global_output_tensor_dict, round_number, task_name)
+        if self._send_executor is None:
+            return self.send_task_results(global_output_tensor_dict, round_number, task_name)
+
+        self._pending_sends.append(
+            self._send_executor.submit(
+                self.send_task_results, global_output_tensor_dict, round_number, task_name
+            )
+        )
+        return self._get_metrics(global_output_tensor_dict, task_name)
+
+    def wait_for_sends(self):
+        """Wait for the task results sent in the background to be sent.
+
+        Raises:
+            Exception: The first error raised by a send.
+        """
+        pending_sends, self._pending_sends = self._pending_sends, []
+        if not pending_sends:
+            return
+        start = time.monotonic()
+        for future in pending_sends:
+            future.result()
+        self._record_phase("round", "send_wait", time.monotonic() - start)
+
+    def _add_round_model_tensorkeys(self, tensor_keys):
+        """Remember the model tensors of the aggregator used in the round.
+
+        Args:
+            tensor_keys (namedtuple): Tensorkeys required by a task.
+        """
+        if self.prefetch_next_round:
+            self._round_model_tensorkeys.update(
+                k for k in tensor_keys if k.origin == self.aggregator_uuid and "model" in k.tags
+            )
+
+    def _start_next_round_prefetch(self, round_number):
+        """Start fetching the model of the next round in the background.
+
+        The model tensors used in the round are resolved for the next round,
+        which caches them in the TensorDB. The aggregator holds the requests
+        until the tensors are aggregated, and they are retried until the
+        next tasks are received. Nothing is fetched after the last round.
+
+        Args:
+            round_number (int): The round that just ended.
+        """
+        tensor_keys = [
+            k._replace(round_number=k.round_number + 1) for k in self._round_model_tensorkeys
+        ]
+        self._round_model_tensorkeys = set()
+        if not tensor_keys:
+            return
+        rounds_to_train = self.client.rounds_to_train
+        if rounds_to_train and round_number + 1 >= rounds_to_train:
+            return
+
+        stop = self._stop_next_round_prefetch = threading.Event()
+
+        def prefetch():
+            while not stop.is_set():
+                try:
+                    # Unlike the workers of a pool, this daemon thread does not
+                    # keep the process alive if the aggregator is gone at exit
+                    self._get_numpy_dict_sequentially(tensor_keys)
+                    logger.info("Prefetched %s tensors of the next round", len(tensor_keys))
+                    return
+                except Exception as e:
+                    logger.debug("Could not prefetch the model of the next round yet: %s", e)
+                    stop.wait(PREFETCH_RETRY_INTERVAL)
+
+        self._next_round_prefetch = threading.Thread(
+            target=prefetch, name="next_round_prefetch", daemon=True
+        )
+        self._next_round_prefetch.start()
+
+    def wait_for_next_round_prefetch(self):
+        """Stop prefetching the model of the next round and wait for the last attempt.
+
+        Tensors that could not be prefetched are fetched by the tasks.
+        """
+        thread, self._next_round_prefetch = self._next_round_prefetch, None
+        if thread is None:
+            return
+        self._stop_next_round_prefetch.set()
+        start = time.monotonic()
+        thread.join()
+        self._record_phase("round", "prefetch_wait", time.monotonic() - start)
+
+    def _record_phase(self, task_name, phase, seconds):
+        """Add the time spent in a phase of a task.
+
+        Args:
+            task_name (str): The name of the task.
+            phase (str): The name of the phase.
+            seconds (float): The time spent.
+        """
+        timings = self._phase_timings.setdefault(task_name, {})
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+    def _pop_phase_timings(self):
+        """Log and return the phase timings of the round, and reset them.
+
+        Returns:
+            dict: The seconds spent in each phase of each task, by metric
+                name.
+        """
+        phase_timings, self._phase_timings = self._phase_timings, {}
+        metrics = {}
+        for task_name, timings in phase_timings.items():
+            logger.info(
+                "Time spent in %s: %s",
+                task_name,
+                ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in timings.items()),
+            )
+            for phase, seconds in timings.items():
+                metrics[f"{self.collaborator_name}/{task_name}/time/{phase}"] = seconds
         return metrics
 
+    def _pop_bytes_downloaded(self):
+        """Log and return the bytes received from the aggregator in the round, and reset them.
+
+        Returns:
+            dict: The number of bytes, by metric name.
+        """
+        with self._bytes_downloaded_lock:
+            bytes_downloaded, self._bytes_downloaded = self._bytes_downloaded, 0
+        logger.info("Downloaded %s bytes from the aggregator", bytes_downloaded)
+        return {f"{self.collaborator_name}/round/bytes_downloaded": bytes_downloaded}
+
     def get_numpy_dict_for_tensorkeys(self, tensor_keys):
         """Get tensor dictionary for specified tensorkey set.
 
@@ -344,7 +591,164 @@ class Collaborator:
             tensor_keys (namedtuple): Tensorkeys that will be resolved locally
                 or remotely. May be the product of other tensors.
         """
-        return {k.tensor_name: self.get_data_for_tensorkey(k) for k in tensor_keys}
+        if self.fetch_concurrency > 1:
+            return self._get_numpy_dict_concurrently(tensor_keys)
+        return self._get_numpy_dict_sequentially(tensor_keys)
+
+    def _get_numpy_dict_sequentially(self, tensor_keys):
+        """Get tensor dictionary for specified tensorkey set in the calling thread.
+
+        Args:
+            tensor_keys (namedtuple): Tensorkeys that will be resolved locally
+                or remotely. May be the product of other tensors.
+        """
+        self._prefetch_aggregated_tensors(tensor_keys)
+        try:
+            return {k.tensor_name: self.get_data_for_tensorkey(k) for k in tensor_keys}
+        finally:
+            self._prefetched_tensors = {}
+
+    def _get_numpy_dict_concurrently(self, tensor_keys):
+        """Get tensor dictionary for specified tensorkey set with a pool of workers.
+
+        The aggregated tensors are streamed in the background, and each
+        worker decompresses its tensor as soon as it is received.
+
+        Args:
+            tensor_keys (namedtuple): Tensorkeys that will be resolved locally
+                or remotely. May be the product of other tensors.
+        """
+        prefetch = self._start_prefetch(tensor_keys)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.fetch_concurrency, thread_name_prefix="fetch"
+            ) as executor:
+                nparrays = list(executor.map(self.get_data_for_tensorkey, tensor_keys))
+            return {k.tensor_name: nparray for k, nparray in zip(tensor_keys, nparrays)}
+        finally:
+            if prefetch is not None:
+                prefetch.join()
+            self._prefetched_tensors = {}
+
+    def _get_aggregated_tensor_requests(self, tensor_keys):
+        """Find the tensors to request from the aggregator for a set of tensorkeys.
+
+        Args:
+            tensor_keys (namedtuple): Tensorkeys that will be resolved locally
+                or remotely.
+
+        Returns:
+            dict: Whether lossless compression is required, by TensorKey to
+                request, empty if the client cannot fetch them in one call.
+        """
+        if not hasattr(self.client, "get_aggregated_model"):
+            return {}
+
+        tensor_requests = {}
+        for tensor_key in tensor_keys:
+            tensor_request = self._get_aggregated_tensor_request(tensor_key)
+            if tensor_request is not None:
+                remote_tensor_key, require_lossless = tensor_request
+                tensor_requests[remote_tensor_key] = require_lossless
+        return tensor_requests
+
+    def _prefetch_aggregated_tensors(self, tensor_keys):
+        """Fetch the aggregated tensors needed for a set of tensorkeys in one call.
+
+        The tensors that `get_data_for_tensorkey` would request from the
+        aggregator one by one are fetched with a single streaming call, if the
+        client supports it.
+
+        Args:
+            tensor_keys (namedtuple): Tensorkeys that will be resolved locally
+                or remotely.
+        """
+        tensor_requests = self._get_aggregated_tensor_requests(tensor_keys)
+        if not tensor_requests:
+            return
+
+        logger.debug("Requesting %s aggregated tensors", len(tensor_requests))
+        named_tensors = self.client.get_aggregated_model(
+            self.collaborator_name, list(tensor_requests.items())
+        )
+        if named_tensors is None:
+            return
+        self._prefetched_tensors = dict(zip(tensor_requests, named_tensors))
+
+    def _start_prefetch(self, tensor_keys):
+        """Start fetching the aggregated tensors needed for a set of tensorkeys.
+
+        Each tensor is prefetched as a future, which is resolved as soon as
+        the tensor is received, or to None if it has to be requested on its
+        own.
+
+        Args:
+            tensor_keys (namedtuple): Tensorkeys that will be resolved locally
+                or remotely.
+
+        Returns:
+            threading.Thread: The thread fetching the tensors, or None if
+                there are none to fetch.
+        """
+        tensor_requests = self._get_aggregated_tensor_requests(tensor_keys)
+        if not tensor_requests:
+            return None
+
+        futures = [Future() for _ in tensor_requests]
+        self._prefetched_tensors = dict(zip(tensor_requests, futures))
+
+        def on_tensor(i, tensor):
+            if not futures[i].done():
+                futures[i].set_result(tensor)
+
+        def fetch():
+            logger.debug("Requesting %s aggregated tensors", len(tensor_requests))
+            try:
+                self.client.get_aggregated_model(
+                    self.collaborator_name, list(tensor_requests.items()), on_tensor=on_tensor
+                )
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                # Tensors the aggregator did not send are requested one by one
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+
+        thread = threading.Thread(target=fetch, name="prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def _get_aggregated_tensor_request(self, tensor_key):
+        """Find the tensor that must be requested from the aggregator to resolve a tensorkey.
+
+        Mirrors the lookups done by `get_data_for_tensorkey`.
+
+        Args:
+            tensor_key (namedtuple): Tensorkey that will be resolved locally or
+                remotely.
+
+        Returns:
+            tuple: The TensorKey to request and whether lossless compression is
+                required, or None if the tensor is resolved locally.
+        """
+        tensor_name, origin, round_number, report, tags = tensor_key
+        if origin == self.collaborator_name:
+            return None
+        if self.tensor_db.get_tensor_from_cache(tensor_key) is not None:
+            return None
+
+        tensor_dependencies = self.tensor_codec.find_dependencies(tensor_key, self.delta_updates)
+        if len(tensor_dependencies) > 0:
+            if self._get_prior_model_layer(tensor_dependencies[0]) is not None:
+                return TensorKey(*tensor_dependencies[1]), False
+            return TensorKey(*tensor_key), True
+        if "model" in tags:
+            return TensorKey(*tensor_key), True
+        tags = (self.collaborator_name,) + tags
+        return TensorKey(tensor_name, origin, round_number, report, tags), True
 
     def get_data_for_tensorkey(self, tensor_key):
         """Resolve the tensor corresponding to the requested tensorkey.
@@ -397,7 +801,7 @@ class Collaborator:
                 # of the model.
                 # If it exists locally, should pull the remote delta because
                 # this is the least costly path
-                prior_model_layer = self.tensor_db.get_tensor_from_cache(tensor_dependencies[0])
+                prior_model_layer = self._get_prior_model_layer(tensor_dependencies[0])
                 if prior_model_layer is not None:
                     uncompressed_delta = self.get_aggregated_tensor_from_aggregator(
                         tensor_dependencies[1]
@@ -409,6 +813,7 @@ class Collaborator:
                         creates_model=True,
                     )
                     self.tensor_db.cache_tensor({new_model_tk: nparray})
+                    self._cache_model_layer(tensor_name, round_number, nparray)
                 else:
                     logger.info(
                         "Could not find previous model layer.Fetching latest layer from aggregator"
@@ -417,11 +822,13 @@ class Collaborator:
                     nparray = self.get_aggregated_tensor_from_aggregator(
                         tensor_key, require_lossless=True
                     )
+                    self._cache_model_layer(tensor_name, round_number, nparray)
             elif "model" in tags:
                 # Pulling the model for the first time
                 nparray = self.get_aggregated_tensor_from_aggregator(
                     tensor_key, require_lossless=True
                 )
+                self._cache_model_layer(tensor_name, round_number, nparray)
             else:
                 # we should try fetching the tensor from aggregator
                 tensor_name, origin, round_number, report, tags = tensor_key
@@ -439,6 +846,34 @@ class Collaborator:
 
         return nparray
 
+    def _get_prior_model_layer(self, tensor_key):
+        """Return the prior version of a model layer, which model deltas apply to.
+
+        Args:
+            tensor_key (TensorKey): The key of the prior model layer.
+
+        Returns:
+            nparray: The model layer from the TensorDB or else the model
+                cache, or None if neither has it.
+        """
+        nparray = self.tensor_db.get_tensor_from_cache(tensor_key)
+        if nparray is None and self.model_cache is not None:
+            nparray = self.model_cache.get(tensor_key.tensor_name, tensor_key.round_number)
+            if nparray is not None:
+                logger.debug("Found tensor %s in the model cache", tensor_key)
+        return nparray
+
+    def _cache_model_layer(self, tensor_name, round_number, nparray):
+        """Keep a model layer received from the aggregator in the model cache.
+
+        Args:
+            tensor_name (str): The name of the layer.
+            round_number (int): The round of the layer.
+            nparray: The layer.
+        """
+        if self.model_cache is not None:
+            self.model_cache.put(tensor_name, round_number, nparray)
+
     def get_aggregated_tensor_from_aggregator(self, tensor_key, require_lossless=False):
         """
         Return the decompressed tensor associated with the requested tensor key.
@@ -461,15 +896,21 @@ class Collaborator:
         """
         tensor_name, origin, round_number, report, tags = tensor_key
 
-        logger.debug("Requesting aggregated tensor %s", tensor_key)
-        tensor = self.client.get_aggregated_tensor(
-            self.collaborator_name,
-            tensor_name,
-            round_number,
-            report,
-            tags,
-            require_lossless,
-        )
+        tensor = self._prefetched_tensors.pop(TensorKey(*tensor_key), None)
+        if isinstance(tensor, Future):
+            tensor = tensor.result()
+        if tensor is None:
+            logger.debug("Requesting aggregated tensor %s", tensor_key)
+            tensor = self.client.get_aggregated_tensor(
+                self.collaborator_name,
+                tensor_name,
+                round_number,
+                report,
+                tags,
+                require_lossless,
+            )
+        with self._bytes_downloaded_lock:
+            self._bytes_downloaded += tensor.ByteSize()
 
         # this translates to a numpy array and includes decompression, as
         # necessary
@@ -491,7 +932,13 @@ class Collaborator:
         Returns:
             A dictionary of reportable metrics of the current collaborator for the task.
         """
-        named_tensors = [self.nparray_to_named_tensor(k, v) for k, v in tensor_dict.items()]
+        start = time.monotonic()
+        build = partial(self._timed_named_tensor, task_name)
+        if self.pipelined_send:
+            # Tensors are compressed as the client streams them
+            named_tensors = _NamedTensorStream(build, tensor_dict.items())
+        else:
+            named_tensors = [build(k, v) for k, v in tensor_dict.items()]
 
         # for general tasks, there may be no notion of data size to send.
         # But that raises the question how to properly aggregate results.
@@ -506,14 +953,7 @@ class Collaborator:
 
         logger.debug("%s data size = %s", task_name, data_size)
 
-        metrics = {}
-        for tensor in tensor_dict:
-            tensor_name, origin, fl_round, report, tags = tensor
-
-            if report:
-                # Reportable metric must be a scalar
-                value = float(tensor_dict[tensor])
-                metrics.update({f"{self.collaborator_name}/{task_name}/{tensor_name}": value})
+        metrics = self._get_metrics(tensor_dict, task_name)
 
         self.client.send_local_task_results(
             self.collaborator_name,
@@ -522,9 +962,46 @@ class Collaborator:
             data_size,
             named_tensors,
         )
+        self._record_phase(task_name, "send", time.monotonic() - start)
+
+        return metrics
+
+    def _get_metrics(self, tensor_dict, task_name):
+        """Get the reportable metrics of the results of a task.
+
+        Args:
+            tensor_dict (dict): Tensor dictionary.
+            task_name (str): Task name.
+
+        Returns:
+            A dictionary of reportable metrics of the current collaborator for the task.
+        """
+        metrics = {}
+        for tensor in tensor_dict:
+            tensor_name, origin, fl_round, report, tags = tensor
 
+            if report:
+                # Reportable metric must be a scalar
+                value = float(tensor_dict[tensor])
+                metrics.update({f"{self.collaborator_name}/{task_name}/{tensor_name}": value})
         return metrics
 
+    def _timed_named_tensor(self, task_name, tensor_key, nparray):
+        """Construct the NamedTensor Protobuf and record the time it took.
+
+        Args:
+            task_name (str): The name of the task the tensor is a result of.
+            tensor_key (namedtuple): Tensorkey of the tensor.
+            nparray: The tensor.
+
+        Returns:
+            named_tensor (protobuf) : The tensor constructed from the nparray.
+        """
+        start = time.monotonic()
+        named_tensor = self.nparray_to_named_tensor(tensor_key, nparray)
+        self._record_phase(task_name, "compress", time.monotonic() - start)
+        return named_tensor
+
     def nparray_to_named_tensor(self, tensor_key, nparray):
         """Construct the NamedTensor Protobuf.
 
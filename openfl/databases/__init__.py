@@ -2,5 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from openfl.databases.model_cache import ModelCache
 from openfl.databases.persistent_db import PersistentTensorDB
 from openfl.databases.tensor_db import TensorDB
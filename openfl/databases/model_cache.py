@@ -0,0 +1,140 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""ModelCache module."""
+
+import logging
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ModelCache"]
+
+
+class ModelCache:
+    """A size-bounded cache of the last global model on local disk.
+
+    Only the last round received of each tensor is kept, in a .npy file named
+    after the tensor and the round, which is memory mapped when it is read. The
+    cache outlives the process, so that a restarted collaborator still has
+    the model the next deltas apply to. When the files exceed `max_size`,
+    the least recently used tensors are removed.
+
+    Attributes:
+        cache_dir (str): Directory of the .npy files.
+        max_size (int): Maximum number of bytes of the files, or None for no
+            bound.
+        lock: A threading Lock object used to ensure thread-safe operations.
+    """
+
+    def __init__(self, cache_dir, max_size: Optional[int] = None) -> None:
+        """Initializes a new instance of the ModelCache class.
+
+        The tensors cached by previous processes are loaded from the
+        directory.
+
+        Args:
+            cache_dir (str): Directory of the .npy files, created if needed.
+            max_size (int, optional): Maximum number of bytes of the files.
+                Defaults to None, i.e. no bound.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.lock = Lock()
+        # {tensor_name: (round_number, file_name, size)}, least recently used
+        # first
+        self._entries = OrderedDict()
+        self._size = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        files = []
+        for file_name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, file_name)
+            if file_name.endswith(".tmp"):
+                # Left by a process interrupted while writing
+                os.remove(path)
+            elif file_name.endswith(".npy"):
+                files.append((os.path.getmtime(path), file_name))
+        for _, file_name in sorted(files):
+            quoted_name, round_number, _ = file_name.rsplit(".", 2)
+            self._add(unquote(quoted_name), int(round_number), file_name)
+        self._evict()
+
+    def get(self, tensor_name: str, round_number: int) -> Optional[np.ndarray]:
+        """Return a tensor of a round if it is cached.
+
+        Args:
+            tensor_name (str): The name of the tensor.
+            round_number (int): The round of the tensor.
+
+        Returns:
+            Optional[np.ndarray]: A read-only memory map of the tensor, or
+                None if the tensor of this round is not cached.
+        """
+        with self.lock:
+            entry = self._entries.get(tensor_name)
+            if entry is None or entry[0] != round_number:
+                return None
+            self._entries.move_to_end(tensor_name)
+            try:
+                return np.load(os.path.join(self.cache_dir, entry[1]), mmap_mode="r")
+            except (OSError, ValueError) as e:
+                logger.warning("Dropping unreadable cached tensor %s: %s", tensor_name, e)
+                self._remove(tensor_name)
+                return None
+
+    def put(self, tensor_name: str, round_number: int, nparray: np.ndarray) -> None:
+        """Cache a tensor of a round, replacing the cached tensor of any round.
+
+        The tensor just received is always kept, even over a later round,
+        which can only be left by another experiment.
+
+        Args:
+            tensor_name (str): The name of the tensor.
+            round_number (int): The round of the tensor.
+            nparray (np.ndarray): The tensor.
+        """
+        if self.max_size is not None and nparray.nbytes > self.max_size:
+            return
+        file_name = f"{quote(tensor_name, safe='')}.{round_number}.npy"
+        path = os.path.join(self.cache_dir, file_name)
+        with self.lock:
+            self._remove(tensor_name)
+            # A crash while writing does not leave a partial .npy file
+            with open(f"{path}.tmp", "wb") as f:
+                np.save(f, nparray)
+            os.replace(f"{path}.tmp", path)
+            self._add(tensor_name, round_number, file_name)
+            self._evict()
+
+    def _add(self, tensor_name, round_number, file_name) -> None:
+        """Index a file, keeping only the latest round of the tensor."""
+        entry = self._entries.get(tensor_name)
+        if entry is not None:
+            if entry[0] >= round_number:
+                os.remove(os.path.join(self.cache_dir, file_name))
+                return
+            self._remove(tensor_name)
+        size = os.path.getsize(os.path.join(self.cache_dir, file_name))
+        self._entries[tensor_name] = (round_number, file_name, size)
+        self._size += size
+
+    def _remove(self, tensor_name) -> None:
+        """Remove the file of a tensor, if any."""
+        entry = self._entries.pop(tensor_name, None)
+        if entry is None:
+            return
+        os.remove(os.path.join(self.cache_dir, entry[1]))
+        self._size -= entry[2]
+
+    def _evict(self) -> None:
+        """Remove the least recently used tensors until the files fit in max_size."""
+        while self.max_size is not None and self._size > self.max_size:
+            self._remove(next(iter(self._entries)))
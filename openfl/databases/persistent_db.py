@@ -1,9 +1,11 @@
 import json
 import logging
+import os
 import pickle
 import sqlite3
 from threading import Lock
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
 
 import numpy as np
 
@@ -13,33 +15,65 @@ logger = logging.getLogger(__name__)
 
 __all__ = ["PersistentTensorDB"]
 
+# Value of the `dtype` column of values stored as raw bytes. NULL marks
+# pickled values.
+BYTES_DTYPE = "bytes"
+
 
 class PersistentTensorDB:
     """
     The PersistentTensorDB class implements a database
     for storing tensors and metadata using SQLite.
 
+    NumPy arrays are stored as their raw buffer, with the dtype and shape in
+    separate columns, and are loaded back without copies. Other values, e.g.
+    scalars, are pickled. Arrays of at least `sidecar_threshold` bytes are
+    stored in .npy files next to the database instead, which are memory
+    mapped when they are loaded.
+
     Attributes:
         conn: The SQLite connection object.
         cursor: The SQLite cursor object.
         lock: A threading Lock object used to ensure thread-safe operations.
+        sidecar_threshold (int): Size in bytes from which arrays are stored
+            in .npy files, or None to store all arrays in the database.
+        sidecar_dir (str): Directory of the .npy files.
     """
 
     TENSORS_TABLE = "tensors"
     NEXT_ROUND_TENSORS_TABLE = "next_round_tensors"
     TASK_RESULT_TABLE = "task_results"
+    TASK_RESULT_TENSORS_TABLE = "task_result_tensors"
+    DECODED_TASK_RESULT_TENSORS_TABLE = "decoded_task_result_tensors"
     KEY_VALUE_TABLE = "key_value_store"
 
-    def __init__(self, db_path) -> None:
-        """Initializes a new instance of the PersistentTensorDB class."""
+    def __init__(self, db_path, sidecar_threshold: Optional[int] = None) -> None:
+        """Initializes a new instance of the PersistentTensorDB class.
+
+        Args:
+            db_path (str): Path of the SQLite database.
+            sidecar_threshold (int, optional): Size in bytes from which
+                arrays are stored in .npy files in the `<db_path>-tensors`
+                directory. Defaults to None, i.e. all arrays are stored in
+                the database. Ignored for in-memory databases.
+        """
 
         logger.info("Initializing persistent db at %s", db_path)
         self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
         self.lock = Lock()
 
+        if db_path == ":memory:":
+            sidecar_threshold = None
+        self.sidecar_threshold = sidecar_threshold
+        self.sidecar_dir = f"{db_path}-tensors"
+        if sidecar_threshold is not None:
+            os.makedirs(self.sidecar_dir, exist_ok=True)
+
         cursor = self.conn.cursor()
         self._create_model_tensors_table(cursor, PersistentTensorDB.TENSORS_TABLE)
         self._create_model_tensors_table(cursor, PersistentTensorDB.NEXT_ROUND_TENSORS_TABLE)
+        self._migrate_legacy_tables(cursor)
         self._create_task_results_table(cursor)
         self._create_key_value_store(cursor)
         self.conn.commit()
@@ -54,21 +88,86 @@ class PersistentTensorDB:
                 round INTEGER NOT NULL,
                 report INTEGER NOT NULL,
                 tags TEXT,
-                nparray BLOB NOT NULL
+                nparray BLOB NOT NULL,
+                dtype TEXT,
+                shape TEXT,
+                file TEXT
             )
         """
         cursor.execute(query)
 
+    def _migrate_legacy_tables(self, cursor) -> None:
+        """Convert tables written by versions that pickled all values."""
+        for table_name in (
+            PersistentTensorDB.TENSORS_TABLE,
+            PersistentTensorDB.NEXT_ROUND_TENSORS_TABLE,
+        ):
+            columns = self._get_columns(cursor, table_name)
+            for column in ("dtype", "shape", "file"):
+                # Legacy rows keep a NULL dtype, i.e. they are unpickled
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} TEXT")
+
+        if "named_tensors" in self._get_columns(cursor, PersistentTensorDB.TASK_RESULT_TABLE):
+            cursor.execute(
+                f"""
+                SELECT id, collaborator_name, round_number, task_name, data_size, named_tensors
+                FROM {PersistentTensorDB.TASK_RESULT_TABLE}
+                """
+            )
+            rows = cursor.fetchall()
+            self._init_task_results_table(cursor)
+            for task_result_id, *task_result, serialized_blob in rows:
+                self._insert_task_result(
+                    cursor, task_result_id, *task_result, pickle.loads(serialized_blob)
+                )
+
+    @staticmethod
+    def _get_columns(cursor, table_name) -> set:
+        """Return the column names of a table, empty if it does not exist."""
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        return {row[1] for row in cursor.fetchall()}
+
     def _create_task_results_table(self, cursor) -> None:
-        """Creates a table for storing task results."""
+        """Creates the tables for storing task results and their tensors."""
         query = f"""
             CREATE TABLE IF NOT EXISTS {PersistentTensorDB.TASK_RESULT_TABLE} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 collaborator_name TEXT NOT NULL,
                 round_number INTEGER NOT NULL,
                 task_name TEXT NOT NULL,
-                data_size INTEGER NOT NULL,
-                named_tensors BLOB NOT NULL
+                data_size INTEGER NOT NULL
+            )
+        """
+        cursor.execute(query)
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {PersistentTensorDB.TASK_RESULT_TENSORS_TABLE} (
+                task_result_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                dtype TEXT,
+                shape TEXT,
+                PRIMARY KEY (task_result_id, position)
+            )
+        """
+        cursor.execute(query)
+        # Tensors of task results after decompression and delta application,
+        # keyed by the task result as its ID may be reused once the table is
+        # reinitialized
+        query = f"""
+            CREATE TABLE IF NOT EXISTS {PersistentTensorDB.DECODED_TASK_RESULT_TENSORS_TABLE} (
+                collaborator_name TEXT NOT NULL,
+                round_number INTEGER NOT NULL,
+                task_name TEXT NOT NULL,
+                tensor_name TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                round INTEGER NOT NULL,
+                report INTEGER NOT NULL,
+                tags TEXT,
+                nparray BLOB NOT NULL,
+                dtype TEXT,
+                shape TEXT,
+                file TEXT
             )
         """
         cursor.execute(query)
@@ -100,26 +199,84 @@ class PersistentTensorDB:
             task_name (str): Task name.
             data_size (int): Data size.
             named_tensors(List): list of binary representation of tensors.
-        """
-        serialized_blob = pickle.dumps(named_tensors)
 
-        # Insert into the database
-        insert_query = f"""
-        INSERT INTO {PersistentTensorDB.TASK_RESULT_TABLE}
-        (collaborator_name, round_number, task_name, data_size, named_tensors)
-        VALUES (?, ?, ?, ?, ?);
+        Returns:
+            int: The ID of the task result.
         """
         new_id = 0
         with self.lock:
             cursor = self.conn.cursor()
-            cursor.execute(
-                insert_query,
-                (collaborator_name, round_number, task_name, data_size, serialized_blob),
+            new_id = self._insert_task_result(
+                cursor, None, collaborator_name, round_number, task_name, data_size, named_tensors
             )
-            new_id = cursor.lastrowid
             self.conn.commit()
         return new_id
 
+    def _insert_task_result(
+        self,
+        cursor,
+        task_result_id: Optional[int],
+        collaborator_name: str,
+        round_number: int,
+        task_name: str,
+        data_size: int,
+        named_tensors,
+    ) -> int:
+        """Insert a task result and its tensors as part of a transaction."""
+        insert_query = f"""
+        INSERT INTO {PersistentTensorDB.TASK_RESULT_TABLE}
+        (id, collaborator_name, round_number, task_name, data_size)
+        VALUES (?, ?, ?, ?, ?);
+        """
+        cursor.execute(
+            insert_query, (task_result_id, collaborator_name, round_number, task_name, data_size)
+        )
+        task_result_id = cursor.lastrowid
+        insert_query = f"""
+        INSERT INTO {PersistentTensorDB.TASK_RESULT_TENSORS_TABLE}
+        (task_result_id, position, data, dtype, shape)
+        VALUES (?, ?, ?, ?, ?);
+        """
+        cursor.executemany(
+            insert_query,
+            (
+                (task_result_id, position, data, dtype, shape)
+                for position, (dtype, shape, data) in enumerate(
+                    map(self._serialize_array, named_tensors)
+                )
+            ),
+        )
+        return task_result_id
+
+    def list_task_results(self) -> List[Dict[str, Any]]:
+        """
+        List the saved task results, without their tensors.
+
+        Returns:
+            A list of dictionaries containing the ID and details of each task
+            result, in the order they were saved.
+        """
+        with self.lock:
+            cursor = self.conn.cursor()
+            query = f"""
+                SELECT id, collaborator_name, round_number, task_name, data_size
+                FROM {PersistentTensorDB.TASK_RESULT_TABLE}
+                ORDER BY id
+            """
+            cursor.execute(query)
+            return [
+                {
+                    "id": task_result_id,
+                    "collaborator_name": collaborator_name,
+                    "round_number": round_number,
+                    "task_name": task_name,
+                    "data_size": data_size,
+                }
+                for task_result_id, collaborator_name, round_number, task_name, data_size in (
+                    cursor.fetchall()
+                )
+            ]
+
     def get_task_result_by_id(self, task_result_id: int):
         """
         Retrieve a task result by its ID.
@@ -133,15 +290,25 @@ class PersistentTensorDB:
         with self.lock:
             cursor = self.conn.cursor()
             query = f"""
-                SELECT collaborator_name, round_number, task_name, data_size, named_tensors
+                SELECT collaborator_name, round_number, task_name, data_size
                 FROM {PersistentTensorDB.TASK_RESULT_TABLE}
                 WHERE id = ?
             """
             cursor.execute(query, (task_result_id,))
             result = cursor.fetchone()
             if result:
-                collaborator_name, round_number, task_name, data_size, serialized_blob = result
-                serialized_tensors = pickle.loads(serialized_blob)
+                collaborator_name, round_number, task_name, data_size = result
+                query = f"""
+                    SELECT dtype, shape, data
+                    FROM {PersistentTensorDB.TASK_RESULT_TENSORS_TABLE}
+                    WHERE task_result_id = ?
+                    ORDER BY position
+                """
+                cursor.execute(query, (task_result_id,))
+                serialized_tensors = [
+                    self._deserialize_array(data, dtype, shape)
+                    for dtype, shape, data in cursor.fetchall()
+                ]
                 return {
                     "collaborator_name": collaborator_name,
                     "round_number": round_number,
@@ -151,16 +318,106 @@ class PersistentTensorDB:
                 }
             return None
 
-    def _serialize_array(self, array: np.ndarray) -> bytes:
-        """Serialize a NumPy array into bytes for storing in SQLite.
-        note: using pickle since in some cases the array is actually a scalar.
+    def save_decoded_task_results(
+        self,
+        collaborator_name: str,
+        round_number: int,
+        task_name: str,
+        tensor_key_dict: Dict[TensorKey, np.ndarray],
+    ) -> None:
+        """Saves the decoded tensors of a task result.
+
+        They are restored by recovery instead of decoding the task result
+        again.
+
+        Args:
+            collaborator_name (str): Collaborator name.
+            round_number (int): Round number.
+            task_name (str): Task name.
+            tensor_key_dict (Dict[TensorKey, np.ndarray]): The decoded
+                tensors.
+        """
+        query = f"""
+            INSERT INTO {PersistentTensorDB.DECODED_TASK_RESULT_TENSORS_TABLE}
+            (collaborator_name, round_number, task_name,
+             tensor_name, origin, round, report, tags, nparray, dtype, shape, file)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return pickle.dumps(array)
+        with self.lock:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                query,
+                (
+                    (
+                        collaborator_name,
+                        round_number,
+                        task_name,
+                        tensor_name,
+                        origin,
+                        fl_round,
+                        int(report),
+                        json.dumps(tags),
+                        *self._serialize_tensor(nparray),
+                    )
+                    for (tensor_name, origin, fl_round, report, tags), nparray in (
+                        tensor_key_dict.items()
+                    )
+                ),
+            )
+            self.conn.commit()
 
-    def _deserialize_array(self, blob: bytes, dtype: Optional[np.dtype] = None) -> np.ndarray:
-        """Deserialize bytes from SQLite into a NumPy array."""
+    def load_decoded_task_results(self) -> Dict[Tuple[str, int, str], Dict[TensorKey, Any]]:
+        """Load the decoded tensors of all task results.
+
+        Returns:
+            Dict: The decoded tensors of each task result, keyed by
+                (collaborator_name, round_number, task_name).
+        """
+        decoded_task_results = {}
+        with self.lock:
+            cursor = self.conn.cursor()
+            query = f"""
+                SELECT collaborator_name, round_number, task_name,
+                    tensor_name, origin, round, report, tags, nparray, dtype, shape, file
+                FROM {PersistentTensorDB.DECODED_TASK_RESULT_TENSORS_TABLE}
+            """
+            cursor.execute(query)
+            for row in cursor.fetchall():
+                task_result = row[:3]
+                tensor_key, nparray = self._deserialize_tensor(*row[3:])
+                decoded_task_results.setdefault(task_result, {})[tensor_key] = nparray
+        return decoded_task_results
+
+    def _serialize_array(self, array: Any) -> Tuple[Optional[str], Optional[str], Any]:
+        """Serialize a value for storing in SQLite.
+
+        NumPy arrays are stored as their raw buffer, which is passed to
+        SQLite without a copy, and bytes as they are. Other values, e.g.
+        scalars and object arrays, are pickled.
+
+        Returns:
+            Tuple: The dtype and shape columns, and the blob.
+        """
+        if isinstance(array, np.ndarray) and not array.dtype.hasobject:
+            buffer = np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+            return array.dtype.str, json.dumps(array.shape), memoryview(buffer)
+        if isinstance(array, bytes):
+            return BYTES_DTYPE, None, array
+        return None, None, pickle.dumps(array)
+
+    def _deserialize_array(
+        self, blob: bytes, dtype: Optional[str] = None, shape: Optional[str] = None
+    ) -> Any:
+        """Deserialize a value stored by `_serialize_array`.
+
+        Arrays are read-only views of the blob.
+        """
         try:
-            return pickle.loads(blob)
+            if dtype is None:
+                return pickle.loads(blob)
+            if dtype == BYTES_DTYPE:
+                return blob
+            return np.frombuffer(blob, dtype=np.dtype(dtype)).reshape(json.loads(shape))
         except Exception as e:
             raise ValueError(f"Failed to deserialize array: {e}")
 
@@ -226,23 +483,80 @@ class PersistentTensorDB:
                 # Rollback transaction in case of an error
                 self.conn.rollback()
                 raise RuntimeError(f"Failed to finalize round: {e}")
+            # The round is committed even if the files of older tensors
+            # cannot be removed
+            self._remove_unreferenced_files(cursor)
 
     def _persist_tensors(
         self, cursor, table_name, tensor_key_dict: Dict[TensorKey, np.ndarray]
     ) -> None:
         """Insert a dictionary of tensors into the SQLite as part of transaction"""
-        for tensor_key, nparray in tensor_key_dict.items():
-            tensor_name, origin, fl_round, report, tags = tensor_key
-            serialized_array = self._serialize_array(nparray)
-            serialized_tags = json.dumps(tags)
-            query = f"""
-                    INSERT INTO {table_name} (tensor_name, origin, round, report, tags, nparray)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """
-            cursor.execute(
-                query,
-                (tensor_name, origin, fl_round, int(report), serialized_tags, serialized_array),
-            )
+        query = f"""
+                INSERT INTO {table_name}
+                (tensor_name, origin, round, report, tags, nparray, dtype, shape, file)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+        cursor.executemany(
+            query,
+            (
+                (
+                    tensor_name,
+                    origin,
+                    fl_round,
+                    int(report),
+                    json.dumps(tags),
+                    *self._serialize_tensor(nparray),
+                )
+                for (tensor_name, origin, fl_round, report, tags), nparray in (
+                    tensor_key_dict.items()
+                )
+            ),
+        )
+
+    def _serialize_tensor(self, nparray) -> Tuple[Any, Optional[str], Optional[str], Optional[str]]:
+        """Serialize a tensor into the nparray, dtype, shape and file columns.
+
+        Arrays of at least `sidecar_threshold` bytes are saved to a .npy file.
+        """
+        if (
+            self.sidecar_threshold is not None
+            and isinstance(nparray, np.ndarray)
+            and not nparray.dtype.hasobject
+            and nparray.nbytes >= self.sidecar_threshold
+        ):
+            file_name = f"{uuid4().hex}.npy"
+            with open(os.path.join(self.sidecar_dir, file_name), "wb") as f:
+                np.save(f, nparray)
+                f.flush()
+                # The file must be on disk before the row referencing it
+                os.fsync(f.fileno())
+            return b"", nparray.dtype.str, json.dumps(nparray.shape), file_name
+
+        dtype, shape, blob = self._serialize_array(nparray)
+        return blob, dtype, shape, None
+
+    def _remove_unreferenced_files(self, cursor) -> None:
+        """Delete the .npy files of tensors that are no longer stored.
+
+        This is best effort: files that cannot be removed are logged, and
+        removed by a later call.
+        """
+        if self.sidecar_threshold is None:
+            return
+        try:
+            referenced = set()
+            for table_name in (
+                PersistentTensorDB.TENSORS_TABLE,
+                PersistentTensorDB.NEXT_ROUND_TENSORS_TABLE,
+                PersistentTensorDB.DECODED_TASK_RESULT_TENSORS_TABLE,
+            ):
+                cursor.execute(f"SELECT file FROM {table_name} WHERE file IS NOT NULL")
+                referenced.update(file_name for (file_name,) in cursor.fetchall())
+            for file_name in os.listdir(self.sidecar_dir):
+                if file_name.endswith(".npy") and file_name not in referenced:
+                    os.remove(os.path.join(self.sidecar_dir, file_name))
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not remove unreferenced tensor files in {self.sidecar_dir}: {e}")
 
     def _persist_next_round_tensors(
         self, cursor, tensor_key_dict: Dict[TensorKey, np.ndarray]
@@ -255,10 +569,15 @@ class PersistentTensorDB:
 
     def _init_task_results_table(self, cursor):
         """
-        Creates a table for storing task results. Drops the table first if it already exists.
+        Creates the tables for storing task results. Drops the tables first if they already exist.
         """
         drop_table_query = "DROP TABLE IF EXISTS task_results"
         cursor.execute(drop_table_query)
+        for table_name in (
+            PersistentTensorDB.TASK_RESULT_TENSORS_TABLE,
+            PersistentTensorDB.DECODED_TASK_RESULT_TENSORS_TABLE,
+        ):
+            cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
         self._create_task_results_table(cursor)
 
     def _save_round_and_best_score(self, cursor, round_number: int, best_score: float) -> None:
@@ -289,21 +608,36 @@ class PersistentTensorDB:
         return PersistentTensorDB.NEXT_ROUND_TENSORS_TABLE
 
     def load_tensors(self, tensor_table) -> Dict[TensorKey, np.ndarray]:
-        """Load all tensors from the SQLite database and return them as a dictionary."""
+        """Load all tensors from the SQLite database and return them as a dictionary.
+
+        Arrays are read-only views of the stored buffers, or memory-mapped
+        .npy files.
+        """
         tensor_dict = {}
         with self.lock:
             cursor = self.conn.cursor()
-            query = f"SELECT tensor_name, origin, round, report, tags, nparray FROM {tensor_table}"
+            query = f"""
+                SELECT tensor_name, origin, round, report, tags, nparray, dtype, shape, file
+                FROM {tensor_table}
+            """
             cursor.execute(query)
             rows = cursor.fetchall()
             for row in rows:
-                tensor_name, origin, fl_round, report, tags, nparray = row
-                # Deserialize the JSON string back to a Python list
-                deserialized_tags = tuple(json.loads(tags))
-                tensor_key = TensorKey(tensor_name, origin, fl_round, report, deserialized_tags)
-                tensor_dict[tensor_key] = self._deserialize_array(nparray)
+                tensor_key, nparray = self._deserialize_tensor(*row)
+                tensor_dict[tensor_key] = nparray
         return tensor_dict
 
+    def _deserialize_tensor(
+        self, tensor_name, origin, fl_round, report, tags, nparray, dtype, shape, file_name
+    ) -> Tuple[TensorKey, Any]:
+        """Deserialize the TensorKey and tensor of a row stored by `_persist_tensors`."""
+        # Deserialize the JSON string back to a Python list
+        deserialized_tags = tuple(json.loads(tags))
+        tensor_key = TensorKey(tensor_name, origin, fl_round, report, deserialized_tags)
+        if file_name is not None:
+            return tensor_key, np.load(os.path.join(self.sidecar_dir, file_name), mmap_mode="r")
+        return tensor_key, self._deserialize_array(nparray, dtype, shape)
+
     def get_round_and_best_score(self) -> tuple[int, float]:
         """Retrieve the round number and best score from the database."""
         with self.lock:
@@ -354,6 +688,7 @@ class PersistentTensorDB:
                 (current_round - remove_older_than,),
             )
             self.conn.commit()
+            self._remove_unreferenced_files(cursor)
 
     def close(self) -> None:
         """Close the SQLite database connection."""
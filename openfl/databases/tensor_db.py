@@ -4,58 +4,197 @@
 
 """TensorDB Module."""
 
-from threading import Lock
+from threading import Condition, Lock
 from types import MethodType
-from typing import Dict, Iterator, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import numpy as np
 import pandas as pd
 
-from openfl.databases.utilities import ROUND_PLACEHOLDER, _retrieve, _search, _store
+from openfl.databases.utilities import (
+    ROUND_PLACEHOLDER,
+    TensorAccumulator,
+    _retrieve,
+    _search,
+    _store,
+)
 from openfl.interface.aggregation_functions import AggregationFunction
 from openfl.utilities import LocalTensor, TensorKey, change_tags
 
+COLUMN_TYPES = {
+    "tensor_name": "string",
+    "origin": "string",
+    "round": "int32",
+    "report": "bool",
+    "tags": "object",
+    "nparray": "object",
+}
+
+
+class TensorDBRow(dict):
+    """A row of the TensorDB, as yielded to aggregation functions.
+
+    Columns are read as items, e.g. `row["nparray"]`, or as attributes, e.g.
+    `row.nparray`, like the pandas Series rows of earlier versions.
+    """
+
+    def __getattr__(self, name):
+        """Return the value of a column."""
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
 
 class TensorDB:
     """The TensorDB stores a tensor key and the data that it corresponds to.
 
-    It is built on top of a pandas dataframe for it's easy insertion, retreival
-    and aggregation capabilities. Each collaborator and aggregator has its own
-    TensorDB.
+    Tensors are kept in a dictionary keyed by `TensorKey`, so inserts and
+    exact-key lookups are O(1). Two secondary indexes, one by
+    `(round, tags)` and one by `tensor_name`, serve the range queries used
+    during aggregation. A pandas DataFrame view is only materialized on
+    demand, for privileged aggregation functions and for printing. Each
+    collaborator and aggregator has its own TensorDB.
+
+    For linear aggregation functions, collaborator tensors can also be folded
+    into running aggregates as they arrive (see `accumulate_tensor`), so that
+    `get_aggregated_tensor` does not need to stack them at the end of the
+    round.
+
+    Encoded forms of tensors (e.g. the NamedTensor protobuf sent to
+    collaborators) can be cached alongside them (see `cache_encoded_tensor`).
+    They are dropped whenever the tensor is replaced or removed.
 
     Attributes:
-        tensor_db: A pandas DataFrame that stores the tensor key and the data
-            that it corresponds to.
         mutex: A threading Lock object used to ensure thread-safe operations
-            on the tensor_db Dataframe.
+            on the tensor store and its indexes.
+        tensor_cached: A threading Condition on the mutex, notified whenever
+            a tensor is inserted (see `wait_for_tensor`).
     """
 
     def __init__(self) -> None:
         """Initializes a new instance of the TensorDB class."""
-        types_dict = {
-            "tensor_name": "string",
-            "origin": "string",
-            "round": "int32",
-            "report": "bool",
-            "tags": "object",
-            "nparray": "object",
-        }
-        self.tensor_db = pd.DataFrame(
-            {col: pd.Series(dtype=dtype) for col, dtype in types_dict.items()}
-        )
-        self._bind_convenience_methods()
+        self._tensors: Dict[TensorKey, np.ndarray] = {}
+        # Secondary indexes. Dicts with `None` values are used as
+        # insertion-ordered sets of TensorKeys.
+        self._round_tags_index: Dict[tuple, Dict[TensorKey, None]] = {}
+        self._name_index: Dict[str, Dict[TensorKey, None]] = {}
+        self._accumulators: Dict[TensorKey, TensorAccumulator] = {}
+        # {TensorKey: {encoding: encoded tensor}}
+        self._encoded_tensors: Dict[TensorKey, Dict[tuple, Any]] = {}
+        # Callbacks waiting for a tensor to be inserted
+        self._tensor_callbacks: Dict[TensorKey, List[Callable[[], None]]] = {}
 
         self.mutex = Lock()
+        self.tensor_cached = Condition(self.mutex)
+
+    @property
+    def tensor_db(self) -> pd.DataFrame:
+        """A pandas DataFrame view of the TensorDB contents.
+
+        The view is built on demand and is a snapshot: modifying it does not
+        change the TensorDB.
+
+        Returns:
+            pd.DataFrame: A DataFrame with the `tensor_name`, `origin`,
+                `round`, `report`, `tags` and `nparray` columns.
+        """
+        with self.mutex:
+            return self._to_dataframe()
+
+    def _to_dataframe(self) -> pd.DataFrame:
+        """Build a DataFrame from the tensor store.
+
+        Must be called with the mutex held.
+
+        Returns:
+            pd.DataFrame: The DataFrame representation of the TensorDB, with
+                the `store`, `retrieve` and `search` convenience methods bound.
+        """
+        rows = [(*tensor_key, nparray) for tensor_key, nparray in self._tensors.items()]
+        columns = list(COLUMN_TYPES)
+        if rows:
+            data = {
+                col: pd.Series([row[i] for row in rows], dtype=COLUMN_TYPES[col])
+                for i, col in enumerate(columns)
+            }
+        else:
+            data = {col: pd.Series(dtype=dtype) for col, dtype in COLUMN_TYPES.items()}
+        df = pd.DataFrame(data)
+        df.store = MethodType(_store, df)
+        df.retrieve = MethodType(_retrieve, df)
+        df.search = MethodType(_search, df)
+        return df
+
+    def _load_dataframe(self, df: pd.DataFrame) -> None:
+        """Replace the tensor store with the contents of a DataFrame.
+
+        Used to write back the changes made by privileged aggregation
+        functions. Must be called with the mutex held.
+
+        Args:
+            df (pd.DataFrame): A DataFrame with the TensorDB columns.
+        """
+        self._clear()
+        for row in df.itertuples(index=False):
+            tensor_key = TensorKey(row.tensor_name, row.origin, row.round, row.report, row.tags)
+            self._insert(tensor_key, row.nparray)
+
+    def _clear(self) -> None:
+        """Remove all tensors and index entries. Must be called with the mutex held."""
+        self._tensors = {}
+        self._round_tags_index = {}
+        self._name_index = {}
+        self._encoded_tensors = {}
 
-    def _bind_convenience_methods(self):
-        """Bind convenience methods for the TensorDB dataframe to make storage,
-        retrieval, and search easier."""
-        if not hasattr(self.tensor_db, "store"):
-            self.tensor_db.store = MethodType(_store, self.tensor_db)
-        if not hasattr(self.tensor_db, "retrieve"):
-            self.tensor_db.retrieve = MethodType(_retrieve, self.tensor_db)
-        if not hasattr(self.tensor_db, "search"):
-            self.tensor_db.search = MethodType(_search, self.tensor_db)
+    def _insert(self, tensor_key: TensorKey, nparray: np.ndarray) -> None:
+        """Insert (or overwrite) a single tensor and update the indexes.
+
+        Must be called with the mutex held.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor.
+            nparray (np.ndarray): The tensor value.
+        """
+        tensor_name, origin, fl_round, report, tags = tensor_key
+        tensor_key = TensorKey(
+            str(tensor_name), str(origin), int(fl_round), bool(report), tuple(tags)
+        )
+        self._tensors[tensor_key] = nparray
+        self._encoded_tensors.pop(tensor_key, None)
+        round_tags = (tensor_key.round_number, tensor_key.tags)
+        self.tensor_cached.notify_all()
+        for callback in self._tensor_callbacks.pop(tensor_key, ()):
+            callback()
+        self._round_tags_index.setdefault(round_tags, {})[tensor_key] = None
+        self._name_index.setdefault(tensor_key.tensor_name, {})[tensor_key] = None
+
+    def _remove(self, tensor_key: TensorKey) -> None:
+        """Remove a single tensor and its index entries.
+
+        Must be called with the mutex held.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor.
+        """
+        del self._tensors[tensor_key]
+        self._encoded_tensors.pop(tensor_key, None)
+        round_tags = (tensor_key.round_number, tensor_key.tags)
+        del self._round_tags_index[round_tags][tensor_key]
+        if not self._round_tags_index[round_tags]:
+            del self._round_tags_index[round_tags]
+        del self._name_index[tensor_key.tensor_name][tensor_key]
+        if not self._name_index[tensor_key.tensor_name]:
+            del self._name_index[tensor_key.tensor_name]
+
+    def __len__(self) -> int:
+        """Returns the number of tensors stored in the TensorDB."""
+        return len(self._tensors)
+
+    def __contains__(self, tensor_key: TensorKey) -> bool:
+        """Returns whether the tensor_key is stored in the TensorDB."""
+        with self.mutex:
+            return tensor_key in self._tensors
 
     def __repr__(self) -> str:
         """Returns the string representation of the TensorDB object.
@@ -86,16 +225,30 @@ class TensorDB:
         if remove_older_than < 0:
             # Getting a negative argument calls off cleaning
             return
-        current_round = self.tensor_db["round"].astype(int).max()
-        if current_round == ROUND_PLACEHOLDER:
-            current_round = np.sort(self.tensor_db["round"].astype(int).unique())[-2]
-        self.tensor_db = self.tensor_db[
-            (self.tensor_db["round"].astype(int) > current_round - remove_older_than)
-            | self.tensor_db["report"]
-        ].reset_index(drop=True)
+        with self.mutex:
+            rounds = sorted({fl_round for fl_round, _ in self._round_tags_index})
+            if not rounds:
+                return
+            current_round = rounds[-1]
+            if current_round == ROUND_PLACEHOLDER:
+                if len(rounds) < 2:
+                    return
+                current_round = rounds[-2]
+            for tensor_key in list(self._tensors):
+                if tensor_key.report:
+                    continue
+                if tensor_key.round_number <= current_round - remove_older_than:
+                    self._remove(tensor_key)
+            self._accumulators = {
+                tensor_key: accumulator
+                for tensor_key, accumulator in self._accumulators.items()
+                if tensor_key.round_number > current_round - remove_older_than
+            }
 
     def cache_tensor(self, tensor_key_dict: Dict[TensorKey, np.ndarray]) -> None:
-        """Insert a tensor into TensorDB (dataframe).
+        """Insert tensors into TensorDB.
+
+        A tensor cached under an existing key replaces the previous value.
 
         Args:
             tensor_key_dict (Dict[TensorKey, np.ndarray]): A dictionary where
@@ -104,27 +257,41 @@ class TensorDB:
         Returns:
             None
         """
-        entries_to_add = []
         with self.mutex:
             for tensor_key, nparray in tensor_key_dict.items():
-                tensor_name, origin, fl_round, report, tags = tensor_key
-                entries_to_add.append(
-                    pd.DataFrame(
-                        [
-                            [
-                                tensor_name,
-                                origin,
-                                fl_round,
-                                report,
-                                tags,
-                                nparray,
-                            ]
-                        ],
-                        columns=list(self.tensor_db.columns),
-                    )
-                )
+                self._insert(tensor_key, nparray)
+
+    def accumulate_tensor(
+        self,
+        tensor_key: TensorKey,
+        collaborator_name: str,
+        nparray: np.ndarray,
+        weight: float,
+        aggregation_function: AggregationFunction,
+    ) -> None:
+        """Fold a collaborator tensor into the running aggregate for a tensor key.
+
+        This is a no-op unless the aggregation function supports streaming.
 
-            self.tensor_db = pd.concat([self.tensor_db, *entries_to_add], ignore_index=True)
+        Args:
+            tensor_key (TensorKey): The key of the aggregated tensor, i.e.
+                without the collaborator tag.
+            collaborator_name (str): Name of the collaborator that sent the
+                tensor.
+            nparray (np.ndarray): The collaborator tensor.
+            weight (float): The (unnormalized) collaborator weight.
+            aggregation_function (AggregationFunction): The aggregation
+                function that will be used for this tensor key.
+        """
+        if not getattr(aggregation_function, "_streaming", False):
+            return
+        with self.mutex:
+            accumulator = self._accumulators.get(tensor_key)
+            if accumulator is None:
+                normalize = aggregation_function.streaming_normalized(tensor_key.tensor_name)
+                accumulator = TensorAccumulator(normalize)
+                self._accumulators[tensor_key] = accumulator
+        accumulator.add(collaborator_name, nparray, weight)
 
     def get_tensor_from_cache(self, tensor_key: TensorKey) -> Optional[np.ndarray]:
         """Perform a lookup of the tensor_key in the TensorDB.
@@ -136,20 +303,97 @@ class TensorDB:
             Optional[np.ndarray]: The numpy array if it is available.
                 Otherwise, returns None.
         """
-        tensor_name, origin, fl_round, report, tags = tensor_key
-
         # TODO come up with easy way to ignore compression
-        df = self.tensor_db[
-            (self.tensor_db["tensor_name"] == tensor_name)
-            & (self.tensor_db["origin"] == origin)
-            & (self.tensor_db["round"] == fl_round)
-            & (self.tensor_db["report"] == report)
-            & (self.tensor_db["tags"] == tags)
-        ]
+        with self.mutex:
+            nparray = self._tensors.get(tensor_key)
+        if nparray is None:
+            return None
+        return np.array(nparray)
+
+    def wait_for_tensor(
+        self, tensor_key: TensorKey, timeout: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """Wait until the tensor_key is in the TensorDB and return its value.
+
+        The waiting thread is woken up as soon as the tensor is cached,
+        instead of polling the TensorDB.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor to wait for.
+            timeout (float, optional): Maximum number of seconds to wait.
+                Defaults to None (wait forever).
 
-        if len(df) == 0:
+        Returns:
+            Optional[np.ndarray]: The numpy array, or None if it was not
+                cached before the timeout.
+        """
+        with self.tensor_cached:
+            self.tensor_cached.wait_for(lambda: tensor_key in self._tensors, timeout)
+            nparray = self._tensors.get(tensor_key)
+        if nparray is None:
             return None
-        return np.array(df["nparray"].iloc[0])
+        return np.array(nparray)
+
+    def add_tensor_callback(self, tensor_key: TensorKey, callback: Callable[[], None]) -> None:
+        """Call `callback` once the tensor_key is in the TensorDB.
+
+        This is the non-blocking counterpart of `wait_for_tensor`, e.g. for
+        event loops. The callback is called right away if the tensor is
+        already stored. Otherwise it is called by the thread that caches the
+        tensor, with the mutex held, so it must return quickly and must not
+        access the TensorDB.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor to wait for.
+            callback (Callable[[], None]): The function to call.
+        """
+        with self.mutex:
+            if tensor_key not in self._tensors:
+                self._tensor_callbacks.setdefault(tensor_key, []).append(callback)
+                return
+        callback()
+
+    def remove_tensor_callback(self, tensor_key: TensorKey, callback: Callable[[], None]) -> None:
+        """Remove a callback added with `add_tensor_callback` that was not called yet.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor.
+            callback (Callable[[], None]): The function to remove.
+        """
+        with self.mutex:
+            callbacks = self._tensor_callbacks.get(tensor_key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._tensor_callbacks.pop(tensor_key, None)
+
+    def cache_encoded_tensor(self, tensor_key: TensorKey, encoding: tuple, encoded: Any) -> None:
+        """Cache an encoded form of a tensor stored in the TensorDB.
+
+        The encoded tensor is kept until the tensor is replaced or removed
+        (e.g. by `clean_up`). Nothing is cached if the tensor is not stored.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor.
+            encoding (tuple): The options the tensor was encoded with.
+            encoded (Any): The encoded tensor.
+        """
+        with self.mutex:
+            if tensor_key in self._tensors:
+                self._encoded_tensors.setdefault(tensor_key, {})[encoding] = encoded
+
+    def get_encoded_tensor_from_cache(self, tensor_key: TensorKey, encoding: tuple) -> Any:
+        """Perform a lookup of an encoded form of a tensor.
+
+        Args:
+            tensor_key (TensorKey): The key of the tensor.
+            encoding (tuple): The options the tensor was encoded with.
+
+        Returns:
+            Any: The encoded tensor if it is cached. Otherwise, returns None.
+        """
+        with self.mutex:
+            return self._encoded_tensors.get(tensor_key, {}).get(encoding)
 
     def get_tensors_by_round_and_tags(self, fl_round: int, tags: tuple) -> dict:
         """Retrieve all tensors that match the specified round and tags.
@@ -161,28 +405,9 @@ class TensorDB:
         Returns:
             dict: A dictionary where the keys are TensorKey objects and the values are numpy arrays.
         """
-        # Filter the DataFrame based on the round and tags
-        df = self.tensor_db[
-            (self.tensor_db["round"] == fl_round) & (self.tensor_db["tags"] == tags)
-        ]
-
-        # Check if any tensors match the criteria
-        if len(df) == 0:
-            return {}
-
-        # Construct a dictionary mapping TensorKey to np.ndarray
-        tensor_dict = {}
-        for _, row in df.iterrows():
-            tensor_key = TensorKey(
-                tensor_name=row["tensor_name"],
-                origin=row["origin"],
-                round_number=row["round"],
-                report=row["report"],
-                tags=row["tags"],
-            )
-            tensor_dict[tensor_key] = np.array(row["nparray"])
-
-        return tensor_dict
+        with self.mutex:
+            tensor_keys = list(self._round_tags_index.get((fl_round, tags), ()))
+            return {tensor_key: np.array(self._tensors[tensor_key]) for tensor_key in tensor_keys}
 
     def get_aggregated_tensor(
         self,
@@ -194,7 +419,9 @@ class TensorDB:
         Determine whether all of the collaborator tensors are present for a
         given tensor key
 
-        Returns their weighted average.
+        Returns their weighted average. If the tensors were folded into a
+        running aggregate with `accumulate_tensor` for exactly these
+        collaborators, the running aggregate is finalized instead.
 
         Args:
             tensor_key (TensorKey): The tensor key to be resolved. If origin
@@ -205,6 +432,8 @@ class TensorDB:
             aggregation_function (AggregationFunction): Call the underlying
                 numpy aggregation function to use to compute the weighted
                 average. Default is just the weighted average.
+                Its `db_iterator` yields the rows of the tensor being
+                aggregated only.
 
         Returns:
             agg_nparray Optional[np.ndarray]: weighted_nparray The weighted
@@ -223,31 +452,29 @@ class TensorDB:
         # Check if the aggregated tensor is already present in TensorDB
         tensor_name, origin, fl_round, report, tags = tensor_key
 
-        raw_df = self.tensor_db[
-            (self.tensor_db["tensor_name"] == tensor_name)
-            & (self.tensor_db["origin"] == origin)
-            & (self.tensor_db["round"] == fl_round)
-            & (self.tensor_db["report"] == report)
-            & (self.tensor_db["tags"] == tags)
-        ]["nparray"]
-        if len(raw_df) > 0:
-            return np.array(raw_df.iloc[0]), {}
+        with self.mutex:
+            nparray = self._tensors.get(tensor_key)
+        if nparray is not None:
+            return np.array(nparray), {}
+
+        if getattr(aggregation_function, "_streaming", False):
+            with self.mutex:
+                accumulator = self._accumulators.pop(tensor_key, None)
+            if accumulator is not None:
+                agg_nparray = accumulator.result(collaborator_weight_dict)
+                if agg_nparray is not None:
+                    self.cache_tensor({tensor_key: agg_nparray})
+                    return np.array(agg_nparray)
 
         for col in collaborator_names:
             new_tags = change_tags(tags, add_field=col)
-            raw_df = self.tensor_db[
-                (self.tensor_db["tensor_name"] == tensor_name)
-                & (self.tensor_db["origin"] == origin)
-                & (self.tensor_db["round"] == fl_round)
-                & (self.tensor_db["report"] == report)
-                & (self.tensor_db["tags"] == new_tags)
-            ]["nparray"]
-            if len(raw_df) == 0:
-                tk = TensorKey(tensor_name, origin, report, fl_round, new_tags)
-                print(f"No results for collaborator {col}, TensorKey={tk}")
+            col_tensor_key = TensorKey(tensor_name, origin, fl_round, report, new_tags)
+            with self.mutex:
+                nparray = self._tensors.get(col_tensor_key)
+            if nparray is None:
+                print(f"No results for collaborator {col}, TensorKey={col_tensor_key}")
                 return None
-            else:
-                agg_tensor_dict[col] = raw_df.iloc[0]
+            agg_tensor_dict[col] = nparray
 
         local_tensors = [
             LocalTensor(
@@ -261,25 +488,33 @@ class TensorDB:
         if hasattr(aggregation_function, "_privileged"):
             if aggregation_function._privileged:
                 with self.mutex:
-                    self._bind_convenience_methods()
+                    # Privileged functions get write access to a DataFrame
+                    # view, whose contents are loaded back afterwards.
+                    df = self._to_dataframe()
                     agg_nparray = aggregation_function(
                         local_tensors,
-                        self.tensor_db,
+                        df,
                         tensor_name,
                         fl_round,
                         tags,
                     )
+                    self._load_dataframe(df)
                 self.cache_tensor({tensor_key: agg_nparray})
 
                 return np.array(agg_nparray)
 
-        db_iterator = self._iterate()
+        db_iterator = self._iterate(tensor_name=tensor_name)
         agg_nparray = aggregation_function(local_tensors, db_iterator, tensor_name, fl_round, tags)
         self.cache_tensor({tensor_key: agg_nparray})
 
         return np.array(agg_nparray)
 
-    def _iterate(self, order_by: str = "round", ascending: bool = False) -> Iterator[pd.Series]:
+    def _iterate(
+        self,
+        order_by: str = "round",
+        ascending: bool = False,
+        tensor_name: Optional[str] = None,
+    ) -> Iterator[TensorDBRow]:
         """Returns an iterator over the rows of the TensorDB, sorted by a
         specified column.
 
@@ -288,11 +523,29 @@ class TensorDB:
                 'round'.
             ascending (bool, optional): Whether to sort in ascending order.
                 Defaults to False.
+            tensor_name (str, optional): If given, only rows for this tensor
+                name are returned.
 
         Returns:
-            Iterator[pd.Series]: An iterator over the rows of the TensorDB.
+            Iterator[TensorDBRow]: An iterator over the rows of the TensorDB.
+                Each row maps the `round`, `nparray`, `tensor_name` and `tags`
+                columns to their values.
         """
-        columns = ["round", "nparray", "tensor_name", "tags"]
-        rows = self.tensor_db[columns].sort_values(by=order_by, ascending=ascending).iterrows()
-        for _, row in rows:
-            yield row
+        with self.mutex:
+            if tensor_name is None:
+                items = list(self._tensors.items())
+            else:
+                tensor_keys = self._name_index.get(tensor_name, ())
+                items = [(tensor_key, self._tensors[tensor_key]) for tensor_key in tensor_keys]
+
+        rows = [
+            TensorDBRow(
+                round=tensor_key.round_number,
+                nparray=nparray,
+                tensor_name=tensor_key.tensor_name,
+                tags=tensor_key.tags,
+            )
+            for tensor_key, nparray in items
+        ]
+        rows.sort(key=lambda row: row[order_by], reverse=not ascending)
+        yield from rows
@@ -2,4 +2,5 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from openfl.databases.utilities.accumulator import TensorAccumulator
 from openfl.databases.utilities.dataframe import ROUND_PLACEHOLDER, _retrieve, _search, _store
@@ -0,0 +1,110 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""Running aggregate of collaborator tensors."""
+
+from threading import Lock
+from typing import Optional
+
+import numpy as np
+
+
+class TensorAccumulator:
+    """Running (weighted) sum of the collaborator tensors for one TensorKey.
+
+    Collaborator tensors are folded into a single preallocated buffer as they
+    arrive, so the aggregate is ready at the end of the round without stacking
+    every collaborator tensor into a new array.
+
+    Attributes:
+        normalize (bool): If True, tensors are weighted and the sum is divided
+            by the total weight (weighted average). Otherwise tensors are
+            summed without weights.
+        weighted_sum (np.ndarray): The running sum, in float64 or wider, or
+            None if nothing has been folded in yet.
+        dtype (np.dtype): The type of the first tensor folded in, which the
+            sum is returned in if it is not normalized.
+        weights (dict): Weight folded in for each collaborator.
+        valid (bool): False if a tensor could not be folded in (e.g. shape
+            mismatch), in which case the aggregate must be recomputed.
+        lock: A threading Lock object that serializes updates of this
+            accumulator.
+    """
+
+    def __init__(self, normalize: bool = True) -> None:
+        """Initializes a new instance of the TensorAccumulator class.
+
+        Args:
+            normalize (bool, optional): Whether the sum is a weighted average.
+                Defaults to True.
+        """
+        self.normalize = normalize
+        self.weighted_sum = None
+        self.dtype = None
+        self.weights = {}
+        self.valid = True
+        self.lock = Lock()
+
+    def add(self, collaborator_name: str, nparray: np.ndarray, weight: float) -> None:
+        """Fold a collaborator tensor into the running sum.
+
+        Args:
+            collaborator_name (str): Name of the collaborator that sent the
+                tensor.
+            nparray (np.ndarray): The collaborator tensor.
+            weight (float): The (unnormalized) collaborator weight.
+        """
+        nparray = np.asarray(nparray)
+        coefficient = weight if self.normalize else 1.0
+        with self.lock:
+            if not self.valid:
+                return
+            if collaborator_name in self.weights or nparray.dtype.kind not in "biufc":
+                self._invalidate()
+                return
+            if self.weighted_sum is None:
+                dtype = np.result_type(nparray.dtype, np.float64)
+                self.weighted_sum = np.multiply(nparray, coefficient, dtype=dtype)
+                self.dtype = nparray.dtype
+            elif self.weighted_sum.shape != nparray.shape:
+                self._invalidate()
+                return
+            else:
+                self.weighted_sum += coefficient * nparray
+            self.weights[collaborator_name] = weight
+
+    def _invalidate(self) -> None:
+        """Drop the running sum. Must be called with the lock held."""
+        self.valid = False
+        self.weighted_sum = None
+
+    def result(self, collaborator_weight_dict: dict) -> Optional[np.ndarray]:
+        """Finalize the aggregate for the given collaborators.
+
+        Args:
+            collaborator_weight_dict (dict): A dictionary where the keys are
+                collaborator names and the values are their normalized
+                weights.
+
+        Returns:
+            Optional[np.ndarray]: The aggregated tensor, or None if the
+                accumulator does not cover exactly these collaborators with
+                these weights.
+        """
+        with self.lock:
+            if not self.valid or self.weighted_sum is None:
+                return None
+            if set(self.weights) != set(collaborator_weight_dict):
+                return None
+            if not self.normalize:
+                # Like np.sum, which does not widen float32 tensors
+                return self.weighted_sum.astype(self.dtype)
+
+            weight_total = sum(self.weights.values())
+            if weight_total == 0:
+                return None
+            for col, weight in collaborator_weight_dict.items():
+                if not np.isclose(self.weights[col] / weight_total, weight):
+                    return None
+            return self.weighted_sum / weight_total
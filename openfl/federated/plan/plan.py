@@ -15,7 +15,11 @@ from yaml import SafeDumper, dump, safe_load
 
 from openfl.interface.aggregation_functions import AggregationFunction, WeightedAverage
 from openfl.interface.cli_helper import WORKSPACE
-from openfl.transport import AggregatorGRPCClient, AggregatorGRPCServer
+from openfl.transport import (
+    AggregatorGRPCClient,
+    AggregatorGRPCServer,
+    AsyncAggregatorGRPCServer,
+)
 from openfl.utilities.utils import getfqdn_env
 
 SETTINGS = "settings"
@@ -596,7 +600,9 @@ class Plan:
             **kwargs: Additional keyword arguments.
 
         Returns:
-            AggregatorGRPCServer: gRPC server of the aggregator instance.
+            AggregatorGRPCServer: gRPC server of the aggregator instance. An
+                AsyncAggregatorGRPCServer if the `async_server` network
+                setting is enabled.
         """
         common_name = self.config["network"][SETTINGS]["agg_addr"].lower()
 
@@ -617,7 +623,10 @@ class Plan:
         server_args["aggregator"] = self.get_aggregator()
 
         if self.server_ is None:
-            self.server_ = AggregatorGRPCServer(**server_args)
+            if server_args.get("async_server", False):
+                self.server_ = AsyncAggregatorGRPCServer(**server_args)
+            else:
+                self.server_ = AggregatorGRPCServer(**server_args)
 
         return self.server_
 
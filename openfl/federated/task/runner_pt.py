@@ -4,7 +4,7 @@
 
 """PyTorchTaskRunner module."""
 
-from copy import deepcopy
+import warnings
 from typing import Iterator, Tuple
 
 import numpy as np
@@ -55,6 +55,8 @@ class PyTorchTaskRunner(nn.Module, TaskRunner):
         self.optimizer = optimizer
         self.loss_fn = loss_fn
         self.training_round_completed = False
+        # Pinned buffers the tensors are loaded to the device from
+        self._staging_buffers = {}
 
         # overwrite attribute to account for one optimizer param (in every
         # child model that does not overwrite get and set tensordict) that is
@@ -287,14 +289,25 @@ class PyTorchTaskRunner(nn.Module, TaskRunner):
         # get device for correct placement of tensors
         device = self.device
 
-        new_state = {}
+        # Copy the arrays into the storage of the parameters and buffers,
+        # rather than building new tensors for load_state_dict to copy from.
         # Grabbing keys from model's state_dict helps to confirm we have
         # everything
-        for k in self.state_dict():
-            new_state[k] = torch.tensor(tensor_dict.pop(k)).to(device)
-
-        # set model state
-        self.load_state_dict(new_state)
+        with torch.no_grad():
+            for k, target in self.state_dict().items():
+                source = from_numpy(tensor_dict.pop(k))
+                if source.shape != target.shape:
+                    raise RuntimeError(
+                        f"Size mismatch for {k}: copying a tensor of shape "
+                        f"{tuple(source.shape)}, the shape in the model is "
+                        f"{tuple(target.shape)}"
+                    )
+                if target.device.type == "cuda":
+                    target.copy_(self._staging_buffer(k, source), non_blocking=True)
+                else:
+                    target.copy_(source)
+            if torch.device(device).type == "cuda":
+                torch.cuda.synchronize()
 
         if with_opt_vars:
             # see if there is state to restore first
@@ -304,6 +317,27 @@ class PyTorchTaskRunner(nn.Module, TaskRunner):
             # sanity check that we did not record any state that was not used
             assert len(tensor_dict) == 0
 
+    def _staging_buffer(self, name, source):
+        """Copy a CPU tensor into the pinned staging buffer of a tensor.
+
+        Copies to the device from pinned memory can run asynchronously, so
+        the buffer of each tensor is kept across rounds rather than pinned
+        again on every load.
+
+        Args:
+            name (str): The name of the tensor.
+            source (torch.Tensor): The CPU tensor.
+
+        Returns:
+            buffer (torch.Tensor): The pinned buffer holding the tensor.
+        """
+        buffer = self._staging_buffers.get(name)
+        if buffer is None or buffer.shape != source.shape or buffer.dtype != source.dtype:
+            buffer = torch.empty(source.shape, dtype=source.dtype, pin_memory=True)
+            self._staging_buffers[name] = buffer
+        buffer.copy_(source)
+        return buffer
+
     def get_optimizer(self):
         """Get the optimizer of this instance.
 
@@ -582,7 +616,7 @@ def _derive_opt_state_dict(opt_state_dict):
         for idx, param_id in enumerate(group["params"]):
             for subkey, tag in state_subkeys_and_tags:
                 if tag == "istensor":
-                    new_v = opt_state_dict["state"][param_id][subkey].cpu().numpy()
+                    new_v = _to_numpy(opt_state_dict["state"][param_id][subkey])
                 else:
                     new_v = np.array([opt_state_dict["state"][param_id][subkey]])
                 derived_opt_state_dict[f"__opt_state_{group_idx}_{idx}_{tag}_{subkey}"] = new_v
@@ -658,7 +692,9 @@ def _get_optimizer_state(optimizer):
     Returns:
         derived_opt_state_dict (dict): Derived optimizer state dictionary.
     """
-    opt_state_dict = deepcopy(optimizer.state_dict())
+    # state_dict() builds new param groups, and the state tensors are copied
+    # when converted to numpy, so nothing here needs a deep copy
+    opt_state_dict = optimizer.state_dict()
 
     # Optimizer state might not have some parts representing frozen parameters
     # So we do not synchronize them
@@ -707,15 +743,49 @@ def to_cpu_numpy(state):
     Returns:
         state (dict): State dictionary with values as numpy arrays.
     """
-    # deep copy so as to decouple from active model
-    state = deepcopy(state)
-
+    numpy_state = {}
     for k, v in state.items():
         # When restoring, we currently assume all values are tensors.
         if not torch.is_tensor(v):
             raise ValueError(
                 "We do not currently support non-tensors coming from model.state_dict()"
             )
-        # get as a numpy array, making sure is on cpu
-        state[k] = v.cpu().numpy()
-    return state
+        numpy_state[k] = _to_numpy(v)
+    return numpy_state
+
+
+def _to_numpy(tensor):
+    """Copy a tensor into a Numpy array decoupled from the tensor.
+
+    Tensors on the CPU are copied once from a Numpy view of their storage,
+    tensors on other devices once by the transfer to the CPU.
+
+    Args:
+        tensor (torch.Tensor): The tensor.
+
+    Returns:
+        The Numpy array.
+    """
+    tensor = tensor.detach()
+    if tensor.device.type == "cpu":
+        return tensor.numpy().copy()
+    return tensor.cpu().numpy()
+
+
+def from_numpy(array):
+    """Return a CPU tensor sharing the memory of a Numpy array.
+
+    Args:
+        array: A Numpy array or scalar.
+
+    Returns:
+        The tensor, which is only read from.
+    """
+    array = np.asarray(array)
+    if not array.flags.writeable:
+        # Arrays decompressed from bytes are read-only. The tensor is only
+        # copied from, so torch's warning about writes does not apply.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return torch.from_numpy(array)
+    return torch.from_numpy(array)
@@ -34,6 +34,9 @@ class AdaptiveAggregation(AggregationFunction):
         super().__init__()
         self.optimizer = optimizer
         self.default_agg_func = agg_func
+        # The optimizer state is updated on every call, so this function
+        # must run in the aggregator process
+        self._stateful = True
 
     @staticmethod
     def _make_gradient(
@@ -61,7 +64,7 @@ class AdaptiveAggregation(AggregationFunction):
         Args:
             local_tensors (list[openfl.utilities.LocalTensor]): List of local
                 tensors to aggregate.
-            db_iterator: An iterator over history of all tensors. Columns:
+            db_iterator: An iterator over history of the tensor. Columns:
                 - 'tensor_name': name of the tensor.
                     Examples for `torch.nn.Module`s: 'conv1.weight','fc2.bias'.
                 - 'fl_round': 0-based number of round corresponding to this
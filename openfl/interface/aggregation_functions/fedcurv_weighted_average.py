@@ -19,9 +19,18 @@ class FedCurvWeightedAverage(WeightedAverage):
     FedCurv paper: https://arxiv.org/pdf/1910.07796.pdf
     """
 
+    @staticmethod
+    def _is_fisher_variable(tensor_name):
+        """Whether the tensor is one of the summed Fisher matrix variables."""
+        return tensor_name.endswith(("_u", "_v", "_w"))
+
+    def streaming_normalized(self, tensor_name) -> bool:
+        """Fisher matrix variables are summed, everything else is averaged."""
+        return not self._is_fisher_variable(tensor_name)
+
     def call(self, local_tensors, tensor_db, tensor_name, fl_round, tags):
         """Apply aggregation."""
-        if tensor_name.endswith("_u") or tensor_name.endswith("_v") or tensor_name.endswith("_w"):
+        if self._is_fisher_variable(tensor_name):
             tensors = [local_tensor.tensor for local_tensor in local_tensors]
             agg_result = np.sum(tensors, axis=0)
             return agg_result
@@ -15,7 +15,34 @@ def weighted_average(tensors, weights):
 
 
 class WeightedAverage(AggregationFunction):
-    """Weighted average aggregation."""
+    """Weighted average aggregation.
+
+    The weighted average is linear, so TensorDB can fold collaborator tensors
+    into a running sum as they arrive instead of aggregating them at the end
+    of the round. Subclasses that override `call` with a non-linear rule
+    fall back to the regular path unless they also override
+    `streaming_normalized`.
+    """
+
+    def __init__(self):
+        """Initialize WeightedAverage and enable streaming aggregation."""
+        super().__init__()
+        cls = type(self)
+        self._streaming = (
+            cls.call is WeightedAverage.call
+            or cls.streaming_normalized is not WeightedAverage.streaming_normalized
+        )
+
+    def streaming_normalized(self, tensor_name) -> bool:
+        """Whether the streamed sum for a tensor is a weighted average.
+
+        Args:
+            tensor_name: name of the tensor
+        Returns:
+            bool: True if tensors are weighted and the sum is divided by the
+                total weight, False if tensors are summed without weights.
+        """
+        return True
 
     def call(self, local_tensors, *_) -> np.ndarray:
         """Aggregate tensors.
@@ -23,7 +50,7 @@ class WeightedAverage(AggregationFunction):
         Args:
             local_tensors (list[openfl.utilities.LocalTensor]): List of local
                 tensors to aggregate.
-            db_iterator: iterator over history of all tensors. Columns:
+            db_iterator: iterator over history of the tensor. Columns:
                 - 'tensor_name': name of the tensor.
                     Examples for `torch.nn.Module`s: 'conv1.weight','fc2.bias'.
                 - 'round': 0-based number of round corresponding to this
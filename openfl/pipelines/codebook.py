@@ -0,0 +1,152 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""Codebook module.
+
+Helpers shared by the quantization transformers to map the levels of a
+quantized array to integer codes, pack the codes into bytes and back.
+"""
+
+import numpy as np
+
+
+def code_dtype(n_levels):
+    """Return the narrowest unsigned integer type for the codes of n levels.
+
+    Args:
+        n_levels (int): The number of levels.
+
+    Returns:
+        The Numpy integer type.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_levels <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+def bits_per_code(n_levels):
+    """Return the number of bits the codes of n levels are packed into.
+
+    Codes of up to 16 levels are packed several to a byte, others take a
+    whole number of bytes.
+
+    Args:
+        n_levels (int): The number of levels.
+
+    Returns:
+        The number of bits per code.
+    """
+    for bits in (1, 2, 4):
+        if n_levels <= 1 << bits:
+            return bits
+    return np.dtype(code_dtype(n_levels)).itemsize * 8
+
+
+def digitize(np_array, bins):
+    """Return the index of the bin each value falls in.
+
+    Args:
+        np_array: A Numpy array.
+        bins: The increasing Numpy array of the lower edges of the bins after
+            the first.
+
+    Returns:
+        The array of indices, in the narrowest integer type.
+    """
+    if len(bins) < 16:
+        # Counting the edges each value reaches takes a pass per edge, which
+        # beats a binary search per value for a handful of edges
+        int_array = np.zeros(np_array.shape, dtype=np.uint8)
+        for edge in bins:
+            np.add(int_array, np_array >= edge, out=int_array, casting="unsafe")
+        return int_array
+    return np.searchsorted(bins, np_array, side="right").astype(code_dtype(len(bins) + 1))
+
+
+def float_to_int(np_array, levels=None):
+    """Map the values of an array to the indices of its unique values.
+
+    Args:
+        np_array: A Numpy array.
+        levels (optional): The increasing Numpy array of the values the array
+            takes, if they are known. The array is then mapped to them
+            without being sorted. Defaults to None, i.e. the unique values of
+            the array.
+
+    Returns:
+        int_array: The codes of the values, in the narrowest integer type.
+        int_to_float_map: The dictionary mapping codes to values.
+    """
+    flatten_array = np_array.reshape(-1)
+    if levels is None:
+        levels, inverse = np.unique(flatten_array, return_inverse=True)
+        int_array = inverse.astype(code_dtype(levels.size))
+    else:
+        int_array = digitize(flatten_array, levels[1:])
+    int_to_float_map = dict(enumerate(levels.tolist()))
+    return int_array.reshape(np_array.shape), int_to_float_map
+
+
+def int_to_float(int_array, int_to_float_map):
+    """Map codes back to their values.
+
+    Args:
+        int_array: A Numpy array of codes.
+        int_to_float_map: The dictionary mapping codes to values.
+
+    Returns:
+        The float32 array of values.
+    """
+    lut = np.zeros(max(int_to_float_map, default=-1) + 1, dtype=np.float32)
+    for code, value in int_to_float_map.items():
+        lut[code] = value
+    return lut[np.asarray(int_array).astype(np.intp, copy=False)]
+
+
+def pack_codes(int_array, n_levels):
+    """Pack codes into bytes.
+
+    Args:
+        int_array: A Numpy array of codes.
+        n_levels (int): The number of levels.
+
+    Returns:
+        The flat uint8 array of the packed codes.
+    """
+    bits = bits_per_code(n_levels)
+    codes = int_array.reshape(-1).astype(code_dtype(n_levels), copy=False)
+    if bits >= 8:
+        return np.ascontiguousarray(codes).view(np.uint8)
+    codes_per_byte = 8 // bits
+    padded = np.zeros(-(-codes.size // codes_per_byte) * codes_per_byte, dtype=np.uint8)
+    padded[: codes.size] = codes
+    columns = padded.reshape(-1, codes_per_byte)
+    packed = columns[:, 0].copy()
+    for i in range(1, codes_per_byte):
+        packed |= columns[:, i] << np.uint8(i * bits)
+    return packed
+
+
+def unpack_codes(data, n_levels, count):
+    """Unpack codes packed by `pack_codes`.
+
+    Args:
+        data: The uint8 array of the packed codes.
+        n_levels (int): The number of levels.
+        count (int): The number of codes.
+
+    Returns:
+        The flat array of codes.
+    """
+    bits = bits_per_code(n_levels)
+    data = np.asarray(data, dtype=np.uint8)
+    if bits >= 8:
+        return data.view(code_dtype(n_levels))[:count]
+    codes_per_byte = 8 // bits
+    mask = np.uint8((1 << bits) - 1)
+    columns = np.empty((data.size, codes_per_byte), dtype=np.uint8)
+    for i in range(codes_per_byte):
+        np.bitwise_and(data >> np.uint8(i * bits), mask, out=columns[:, i])
+    return columns.reshape(-1)[:count]
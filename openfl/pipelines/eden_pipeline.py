@@ -36,15 +36,299 @@ compression_pipeline :
     device: <cpu|cuda:0|cuda:1|...>
     dim_threshold: 1000 #EDEN compresses layers that their dimension is above
         the dim_threshold, use 1000 as default
+    engine: <numpy|torch> #defaults to numpy on the cpu device, torch otherwise
 """
 
 import copy as co
+from importlib import util
 
 import numpy as np
-import torch
 
 from openfl.pipelines.pipeline import Float32NumpyArrayToBytes, TransformationPipeline, Transformer
 
+if util.find_spec("torch") is not None:
+    import torch
+
+HADAMARD_BLOCK = 32
+
+
+def half_normal_centroids():
+    """Return the half-normal Lloyd-Max centroids of each number of bits.
+
+    Returns:
+        dict: The increasing list of centroids by number of bits.
+    """
+    # half-normal lloyd-max centroids
+    centroids = {}
+    centroids[1] = [0.7978845608028654]
+    centroids[2] = [0.4527800398860679, 1.5104176087114887]
+    centroids[3] = [
+        0.24509416307340598,
+        0.7560052489539643,
+        1.3439092613750225,
+        2.151945669890335,
+    ]
+    centroids[4] = [
+        0.12839501671105813,
+        0.38804823445328507,
+        0.6567589957631145,
+        0.9423402689122875,
+        1.2562309480263467,
+        1.6180460517130526,
+        2.069016730231837,
+        2.732588804065177,
+    ]
+    centroids[5] = [
+        0.06588962234909321,
+        0.1980516892038791,
+        0.3313780514298761,
+        0.4666991751197207,
+        0.6049331689395434,
+        0.7471351317890572,
+        0.89456439585444,
+        1.0487823813655852,
+        1.2118032120324,
+        1.3863389353626248,
+        1.576226389073775,
+        1.7872312118858462,
+        2.0287259913633036,
+        2.3177364021261493,
+        2.69111557955431,
+        3.260726295605043,
+    ]
+    centroids[6] = [
+        0.0334094558802581,
+        0.1002781217139195,
+        0.16729660990171974,
+        0.23456656976873475,
+        0.3021922894403614,
+        0.37028193328115516,
+        0.4389488009177737,
+        0.5083127587538033,
+        0.5785018460645791,
+        0.6496542452315348,
+        0.7219204720694183,
+        0.7954660529025513,
+        0.870474868055092,
+        0.9471530930156288,
+        1.0257343133937524,
+        1.1064859596918581,
+        1.1897175711327463,
+        1.2757916223519965,
+        1.3651378971823598,
+        1.458272959944728,
+        1.5558274659528346,
+        1.6585847114298427,
+        1.7675371481292605,
+        1.8839718992293555,
+        2.009604894545278,
+        2.146803022259123,
+        2.2989727412973995,
+        2.471294740528467,
+        2.6722617014102585,
+        2.91739146530985,
+        3.2404166403241677,
+        3.7440690236964755,
+    ]
+    centroids[7] = [
+        0.016828143177728235,
+        0.05049075396896167,
+        0.08417241989671888,
+        0.11788596825032507,
+        0.1516442630131618,
+        0.18546025708680833,
+        0.21934708340331643,
+        0.25331807190834565,
+        0.2873868062260947,
+        0.32156710392315796,
+        0.355873075050329,
+        0.39031926330596733,
+        0.4249205523979007,
+        0.4596922300454219,
+        0.49465018161031576,
+        0.5298108436256188,
+        0.565191195643323,
+        0.600808970989236,
+        0.6366826613981411,
+        0.6728315674936343,
+        0.7092759460939766,
+        0.746037126679468,
+        0.7831375375631398,
+        0.8206007832455021,
+        0.858451939611374,
+        0.896717615963322,
+        0.9354260757626341,
+        0.9746074842160436,
+        1.0142940678300427,
+        1.054520418037026,
+        1.0953237719213182,
+        1.1367442623434032,
+        1.1788252655205043,
+        1.2216138763870124,
+        1.26516137869917,
+        1.309523700469555,
+        1.3547621051156036,
+        1.4009441065262136,
+        1.448144252238147,
+        1.4964451375010575,
+        1.5459387008934842,
+        1.596727786313424,
+        1.6489283062238074,
+        1.7026711624156725,
+        1.7581051606756466,
+        1.8154009933798645,
+        1.8747553268072956,
+        1.9363967204122827,
+        2.0005932433837565,
+        2.0676621538384503,
+        2.1379832427349696,
+        2.212016460501213,
+        2.2903268704925304,
+        2.3736203164211713,
+        2.4627959084523208,
+        2.5590234991374485,
+        2.663867022558051,
+        2.7794919110540777,
+        2.909021527386642,
+        3.0572161028423737,
+        3.231896182843021,
+        3.4473810105937095,
+        3.7348571053691555,
+        4.1895219330235225,
+    ]
+    centroids[8] = [
+        0.008445974137017219,
+        0.025338726226901278,
+        0.042233889994651476,
+        0.05913307399220878,
+        0.07603788791797023,
+        0.09294994306815242,
+        0.10987089037069565,
+        0.12680234584461386,
+        0.1437459285205906,
+        0.16070326074968388,
+        0.1776760066764216,
+        0.19466583496246115,
+        0.21167441946986007,
+        0.22870343946322488,
+        0.24575458029044564,
+        0.2628295721769575,
+        0.2799301528634766,
+        0.29705806782573063,
+        0.3142150709211129,
+        0.3314029639954903,
+        0.34862355883476864,
+        0.3658786774238477,
+        0.3831701926964899,
+        0.40049998943716425,
+        0.4178699650069057,
+        0.4352820704086704,
+        0.45273827097956804,
+        0.4702405882876,
+        0.48779106011037887,
+        0.505391740756901,
+        0.5230447441905988,
+        0.5407522460590347,
+        0.558516486141511,
+        0.5763396823538222,
+        0.5942241184949506,
+        0.6121721459546814,
+        0.6301861414640443,
+        0.6482685527755422,
+        0.6664219019236218,
+        0.684648787627676,
+        0.7029517931200633,
+        0.7213336286470308,
+        0.7397970881081071,
+        0.7583450032075904,
+        0.7769802937007926,
+        0.7957059197645721,
+        0.8145249861674053,
+        0.8334407494351099,
+        0.8524564651728141,
+        0.8715754936480047,
+        0.8908013031010308,
+        0.9101374749919184,
+        0.9295877653215154,
+        0.9491559977740125,
+        0.9688461234581733,
+        0.9886622867721733,
+        1.0086087121824747,
+        1.028689768268861,
+        1.0489101021225093,
+        1.0692743940997251,
+        1.0897875553561465,
+        1.1104547388972044,
+        1.1312812154370708,
+        1.1522725891384287,
+        1.173434599389649,
+        1.1947731980672593,
+        1.2162947131430126,
+        1.238005717146854,
+        1.2599130381874064,
+        1.2820237696510286,
+        1.304345369166531,
+        1.3268857708606756,
+        1.349653145284911,
+        1.3726560932224416,
+        1.3959037693197867,
+        1.419405726021264,
+        1.4431719292973744,
+        1.4672129964566984,
+        1.4915401336751468,
+        1.5161650628244996,
+        1.541100284490976,
+        1.5663591473033147,
+        1.5919556551358922,
+        1.6179046397057497,
+        1.6442219553485078,
+        1.6709244249695359,
+        1.6980300628044107,
+        1.7255580190748743,
+        1.7535288357430767,
+        1.7819645728459763,
+        1.81088895442524,
+        1.8403273195729115,
+        1.870306964218662,
+        1.9008577747790962,
+        1.9320118435829472,
+        1.9638039107009146,
+        1.9962716117712092,
+        2.0294560760505993,
+        2.0634026367482017,
+        2.0981611002741527,
+        2.133785932225919,
+        2.170336784741086,
+        2.2078803102947337,
+        2.2464908293749546,
+        2.286250990303635,
+        2.327254033532845,
+        2.369604977942217,
+        2.4134218838650208,
+        2.458840003415269,
+        2.506014300608167,
+        2.5551242195294983,
+        2.6063787537827645,
+        2.660023038604595,
+        2.716347847697055,
+        2.7757011083910723,
+        2.838504606698991,
+        2.9052776685316117,
+        2.976670770545963,
+        3.0535115393558603,
+        3.136880130166507,
+        3.2282236667414654,
+        3.3295406612081644,
+        3.443713971315384,
+        3.5751595986789093,
+        3.7311414987004117,
+        3.9249650523739246,
+        4.185630113705256,
+        4.601871059539151,
+    ]
+
+    return centroids
+
 
 class Eden:
     """Eden class for quantization.
@@ -93,274 +377,7 @@ class Eden:
                     bits to the corresponding boundaries.
             """
 
-            # half-normal lloyd-max centroids
-            centroids = {}
-            centroids[1] = [0.7978845608028654]
-            centroids[2] = [0.4527800398860679, 1.5104176087114887]
-            centroids[3] = [
-                0.24509416307340598,
-                0.7560052489539643,
-                1.3439092613750225,
-                2.151945669890335,
-            ]
-            centroids[4] = [
-                0.12839501671105813,
-                0.38804823445328507,
-                0.6567589957631145,
-                0.9423402689122875,
-                1.2562309480263467,
-                1.6180460517130526,
-                2.069016730231837,
-                2.732588804065177,
-            ]
-            centroids[5] = [
-                0.06588962234909321,
-                0.1980516892038791,
-                0.3313780514298761,
-                0.4666991751197207,
-                0.6049331689395434,
-                0.7471351317890572,
-                0.89456439585444,
-                1.0487823813655852,
-                1.2118032120324,
-                1.3863389353626248,
-                1.576226389073775,
-                1.7872312118858462,
-                2.0287259913633036,
-                2.3177364021261493,
-                2.69111557955431,
-                3.260726295605043,
-            ]
-            centroids[6] = [
-                0.0334094558802581,
-                0.1002781217139195,
-                0.16729660990171974,
-                0.23456656976873475,
-                0.3021922894403614,
-                0.37028193328115516,
-                0.4389488009177737,
-                0.5083127587538033,
-                0.5785018460645791,
-                0.6496542452315348,
-                0.7219204720694183,
-                0.7954660529025513,
-                0.870474868055092,
-                0.9471530930156288,
-                1.0257343133937524,
-                1.1064859596918581,
-                1.1897175711327463,
-                1.2757916223519965,
-                1.3651378971823598,
-                1.458272959944728,
-                1.5558274659528346,
-                1.6585847114298427,
-                1.7675371481292605,
-                1.8839718992293555,
-                2.009604894545278,
-                2.146803022259123,
-                2.2989727412973995,
-                2.471294740528467,
-                2.6722617014102585,
-                2.91739146530985,
-                3.2404166403241677,
-                3.7440690236964755,
-            ]
-            centroids[7] = [
-                0.016828143177728235,
-                0.05049075396896167,
-                0.08417241989671888,
-                0.11788596825032507,
-                0.1516442630131618,
-                0.18546025708680833,
-                0.21934708340331643,
-                0.25331807190834565,
-                0.2873868062260947,
-                0.32156710392315796,
-                0.355873075050329,
-                0.39031926330596733,
-                0.4249205523979007,
-                0.4596922300454219,
-                0.49465018161031576,
-                0.5298108436256188,
-                0.565191195643323,
-                0.600808970989236,
-                0.6366826613981411,
-                0.6728315674936343,
-                0.7092759460939766,
-                0.746037126679468,
-                0.7831375375631398,
-                0.8206007832455021,
-                0.858451939611374,
-                0.896717615963322,
-                0.9354260757626341,
-                0.9746074842160436,
-                1.0142940678300427,
-                1.054520418037026,
-                1.0953237719213182,
-                1.1367442623434032,
-                1.1788252655205043,
-                1.2216138763870124,
-                1.26516137869917,
-                1.309523700469555,
-                1.3547621051156036,
-                1.4009441065262136,
-                1.448144252238147,
-                1.4964451375010575,
-                1.5459387008934842,
-                1.596727786313424,
-                1.6489283062238074,
-                1.7026711624156725,
-                1.7581051606756466,
-                1.8154009933798645,
-                1.8747553268072956,
-                1.9363967204122827,
-                2.0005932433837565,
-                2.0676621538384503,
-                2.1379832427349696,
-                2.212016460501213,
-                2.2903268704925304,
-                2.3736203164211713,
-                2.4627959084523208,
-                2.5590234991374485,
-                2.663867022558051,
-                2.7794919110540777,
-                2.909021527386642,
-                3.0572161028423737,
-                3.231896182843021,
-                3.4473810105937095,
-                3.7348571053691555,
-                4.1895219330235225,
-            ]
-            centroids[8] = [
-                0.008445974137017219,
-                0.025338726226901278,
-                0.042233889994651476,
-                0.05913307399220878,
-                0.07603788791797023,
-                0.09294994306815242,
-                0.10987089037069565,
-                0.12680234584461386,
-                0.1437459285205906,
-                0.16070326074968388,
-                0.1776760066764216,
-                0.19466583496246115,
-                0.21167441946986007,
-                0.22870343946322488,
-                0.24575458029044564,
-                0.2628295721769575,
-                0.2799301528634766,
-                0.29705806782573063,
-                0.3142150709211129,
-                0.3314029639954903,
-                0.34862355883476864,
-                0.3658786774238477,
-                0.3831701926964899,
-                0.40049998943716425,
-                0.4178699650069057,
-                0.4352820704086704,
-                0.45273827097956804,
-                0.4702405882876,
-                0.48779106011037887,
-                0.505391740756901,
-                0.5230447441905988,
-                0.5407522460590347,
-                0.558516486141511,
-                0.5763396823538222,
-                0.5942241184949506,
-                0.6121721459546814,
-                0.6301861414640443,
-                0.6482685527755422,
-                0.6664219019236218,
-                0.684648787627676,
-                0.7029517931200633,
-                0.7213336286470308,
-                0.7397970881081071,
-                0.7583450032075904,
-                0.7769802937007926,
-                0.7957059197645721,
-                0.8145249861674053,
-                0.8334407494351099,
-                0.8524564651728141,
-                0.8715754936480047,
-                0.8908013031010308,
-                0.9101374749919184,
-                0.9295877653215154,
-                0.9491559977740125,
-                0.9688461234581733,
-                0.9886622867721733,
-                1.0086087121824747,
-                1.028689768268861,
-                1.0489101021225093,
-                1.0692743940997251,
-                1.0897875553561465,
-                1.1104547388972044,
-                1.1312812154370708,
-                1.1522725891384287,
-                1.173434599389649,
-                1.1947731980672593,
-                1.2162947131430126,
-                1.238005717146854,
-                1.2599130381874064,
-                1.2820237696510286,
-                1.304345369166531,
-                1.3268857708606756,
-                1.349653145284911,
-                1.3726560932224416,
-                1.3959037693197867,
-                1.419405726021264,
-                1.4431719292973744,
-                1.4672129964566984,
-                1.4915401336751468,
-                1.5161650628244996,
-                1.541100284490976,
-                1.5663591473033147,
-                1.5919556551358922,
-                1.6179046397057497,
-                1.6442219553485078,
-                1.6709244249695359,
-                1.6980300628044107,
-                1.7255580190748743,
-                1.7535288357430767,
-                1.7819645728459763,
-                1.81088895442524,
-                1.8403273195729115,
-                1.870306964218662,
-                1.9008577747790962,
-                1.9320118435829472,
-                1.9638039107009146,
-                1.9962716117712092,
-                2.0294560760505993,
-                2.0634026367482017,
-                2.0981611002741527,
-                2.133785932225919,
-                2.170336784741086,
-                2.2078803102947337,
-                2.2464908293749546,
-                2.286250990303635,
-                2.327254033532845,
-                2.369604977942217,
-                2.4134218838650208,
-                2.458840003415269,
-                2.506014300608167,
-                2.5551242195294983,
-                2.6063787537827645,
-                2.660023038604595,
-                2.716347847697055,
-                2.7757011083910723,
-                2.838504606698991,
-                2.9052776685316117,
-                2.976670770545963,
-                3.0535115393558603,
-                3.136880130166507,
-                3.2282236667414654,
-                3.3295406612081644,
-                3.443713971315384,
-                3.5751595986789093,
-                3.7311414987004117,
-                3.9249650523739246,
-                4.185630113705256,
-                4.601871059539151,
-            ]
+            centroids = half_normal_centroids()
 
             # normal centroids
             for i in centroids:
@@ -720,6 +737,289 @@ class Eden:
         return int_vecs.reshape(1, -1)
 
 
+class NumpyEden:
+    """Eden class for quantization with NumPy.
+
+    This class quantizes tensors like `Eden` and produces the same wire
+    format, without converting them to torch tensors. The Hadamard transform
+    works in place on strided views of the vector and the bits are packed
+    with np.packbits.
+
+    Attributes:
+        centroids (dict): A dictionary mapping the number of bits to the
+            corresponding centroids.
+        boundaries (dict): A dictionary mapping the number of bits to the
+            corresponding boundaries.
+        nbits (int): The number of bits per coordinate for quantization.
+        num_hadamard (int): The number of Hadamard transforms to employ.
+        max_padding_overhead (float): The maximum overhead that is allowed for
+            padding the vector.
+    """
+
+    def __init__(self, nbits=8):
+        """Initialize NumpyEden.
+
+        Args:
+            nbits (int, optional): The number of bits per coordinate for
+                quantization. Defaults to 8.
+        """
+        self.centroids = {}
+        self.boundaries = {}
+        for i, half_centroids in half_normal_centroids().items():
+            centroids = np.array([-c for c in half_centroids[::-1]] + half_centroids)
+            self.centroids[i] = centroids.astype(np.float32)
+            self.boundaries[i] = (self.centroids[i][:-1] + self.centroids[i][1:]) / 2
+
+        if nbits not in [1, 2, 3, 4, 5, 6, 7, 8]:
+            raise Exception("nbits value is not supported")
+        self.nbits = int(nbits)
+        self.num_hadamard = 2
+        self.max_padding_overhead = 0.1
+
+    @staticmethod
+    def rand_diag(size, seed):
+        """Generate the random signs of `Eden.rand_diag`.
+
+        Args:
+            size (int): The number of signs.
+            seed (int): The seed for the random number generator.
+
+        Returns:
+            The float32 array of signs.
+        """
+        bools_in_int32 = 8
+        shift = 32 // bools_in_int32
+        size_scaled = size // bools_in_int32 + (size % bools_in_int32 != 0)
+        mask32 = np.uint64((1 << 32) - 1)
+
+        # hash seed and then limit its size to prevent overflow
+        seed = (seed * 1664525 + 1013904223) & ((1 << 32) - 1)
+        seed = np.uint64((seed * 8121 + 28411) & ((1 << 32) - 1))
+
+        # Only the low 32 bits are kept, which wrap-around does not change
+        r = np.arange(size_scaled, dtype=np.uint64) + seed
+        r = (np.uint64(1103515245) * r + np.uint64(12345) + seed) & mask32
+        r = (np.uint64(1140671485) * r + np.uint64(12820163) + seed) & mask32
+        r += np.uint64(0x9E3779B9)
+        r = (r ^ (r >> np.uint64(16))) * np.uint64(0x85EBCA6B) & mask32
+        r = (r ^ (r >> np.uint64(13))) * np.uint64(0xC2B2AE35) & mask32
+        r = (r ^ (r >> np.uint64(16))) & mask32
+
+        # Each word holds 8 signs, laid out one block of nibbles after another
+        shifts = np.arange(0, 32, shift, dtype=np.uint32)[:, None]
+        nibbles = (r.astype(np.uint32) >> shifts) & np.uint32((1 << shift) - 1)
+        signs = (nibbles.reshape(-1)[:size] >= 1 << (shift - 1)).astype(np.float32)
+        signs *= 2
+        signs -= 1
+        return signs
+
+    @staticmethod
+    def hadamard(vecs):
+        """Apply the Hadamard transform in place to the rows of an array.
+
+        Args:
+            vecs: The contiguous float32 array of vectors, of a power of 2
+                length, to be transformed.
+
+        Returns:
+            The transformed vectors.
+        """
+        n, d = vecs.shape
+        if d & (d - 1) != 0:
+            raise Exception("input numel must be a power of 2")
+
+        # The butterflies of the first stages work on too short runs to be
+        # fast, so blocks are multiplied by their Hadamard matrix instead
+        block = min(d, HADAMARD_BLOCK)
+        hadamard_matrix = np.ones((1, 1), dtype=np.float32)
+        while hadamard_matrix.shape[0] < block:
+            hadamard_matrix = np.block(
+                [[hadamard_matrix, hadamard_matrix], [hadamard_matrix, -hadamard_matrix]]
+            )
+        blocks = vecs.reshape(-1, block)
+        np.matmul(blocks, hadamard_matrix, out=blocks)
+
+        h = 2 * block
+        while h <= d:
+            hf = h // 2
+            view = vecs.reshape(n, d // h, 2, hf)
+            x = view[:, :, 0]
+            y = view[:, :, 1]
+            x += y
+            y *= -2
+            y += x
+            h *= 2
+        vecs /= np.float32(np.sqrt(d))
+
+        return vecs
+
+    def quantize(self, vec):
+        """Quantize a vector.
+
+        Args:
+            vec: The vector to be quantized.
+
+        Returns:
+            bins: The quantized values of the vector.
+            scale: The scale factor for the quantization.
+        """
+        vec_norm = np.linalg.norm(vec)
+
+        if vec_norm > 0:
+            normalized = vec * np.float32(vec.size**0.5) / vec_norm
+            bins = np.searchsorted(self.boundaries[self.nbits], normalized, side="left")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scale = vec_norm**2 / np.dot(self.centroids[self.nbits][bins], vec)
+
+            if not np.isnan(scale):
+                return bins, float(scale)
+
+        return np.zeros(vec.size, dtype=np.intp), 0.0
+
+    def compress_slice(self, vec, seed):
+        """Compress a slice of a vector.
+
+        Args:
+            vec: The slice of the vector to be compressed.
+            seed (int): The seed for the random number generator.
+
+        Returns:
+            bins: The compressed values of the slice.
+            scale: The scale factor for the compression.
+            dim: The padded dimension of the slice.
+        """
+        dim = vec.size
+        padded_dim = dim
+        if not dim & (dim - 1) == 0 or dim < 8:
+            padded_dim = max(int(2 ** (np.ceil(np.log2(dim)))), 8)
+        padded_vec = np.zeros((1, padded_dim), dtype=np.float32)
+        padded_vec[0, :dim] = vec
+
+        for i in range(self.num_hadamard):
+            padded_vec *= self.rand_diag(padded_dim, seed + i)
+            self.hadamard(padded_vec)
+
+        bins, scale = self.quantize(padded_vec[0])
+
+        return bins, scale, padded_dim
+
+    def compress(self, vec, seed):
+        """Compress a vector.
+
+        Args:
+            vec: The vector to be compressed.
+            seed (int): The seed for the random number generator.
+
+        Returns:
+            int_array: The compressed values of the vector.
+            scale_list: The list of scale factors for the compression.
+            dim_list: The list of dimensions for the compression.
+            total_dim: The total dimension of the vector.
+        """
+
+        def low_po2(n):
+            if not n:
+                return 0
+            return 2 ** int(np.log2(n))
+
+        def high_po2(n):
+            if not n:
+                return 0
+            return 2 ** (int(np.ceil(np.log2(n))))
+
+        vec = np.asarray(vec, dtype=np.float32).reshape(-1)
+
+        res_bins = []
+        res_scale = []
+        res_dim = []
+
+        dim = remaining = vec.size
+        curr_index = 0
+
+        while (high_po2(remaining) - remaining) / dim > self.max_padding_overhead:
+            low = low_po2(remaining)
+            slice_bins, slice_scale, slice_dim = self.compress_slice(
+                vec[curr_index : curr_index + low], seed
+            )
+            res_bins.append(slice_bins)
+            res_scale.append(slice_scale)
+            res_dim.append(slice_dim)
+            curr_index += low
+            remaining -= low
+
+        slice_bins, slice_scale, slice_dim = self.compress_slice(vec[curr_index:], seed)
+        res_bins.append(slice_bins)
+        res_scale.append(slice_scale)
+        res_dim.append(slice_dim)
+
+        return self.to_bits(np.concatenate(res_bins)), res_scale, res_dim, vec.size
+
+    def decompress(self, bins, metadata):
+        """Decompress a vector.
+
+        Slices of the same dimension are transformed together.
+
+        Args:
+            bins: The compressed values of the vector.
+            metadata: The metadata for the decompression.
+
+        Returns:
+            The decompressed vector.
+        """
+        values = self.centroids[self.nbits][self.from_bits(bins)]
+
+        seed = int(metadata[0])
+        total_dim = int(metadata[1])
+        scales = []
+        dims = []
+        for k in range(2, max(metadata.keys()) + 1, 2):
+            scales.append(metadata[k])
+            dims.append(int(metadata[k + 1]))
+        offsets = np.concatenate(([0], np.cumsum(dims)))
+
+        vec = np.empty(offsets[-1], dtype=np.float32)
+        for dim in set(dims):
+            slices = [i for i, slice_dim in enumerate(dims) if slice_dim == dim]
+            batch = np.stack([values[offsets[i] : offsets[i + 1]] for i in slices])
+            for i in range(self.num_hadamard):
+                self.hadamard(batch)
+                batch *= self.rand_diag(dim, int(seed + (self.num_hadamard - 1) - i))
+            for row, i in zip(batch, slices):
+                vec[offsets[i] : offsets[i + 1]] = np.float32(scales[i]) * row
+
+        return vec[:total_dim]
+
+    def to_bits(self, int_bool_vec):
+        """Pack the quantization values into bit planes of bytes.
+
+        Args:
+            int_bool_vec: The vector of integers to be converted.
+
+        Returns:
+            The uint8 bit vector.
+        """
+        shifts = np.arange(self.nbits, dtype=np.uint8)[:, None]
+        planes = (np.asarray(int_bool_vec).astype(np.uint8)[None, :] >> shifts) & np.uint8(1)
+        return np.packbits(planes, axis=1, bitorder="little").reshape(-1)
+
+    def from_bits(self, bit_vec):
+        """Unpack bit planes of bytes to quantization values.
+
+        Args:
+            bit_vec: The uint8 bit vector to be converted.
+
+        Returns:
+            The vector of integers.
+        """
+        planes = np.unpackbits(
+            np.asarray(bit_vec, dtype=np.uint8).reshape(self.nbits, -1), axis=1, bitorder="little"
+        )
+        int_vec = np.zeros(planes.shape[1], dtype=np.uint8)
+        for i in range(self.nbits):
+            int_vec |= planes[i] << np.uint8(i)
+        return int_vec
+
+
 class EdenTransformer(Transformer):
     """Eden transformer class for quantizing input data.
 
@@ -730,12 +1030,12 @@ class EdenTransformer(Transformer):
         dim_threshold (int): The threshold for the dimension of the data. Data
             with dimensions less than this threshold are not compressed.
         device (str): The device to be used for quantization ('cpu' or 'cuda').
-        eden (Eden): The Eden object for quantization.
+        eden (Eden or NumpyEden): The Eden object for quantization.
         no_comp (Float32NumpyArrayToBytes): The transformer for data that are
             not compressed.
     """
 
-    def __init__(self, n_bits=8, dim_threshold=100, device="cpu"):
+    def __init__(self, n_bits=8, dim_threshold=100, device="cpu", engine=None):
         """Initialize EdenTransformer.
 
         Args:
@@ -746,13 +1046,22 @@ class EdenTransformer(Transformer):
                 not compressed. Defaults to 100.
             device (str, optional): The device to be used for quantization
                 ('cpu' or 'cuda'). Defaults to 'cpu'.
+            engine (str, optional): 'numpy' or 'torch'. Defaults to None,
+                i.e. 'numpy' on the CPU and 'torch' on other devices.
         """
         self.lossy = True
-        self.eden = Eden(nbits=n_bits, device=device)
+        if engine is None:
+            engine = "numpy" if device == "cpu" else "torch"
+        if engine == "numpy":
+            self.eden = NumpyEden(nbits=n_bits)
+        elif engine == "torch":
+            self.eden = Eden(nbits=n_bits, device=device)
+        else:
+            raise ValueError(f"Unknown Eden engine: {engine}")
 
         print(
             f"*** Using EdenTransformer with params: {n_bits} bits,"
-            f"dim_threshold: {dim_threshold}, {device} device ***"
+            f"dim_threshold: {dim_threshold}, {device} device, {engine} engine ***"
         )
 
         self.dim_threshold = dim_threshold
@@ -768,7 +1077,7 @@ class EdenTransformer(Transformer):
             The quantized data and the metadata for the quantization.
         """
         # TODO: can be simplified if have access to a unique feature of the participant (e.g., ID)
-        seed = (hash(sum(data.flatten()) * 13 + 7) + np.random.randint(1, 2**16)) % (2**16)
+        seed = (hash(float(np.sum(data)) * 13 + 7) + np.random.randint(1, 2**16)) % (2**16)
         seed = int(float(seed))
         metadata = {"int_list": list(data.shape)}
 
@@ -829,9 +1138,10 @@ class EdenPipeline(TransformationPipeline):
         dim_threshold (int): The threshold for the dimension of the data. Data
             with dimensions less than this threshold are not compressed.
         device (str): The device to be used for quantization ('cpu' or 'cuda').
+        engine (str): 'numpy' or 'torch'.
     """
 
-    def __init__(self, n_bits=8, dim_threshold=100, device="cpu", **kwargs):
+    def __init__(self, n_bits=8, dim_threshold=100, device="cpu", engine=None, **kwargs):
         """Initialize a pipeline of transformers.
 
         Args:
@@ -841,11 +1151,13 @@ class EdenPipeline(TransformationPipeline):
                 are not compressed.
             device: Device for executing the compression and decompressionc
                 (e.g., 'cpu', 'cuda:0', 'cuda:1').
+            engine (str): 'numpy' or 'torch'. Defaults to 'numpy' on the CPU
+                and 'torch' on other devices.
 
         Return:
             Transformer class object.
         """
 
         # instantiate each transformer
-        transformers = [EdenTransformer(n_bits, dim_threshold, device)]
+        transformers = [EdenTransformer(n_bits, dim_threshold, device, engine)]
         super().__init__(transformers=transformers, **kwargs)
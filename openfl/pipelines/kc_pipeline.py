@@ -4,12 +4,13 @@
 
 """KCPipeline module."""
 
-import copy as co
 import gzip as gz
+import warnings
 
 import numpy as np
-from sklearn import cluster
 
+from openfl.pipelines import codebook, kmeans
+from openfl.pipelines.lossless import ChunkedCompressionTransformer
 from openfl.pipelines.pipeline import TransformationPipeline, Transformer
 
 
@@ -20,18 +21,26 @@ class KmeansTransformer(Transformer):
 
     Attributes:
         n_cluster (int): The number of clusters for the K-means.
+        sample_size (int): The number of values the clusters are fitted on.
+        max_iter (int): The maximum number of k-means iterations.
         lossy (bool): Indicates if the transformer is lossy.
     """
 
-    def __init__(self, n_cluster=6):
+    def __init__(self, n_cluster=6, sample_size=kmeans.DEFAULT_SAMPLE_SIZE, max_iter=100):
         """Initialize KmeansTransformer.
 
         Args:
             n_cluster (int, optional): The number of clusters for the K-means.
                 Defaults to 6.
+            sample_size (int, optional): The number of values the clusters
+                are fitted on. Defaults to 1000000.
+            max_iter (int, optional): The maximum number of k-means
+                iterations. Defaults to 100.
         """
         self.lossy = True
         self.n_cluster = n_cluster
+        self.sample_size = sample_size
+        self.max_iter = max_iter
 
     def forward(self, data, **kwargs):
         """Quantize data into n_cluster levels of values.
@@ -41,88 +50,62 @@ class KmeansTransformer(Transformer):
             **kwargs: Variable arguments to pass.
 
         Returns:
-            int_array: The quantized data.
+            packed_codes: The codes of the quantized data, packed into bytes.
             metadata: The metadata for the quantization.
         """
         metadata = {"int_list": list(data.shape)}
         # clustering
-        k_means = cluster.KMeans(n_clusters=self.n_cluster, n_init=self.n_cluster)
-        data = data.reshape((-1, 1))
-        if data.shape[0] >= self.n_cluster:
-            k_means = cluster.KMeans(n_clusters=self.n_cluster, n_init=self.n_cluster)
-            k_means.fit(data)
-            quantized_values = k_means.cluster_centers_.squeeze()
-            indices = k_means.labels_
-            quant_array = np.choose(indices, quantized_values)
+        data = data.reshape(-1)
+        if data.size >= self.n_cluster:
+            centers, int_array = kmeans.kmeans_1d(
+                data, self.n_cluster, self.sample_size, self.max_iter
+            )
+            int2float_map = dict(enumerate(centers.tolist()))
         else:
-            quant_array = data
+            int_array, int2float_map = codebook.float_to_int(data)
 
-        int_array, int2float_map = self._float_to_int(quant_array)
         metadata["int_to_float"] = int2float_map
+        packed_codes = codebook.pack_codes(int_array, len(int2float_map))
 
-        return int_array, metadata
+        return packed_codes, metadata
 
     def backward(self, data, metadata, **kwargs):
         """Recover data array back to the original numerical type and the
         shape.
 
         Args:
-            data: The flattened numpy array.
+            data: The packed codes, or the flattened numpy array of codes.
             metadata: The dictionary containing information for recovering to
                 original data array.
 
         Returns:
             data: The numpy array with original numerical type and shape.
         """
-        # convert back to float
-        # TODO
-        data = co.deepcopy(data)
         int2float_map = metadata["int_to_float"]
-        for key in int2float_map:
-            indices = data == key
-            data[indices] = int2float_map[key]
         data_shape = list(metadata["int_list"])
+        if data.dtype == np.uint8:
+            data = codebook.unpack_codes(data, len(int2float_map), int(np.prod(data_shape)))
+        data = codebook.int_to_float(data, int2float_map)
         data = data.reshape(data_shape)
         return data
 
-    @staticmethod
-    def _float_to_int(np_array):
-        """Create look-up table for conversion between floating and integer
-        types.
-
-        Args:
-            np_array: A Numpy array.
-
-        Returns:
-            int_array: The input Numpy float array converted to an integer
-                array.
-            int_to_float_map: The dictionary mapping integers to floats.
-        """
-        flatten_array = np_array.reshape(-1)
-        unique_value_array = np.unique(flatten_array)
-        int_array = np.zeros(flatten_array.shape, dtype=np.int32)
-        int_to_float_map = {}
-        float_to_int_map = {}
-        # create table
-        for idx, u_value in enumerate(unique_value_array):
-            int_to_float_map.update({idx: u_value})
-            float_to_int_map.update({u_value: idx})
-            # assign to the integer array
-            indices = np.where(flatten_array == u_value)
-            int_array[indices] = idx
-        int_array = int_array.reshape(np_array.shape)
-        return int_array, int_to_float_map
-
 
 class GZIPTransformer(Transformer):
     """GZIP transformer class for losslessly compressing data.
 
+    Deprecated, use ChunkedCompressionTransformer instead.
+
     Attributes:
         lossy (bool): Indicates if the transformer is lossy.
     """
 
     def __init__(self):
         """Initialize GZIPTransformer."""
+        warnings.warn(
+            "GZIPTransformer is deprecated, use ChunkedCompressionTransformer instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         self.lossy = False
 
     def forward(self, data, **kwargs):
@@ -133,11 +116,16 @@ class GZIPTransformer(Transformer):
 
         Returns:
             compressed_bytes_: The GZIP compressed data object.
-            metadata: An empty dictionary.
+            metadata: A dictionary flagging uint8 data.
         """
-        bytes_ = data.astype(np.float32).tobytes()
+        if data.dtype == np.uint8:
+            # Packed codes are compressed as they are
+            bytes_ = data.tobytes()
+            metadata = {"bool_list": [True]}
+        else:
+            bytes_ = data.astype(np.float32).tobytes()
+            metadata = {}
         compressed_bytes_ = gz.compress(bytes_)
-        metadata = {}
         return compressed_bytes_, metadata
 
     def backward(self, data, metadata, **kwargs):
@@ -145,14 +133,15 @@ class GZIPTransformer(Transformer):
 
         Args:
             data: Compressed GZIP data
-            metadata: An empty dictionary.
+            metadata: A dictionary flagging uint8 data.
             **kwargs: Additional parameters to pass to the function
 
         Returns:
             data: The decompressed data as a numpy array.
         """
         decompressed_bytes_ = gz.decompress(data)
-        data = np.frombuffer(decompressed_bytes_, dtype=np.float32)
+        dtype = np.uint8 if metadata.get("bool_list") else np.float32
+        data = np.frombuffer(decompressed_bytes_, dtype=dtype)
         return data
 
 
@@ -162,9 +151,22 @@ class KCPipeline(TransformationPipeline):
     Attributes:
         p (float): The amount of sparsity for compression.
         n_cluster (int): The number of K-mean clusters.
+        sample_size (int): The number of values the clusters are fitted on.
+        max_iter (int): The maximum number of k-means iterations.
+        codec (str): The lossless codec.
+        n_threads (int): The number of threads compressing the data.
     """
 
-    def __init__(self, p_sparsity=0.01, n_clusters=6, **kwargs):
+    def __init__(
+        self,
+        p_sparsity=0.01,
+        n_clusters=6,
+        sample_size=kmeans.DEFAULT_SAMPLE_SIZE,
+        max_iter=100,
+        codec="zlib",
+        n_threads=None,
+        **kwargs,
+    ):
         """Initialize a pipeline of transformers.
 
         Args:
@@ -172,10 +174,25 @@ class KCPipeline(TransformationPipeline):
                 compression. Defaults to 0.01.
             n_clusters (int, optional): The number of K-mean clusters.
                 Defaults to 6.
+            sample_size (int, optional): The number of values the clusters
+                are fitted on. Defaults to 1000000.
+            max_iter (int, optional): The maximum number of k-means
+                iterations. Defaults to 100.
+            codec (str, optional): The lossless codec, one of 'zlib', 'zstd'
+                or 'lz4'. Defaults to 'zlib'.
+            n_threads (int, optional): The number of threads compressing the
+                data. Defaults to None, i.e. the number of CPUs.
             **kwargs: Additional keyword arguments.
         """
         # instantiate each transformer
         self.p = p_sparsity
         self.n_cluster = n_clusters
-        transformers = [KmeansTransformer(self.n_cluster), GZIPTransformer()]
+        self.sample_size = sample_size
+        self.max_iter = max_iter
+        self.codec = codec
+        self.n_threads = n_threads
+        transformers = [
+            KmeansTransformer(self.n_cluster, self.sample_size, self.max_iter),
+            ChunkedCompressionTransformer(self.codec, n_threads=self.n_threads),
+        ]
         super().__init__(transformers=transformers, **kwargs)
@@ -0,0 +1,62 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""One-dimensional k-means module.
+
+The values of a tensor are clustered on a sorted sample of them, on which
+the clusters are contiguous runs. Centers start at the quantiles of the
+sample, and each Lloyd iteration only searches for the boundaries between
+the runs and averages them with prefix sums, so it takes O(k log n) rather
+than a pass over the data.
+"""
+
+import numpy as np
+
+from openfl.pipelines import codebook
+
+DEFAULT_SAMPLE_SIZE = 1000000
+
+
+def kmeans_1d(data, n_clusters, sample_size=None, max_iter=100, seed=0):
+    """Cluster the values of an array.
+
+    Args:
+        data: A Numpy array.
+        n_clusters (int): The number of clusters.
+        sample_size (int, optional): The number of values drawn to fit the
+            clusters on. Defaults to None, i.e. all values.
+        max_iter (int, optional): The maximum number of Lloyd iterations.
+            Defaults to 100.
+        seed (int, optional): The seed of the sample. Defaults to 0.
+
+    Returns:
+        centers: The increasing float64 array of the cluster centers.
+        labels: The flat array of the cluster of each value, in the
+            narrowest integer type.
+    """
+    flatten_data = np.asarray(data).reshape(-1)
+    if sample_size is not None and flatten_data.size > sample_size:
+        rng = np.random.default_rng(seed)
+        sample = flatten_data[rng.integers(flatten_data.size, size=sample_size)]
+    else:
+        sample = flatten_data
+    sample = np.sort(sample.astype(np.float64))
+    prefix_sums = np.concatenate(([0.0], np.cumsum(sample)))
+
+    quantiles = (np.arange(n_clusters) + 0.5) / n_clusters
+    centers = sample[(quantiles * sample.size).astype(np.intp)]
+    edges = None
+    for _ in range(max_iter):
+        boundaries = (centers[1:] + centers[:-1]) / 2
+        new_edges = np.concatenate(([0], np.searchsorted(sample, boundaries), [sample.size]))
+        if edges is not None and np.array_equal(new_edges, edges):
+            break
+        edges = new_edges
+        counts = np.diff(edges)
+        sums = np.diff(prefix_sums[edges])
+        # Empty clusters keep their center
+        centers = np.where(counts > 0, sums / np.maximum(counts, 1), centers)
+
+    boundaries = (centers[1:] + centers[:-1]) / 2
+    return centers, codebook.digitize(flatten_data, boundaries)
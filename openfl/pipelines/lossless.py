@@ -0,0 +1,299 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""Lossless compression module.
+
+The bytes of a tensor are split into chunks compressed in parallel
+threads, which the codecs below all allow by releasing the GIL. The bytes
+of float tensors are shuffled first, so that the exponent bytes of the
+values, which take few distinct values, are stored next to each other.
+
+zstd and lz4 need the zstandard and lz4 packages on both sides, which are
+installed by the `compression` extra, zlib is always available.
+"""
+
+import gzip as gz
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from importlib import util
+from threading import Lock
+
+import numpy as np
+
+from openfl.pipelines.pipeline import Transformer
+
+if util.find_spec("zstandard") is not None:
+    import zstandard
+
+if util.find_spec("lz4") is not None:
+    import lz4.block
+
+# The codec identifiers sent in the metadata
+CODECS = {"zlib": 0, "zstd": 1, "lz4": 2}
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# The thread pools shared by the transformers, by number of threads
+_executors = {}
+_executors_lock = Lock()
+
+
+def byte_shuffle(data, itemsize):
+    """Group the bytes of the elements of an array by their position.
+
+    Args:
+        data: A flat uint8 Numpy array.
+        itemsize (int): The number of bytes of an element.
+
+    Returns:
+        The uint8 array of the first bytes of the elements, followed by
+            their second bytes and so on.
+    """
+    shuffled = np.empty_like(data)
+    planes = shuffled.reshape(itemsize, -1)
+    elements = data.reshape(-1, itemsize)
+    # A strided copy per byte position beats transposing the whole array
+    for i in range(itemsize):
+        planes[i] = elements[:, i]
+    return shuffled
+
+
+def byte_unshuffle(data, itemsize):
+    """Undo `byte_shuffle`.
+
+    Args:
+        data: A flat uint8 Numpy array of shuffled bytes.
+        itemsize (int): The number of bytes of an element.
+
+    Returns:
+        The uint8 array of the bytes of the elements.
+    """
+    unshuffled = np.empty_like(data)
+    elements = unshuffled.reshape(-1, itemsize)
+    planes = data.reshape(itemsize, -1)
+    for i in range(itemsize):
+        elements[:, i] = planes[i]
+    return unshuffled
+
+
+class ChunkedCompressionTransformer(Transformer):
+    """Transformer class compressing data in chunks in parallel threads.
+
+    Attributes:
+        codec (str): The codec, one of 'zlib', 'zstd' or 'lz4'.
+        level (int): The compression level of the codec.
+        chunk_size (int): The number of bytes of a chunk.
+        shuffle (bool): Whether the bytes of float data are shuffled.
+        n_threads (int): The number of threads compressing chunks.
+        lossy (bool): A flag indicating if the transformation is lossy.
+    """
+
+    def __init__(
+        self,
+        codec="zlib",
+        level=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        shuffle=True,
+        n_threads=None,
+    ):
+        """Initialize ChunkedCompressionTransformer.
+
+        Args:
+            codec (str, optional): The codec, one of 'zlib', 'zstd' or 'lz4'.
+                Defaults to 'zlib'.
+            level (int, optional): The compression level. Defaults to None,
+                i.e. 1 for zlib, 3 for zstd and 0 for lz4.
+            chunk_size (int, optional): The number of bytes of a chunk.
+                Defaults to 1 MiB.
+            shuffle (bool, optional): Whether the bytes of float data are
+                shuffled. Defaults to True.
+            n_threads (int, optional): The number of threads compressing
+                chunks. Defaults to None, i.e. the number of CPUs.
+
+        Raises:
+            ValueError: If the codec is unknown.
+            ImportError: If the package of the codec is not installed.
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec}, expected one of {sorted(CODECS)}")
+        _check_codec(codec)
+        self.lossy = False
+        self.codec = codec
+        self.level = {"zlib": 1, "zstd": 3, "lz4": 0}[codec] if level is None else level
+        self.chunk_size = chunk_size
+        self.shuffle = shuffle
+        self.n_threads = n_threads or os.cpu_count() or 1
+
+    def forward(self, data, **kwargs):
+        """Compress data into bytes.
+
+        Args:
+            data: A Numpy array. uint8 data is compressed as it is, other
+                data as float32.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            compressed_bytes: The concatenated compressed chunks.
+            metadata: The codec, the chunk size, the size of the last chunk
+                and the compressed size of each chunk.
+        """
+        data = np.asarray(data)
+        is_uint8 = data.dtype == np.uint8
+        if not is_uint8:
+            data = data.astype(np.float32, copy=False)
+        flat_bytes = np.ascontiguousarray(data).reshape(-1).view(np.uint8)
+        shuffled = self.shuffle and not is_uint8
+        if shuffled:
+            flat_bytes = byte_shuffle(flat_bytes, 4)
+
+        chunks = [
+            flat_bytes[start : start + self.chunk_size]
+            for start in range(0, flat_bytes.size, self.chunk_size)
+        ]
+        compress = _compressor(self.codec, self.level)
+        compressed_chunks = self._map(compress, chunks)
+
+        last_chunk_size = chunks[-1].size if chunks else 0
+        metadata = {
+            "int_list": [CODECS[self.codec], self.chunk_size, last_chunk_size]
+            + [len(chunk) for chunk in compressed_chunks],
+            "bool_list": [True, is_uint8, shuffled],
+        }
+        return b"".join(compressed_chunks), metadata
+
+    def backward(self, data, metadata, **kwargs):
+        """Decompress data into a Numpy array.
+
+        Args:
+            data: The compressed bytes.
+            metadata: The metadata for the transformation.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            The flat uint8 or float32 Numpy array.
+        """
+        bool_list = metadata.get("bool_list")
+        if not metadata.get("int_list"):
+            # Data compressed by the former GZIP transformers only flag uint8
+            # data
+            dtype = np.uint8 if bool_list else np.float32
+            return np.frombuffer(gz.decompress(data), dtype=dtype)
+        _, is_uint8, shuffled = bool_list
+        codec_id, chunk_size, last_chunk_size, *compressed_sizes = metadata["int_list"]
+        codec = {codec_id: codec for codec, codec_id in CODECS.items()}[codec_id]
+        _check_codec(codec)
+
+        n_chunks = len(compressed_sizes)
+        flat_bytes = np.empty(max(n_chunks - 1, 0) * chunk_size + last_chunk_size, np.uint8)
+        offsets = np.concatenate(([0], np.cumsum(compressed_sizes, dtype=np.int64)))
+        data = memoryview(data)
+        decompress = _decompressor(codec)
+
+        def decompress_chunk(i):
+            """Decompress a chunk into its place in the output buffer."""
+            size = last_chunk_size if i == n_chunks - 1 else chunk_size
+            chunk = decompress(data[offsets[i] : offsets[i + 1]], size)
+            flat_bytes[i * chunk_size : i * chunk_size + size] = np.frombuffer(chunk, np.uint8)
+
+        self._map(decompress_chunk, range(n_chunks))
+        if shuffled:
+            flat_bytes = byte_unshuffle(flat_bytes, 4)
+        return flat_bytes if is_uint8 else flat_bytes.view(np.float32)
+
+    def _map(self, function, items):
+        """Apply a function to items, in parallel threads if there are several.
+
+        Args:
+            function: The function.
+            items: The items.
+
+        Returns:
+            The list of the results.
+        """
+        items = list(items)
+        if len(items) <= 1 or self.n_threads <= 1:
+            return [function(item) for item in items]
+        return list(_get_executor(self.n_threads).map(function, items))
+
+
+def _get_executor(n_threads):
+    """Return the thread pool shared by the transformers with n_threads threads.
+
+    Args:
+        n_threads (int): The number of threads.
+
+    Returns:
+        ThreadPoolExecutor: The thread pool, created on first use.
+    """
+    with _executors_lock:
+        executor = _executors.get(n_threads)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="compression")
+            _executors[n_threads] = executor
+        return executor
+
+
+def _reset_executors():
+    """Forget the thread pools of the parent process in a forked child."""
+    global _executors_lock
+    _executors.clear()
+    _executors_lock = Lock()
+
+
+os.register_at_fork(after_in_child=_reset_executors)
+
+
+def _check_codec(codec):
+    """Raise if the package of a codec is not installed.
+
+    Args:
+        codec (str): The codec.
+
+    Raises:
+        ImportError: If the package of the codec is not installed.
+    """
+    package = {"zstd": "zstandard", "lz4": "lz4"}.get(codec)
+    if package is not None and util.find_spec(package) is None:
+        raise ImportError(f"The {codec} codec needs the {package} package")
+
+
+def _compressor(codec, level):
+    """Return the function compressing a chunk with a codec.
+
+    Args:
+        codec (str): The codec.
+        level (int): The compression level.
+
+    Returns:
+        The function of a uint8 array returning bytes.
+    """
+    if codec == "zstd":
+        # Compression contexts are not thread safe, so each call makes one
+        return lambda chunk: zstandard.ZstdCompressor(level=level).compress(chunk)
+    if codec == "lz4":
+        mode = "high_compression" if level > 0 else "default"
+        return lambda chunk: lz4.block.compress(
+            chunk, mode=mode, compression=level, store_size=False
+        )
+    return lambda chunk: zlib.compress(chunk, level)
+
+
+def _decompressor(codec):
+    """Return the function decompressing a chunk with a codec.
+
+    Args:
+        codec (str): The codec.
+
+    Returns:
+        The function of compressed bytes and their decompressed size
+            returning bytes.
+    """
+    if codec == "zstd":
+        return lambda chunk, size: zstandard.ZstdDecompressor().decompress(
+            chunk, max_output_size=size
+        )
+    if codec == "lz4":
+        return lambda chunk, size: lz4.block.decompress(chunk, uncompressed_size=size)
+    return lambda chunk, size: zlib.decompress(chunk, bufsize=max(size, 1))
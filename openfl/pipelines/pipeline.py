@@ -93,6 +93,106 @@ class Float32NumpyArrayToBytes(Transformer):
         return np.reshape(flat_array, newshape=array_shape, order="C")
 
 
+class TopKSparsityTransformer(Transformer):
+    """Transformer class keeping only the elements of greatest magnitude.
+
+    Only the values of the top-k elements are passed on. Their indices are
+    delta encoded in the metadata, which protobuf serializes as varints, so
+    each element kept costs a byte or two on top of its value.
+
+    Attributes:
+        p (float): The fraction of elements to keep.
+        dtype: The numerical type of the values passed on.
+        avoid_zeros (bool): Whether the values kept are shifted by 1e-7 when
+            the smallest is below it.
+        lossy (bool): A flag indicating if the transformation is lossy.
+    """
+
+    def __init__(self, p=0.01, dtype=np.float32, avoid_zeros=False):
+        """Initialize TopKSparsityTransformer.
+
+        Args:
+            p (float, optional): The fraction of elements to keep. Defaults
+                to 0.01.
+            dtype (optional): The numerical type of the values passed on.
+                Defaults to np.float32.
+            avoid_zeros (bool, optional): Whether the values kept are shifted
+                by 1e-7 when the smallest is below it, as the STC and SKC
+                pipelines always did. Defaults to False.
+        """
+        self.lossy = True
+        self.p = p
+        self.dtype = dtype
+        self.avoid_zeros = avoid_zeros
+
+    def forward(self, data, **kwargs):
+        """Keep the top-k elements of the data.
+
+        Args:
+            data: The Numpy array to be sparsified.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            values: The flat array of the values kept, in index order.
+            metadata: The shape of the data followed by the differences
+                between the consecutive indices kept.
+        """
+        data = np.asarray(data)
+        flat_data = data.reshape(-1)
+        k = int(np.ceil(flat_data.size * self.p))
+        indices = self._topk_indices(flat_data, k)
+        deltas = np.diff(indices, prepend=0)
+        metadata = {
+            "int_list": [data.ndim, *data.shape] + deltas.tolist(),
+            "bool_list": [True],
+        }
+        values = flat_data[indices].astype(self.dtype)
+        if self.avoid_zeros and values.size and values.min() < 10e-8:  # avoid zeros
+            values = values + self.dtype(10e-8)
+        return values, metadata
+
+    def backward(self, data, metadata, **kwargs):
+        """Scatter the values kept back into a dense float32 array.
+
+        Args:
+            data: The values kept.
+            metadata: The metadata for the transformation.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            The dense data, zero where elements were dropped.
+        """
+        int_list = metadata["int_list"]
+        if not metadata.get("bool_list"):
+            # Tensors sparsified into a dense array only carry their shape
+            return np.asarray(data, dtype=np.float32).reshape(list(int_list))
+        ndim = int_list[0]
+        shape = list(int_list[1 : ndim + 1])
+        indices = np.cumsum(np.asarray(int_list[ndim + 1 :], dtype=np.int64))
+        recovered_data = np.zeros(int(np.prod(shape)), dtype=np.float32)
+        recovered_data[indices] = data
+        return recovered_data.reshape(shape)
+
+    @staticmethod
+    def _topk_indices(x, k):
+        """Select the top k elements by magnitude in linear time.
+
+        Args:
+            x: A flat Numpy array.
+            k: The number of elements to select.
+
+        Returns:
+            The indices of the top k elements in increasing order.
+        """
+        if k >= x.size:
+            return np.arange(x.size)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        indices = np.argpartition(np.abs(x), x.size - k)[x.size - k :]
+        indices.sort()
+        return indices
+
+
 class TransformationPipeline:
     """Data Transformer Pipeline Class.
 
@@ -0,0 +1,177 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""PolicyPipeline module.
+
+Compresses each tensor with the pipeline of the first rule it matches, so
+that small tensors can be sent as they are while the largest layers are
+compressed aggressively. The index of the chosen pipeline is appended to
+the transformer metadata, so that the receiving side decompresses the
+tensor with the same pipeline.
+
+Example of a plan.yaml:
+
+compression_pipeline :
+  template : openfl.pipelines.PolicyPipeline
+  settings :
+    rules :
+      - pattern : "*embedding*"
+        min_size : 1000000
+        pipeline :
+          template : openfl.pipelines.STCPipeline
+          settings :
+            p_sparsity : 0.01
+      - dtype : float32
+        min_size : 10000
+        pipeline :
+          template : openfl.pipelines.KCPipeline
+    default :
+      template : openfl.pipelines.NoCompressionPipeline
+"""
+
+from fnmatch import fnmatchcase
+from importlib import import_module
+from os.path import splitext
+
+import numpy as np
+
+from openfl.pipelines.no_compression_pipeline import NoCompressionPipeline
+from openfl.pipelines.pipeline import TransformationPipeline
+
+
+def _build_pipeline(spec):
+    """Return the pipeline described by a template and its settings.
+
+    Args:
+        spec: A dictionary with the fully qualified `template` of the
+            pipeline class and its optional `settings`, or a pipeline.
+
+    Returns:
+        The pipeline.
+    """
+    if isinstance(spec, TransformationPipeline):
+        return spec
+    template = spec["template"]
+    module_path, class_name = splitext(template)
+    module = import_module(module_path)
+    return getattr(module, class_name.strip("."))(**spec.get("settings", {}))
+
+
+class PolicyPipeline(TransformationPipeline):
+    """Pipeline choosing the compression pipeline of each tensor.
+
+    Each rule is a dictionary with the `pipeline` to use and any of the
+    conditions below, all of which must hold for the rule to match:
+
+        pattern: A shell-style pattern the tensor name must match.
+        min_size: The minimum number of elements of the tensor.
+        max_size: The maximum number of elements of the tensor.
+        dtype: The name of the data type of the tensor, or a list of names.
+
+    Attributes:
+        rules (list): The conditions of the rules.
+        pipelines (list): The pipeline of each rule, followed by the default
+            pipeline.
+    """
+
+    def __init__(self, rules=None, default=None, **kwargs):
+        """Initialize PolicyPipeline.
+
+        Args:
+            rules (list, optional): The rules, in the order they are tried.
+                Defaults to None, i.e. no rules.
+            default (optional): The pipeline of the tensors no rule matches,
+                as a template and settings. Defaults to no compression.
+            **kwargs: Additional keyword arguments for the pipeline.
+        """
+        super().__init__(transformers=[], **kwargs)
+        self.rules = []
+        self.pipelines = []
+        for rule in rules or []:
+            rule = dict(rule)
+            self.pipelines.append(_build_pipeline(rule.pop("pipeline")))
+            dtype = rule.get("dtype")
+            if isinstance(dtype, str):
+                rule["dtype"] = [dtype]
+            unknown = set(rule) - {"pattern", "min_size", "max_size", "dtype"}
+            if unknown:
+                raise ValueError(f"Unknown conditions in compression rule: {sorted(unknown)}")
+            self.rules.append(rule)
+        if default is None:
+            self.pipelines.append(NoCompressionPipeline())
+        else:
+            self.pipelines.append(_build_pipeline(default))
+
+    def select(self, data, tensor_name=None):
+        """Return the index of the pipeline of a tensor.
+
+        Args:
+            data: The tensor.
+            tensor_name (str, optional): The name of the tensor. Rules with a
+                pattern do not match tensors without a name.
+
+        Returns:
+            The index of the pipeline in `pipelines`.
+        """
+        data = np.asarray(data)
+        for index, rule in enumerate(self.rules):
+            pattern = rule.get("pattern")
+            if pattern is not None and (
+                tensor_name is None or not fnmatchcase(tensor_name, pattern)
+            ):
+                continue
+            if data.size < rule.get("min_size", 0):
+                continue
+            if "max_size" in rule and data.size > rule["max_size"]:
+                continue
+            if "dtype" in rule and data.dtype.name not in rule["dtype"]:
+                continue
+            return index
+        return len(self.rules)
+
+    def forward(self, data, tensor_name=None, **kwargs):
+        """Forward pass of the pipeline chosen for the tensor.
+
+        Args:
+            data: The data to be transformed.
+            tensor_name (str, optional): The name of the tensor.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            data: The transformed data.
+            transformer_metadata: The metadata of the chosen pipeline,
+                followed by the index of the pipeline.
+        """
+        index = self.select(data, tensor_name)
+        data, transformer_metadata = self.pipelines[index].forward(data, **kwargs)
+        transformer_metadata.append({"int_list": [index], "bool_list": [True]})
+        return data, transformer_metadata
+
+    def backward(self, data, transformer_metadata, **kwargs):
+        """Backward pass of the pipeline the tensor was transformed with.
+
+        Args:
+            data: The transformed data.
+            transformer_metadata: The metadata for the transformation.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            The original data before the transformation.
+        """
+        index = transformer_metadata.pop()["int_list"][0]
+        if not 0 <= index < len(self.pipelines):
+            raise ValueError(
+                f"Tensor was compressed with pipeline {index} of a policy of "
+                f"{len(self.pipelines)} pipelines"
+            )
+        return self.pipelines[index].backward(data, transformer_metadata, **kwargs)
+
+    def is_lossy(self):
+        """If any of the pipelines are lossy, then the policy is lossy.
+
+        Returns:
+            True if any of the pipelines of the policy are lossy, False
+                otherwise.
+        """
+        return any(pipeline.is_lossy() for pipeline in self.pipelines)
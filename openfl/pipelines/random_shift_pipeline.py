@@ -4,13 +4,22 @@
 
 """RandomShiftPipeline module."""
 
+import secrets
+
 import numpy as np
 
 from openfl.pipelines.pipeline import Float32NumpyArrayToBytes, TransformationPipeline, Transformer
 
+SEED_WORDS = 4
+
 
 class RandomShiftTransformer(Transformer):
-    """Random Shift Transformer class."""
+    """Random Shift Transformer class.
+
+    The shift is drawn from a Philox generator with a random seed, so that
+    only the seed has to be sent along with the shape for the shift to be
+    drawn again.
+    """
 
     def __init__(self):
         """Initialize RandomShiftTransformer."""
@@ -31,13 +40,12 @@ class RandomShiftTransformer(Transformer):
             metadata: The metadata for the transformation.
         """
         shape = data.shape
-        random_shift = np.random.uniform(low=-20, high=20, size=shape).astype(np.float32)
-        transformed_data = data + random_shift
+        # int_list holds int32, so each seed word takes 31 bits
+        seed = [secrets.randbits(31) for _ in range(SEED_WORDS)]
+        transformed_data = data + self._random_shift(seed, shape)
 
         # construct metadata
-        metadata = {"int_to_float": {}, "int_list": list(shape)}
-        for idx, val in enumerate(random_shift.flatten(order="C")):
-            metadata["int_to_float"][idx] = val
+        metadata = {"int_list": seed + list(shape), "bool_list": [True]}
 
         return transformed_data, metadata
 
@@ -54,18 +62,33 @@ class RandomShiftTransformer(Transformer):
         Returns:
             The original data before the random shift.
         """
-        shape = tuple(metadata["int_list"])
-        # this is an awkward use of the metadata into to float dict, usually
-        # it will trully be treated as a dict. Here (and in 'forward' above)
-        # we use it essentially as an array.
-        shift = np.reshape(
-            np.array(
-                [metadata["int_to_float"][idx] for idx in range(len(metadata["int_to_float"]))]
-            ),
-            newshape=shape,
-            order="C",
-        )
-        return data - shift
+        int_list = list(metadata["int_list"])
+        if metadata.get("bool_list"):
+            seed, shape = int_list[:SEED_WORDS], tuple(int_list[SEED_WORDS:])
+            return data - self._random_shift(seed, shape)
+
+        # Shifts sent element by element
+        shape = tuple(int_list)
+        int_to_float = metadata["int_to_float"]
+        shift = np.array([int_to_float[idx] for idx in range(len(int_to_float))])
+        return data - np.reshape(shift, newshape=shape, order="C")
+
+    @staticmethod
+    def _random_shift(seed, shape):
+        """Draw the shift of the given seed.
+
+        Args:
+            seed (list of int): The words of the seed.
+            shape: The shape of the data.
+
+        Returns:
+            The float32 shift, uniform in [-20, 20).
+        """
+        rng = np.random.Generator(np.random.Philox(np.random.SeedSequence(seed)))
+        random_shift = rng.random(shape, dtype=np.float32)
+        random_shift *= 40
+        random_shift -= 20
+        return random_shift
 
 
 class RandomShiftPipeline(TransformationPipeline):
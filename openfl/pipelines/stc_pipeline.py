@@ -3,17 +3,26 @@
 
 """STCPipelinemodule."""
 
-import copy
 import gzip as gz
+import warnings
 
 import numpy as np
 
-from openfl.pipelines.pipeline import TransformationPipeline, Transformer
+from openfl.pipelines import codebook
+from openfl.pipelines.lossless import ChunkedCompressionTransformer
+from openfl.pipelines.pipeline import (
+    TopKSparsityTransformer,
+    TransformationPipeline,
+    Transformer,
+)
 
 
 class SparsityTransformer(Transformer):
     """A transformer class to sparsify input data.
 
+    Deprecated, use TopKSparsityTransformer instead, which passes on
+    the values kept and their indices rather than a dense array.
+
     Attributes:
         p (float): The sparsity ratio.
         lossy (bool): A flag indicating if the transformation is lossy.
@@ -25,6 +34,11 @@ class SparsityTransformer(Transformer):
         Args:
             p (float, optional): The sparsity ratio. Defaults to 0.01.
         """
+        warnings.warn(
+            "SparsityTransformer is deprecated, use TopKSparsityTransformer instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         self.lossy = True
         self.p = p
 
@@ -103,84 +117,68 @@ class TernaryTransformer(Transformer):
         """Initialize."""
         self.lossy = True
 
-    def forward(self, data, **kwargs):
+    def forward(self, data, dense_size=None, **kwargs):
         """Ternerize data into positive mean value, negative mean value and
         zero value.
 
         Args:
             data: an flattened numpy array
+            dense_size (int, optional): The number of elements of the tensor
+                the data was sparsified from. The elements dropped count as
+                zeros in the mean. Defaults to None, i.e. data.size.
 
         Returns:
-            int_data: an numpy array being terneraized.
+            packed_codes: the codes of the ternarized data, packed into
+                bytes.
             metadata: dictionary to store a list of meta information.
         """
         # ternarization, data is sparse and flattened
-        mean_topk = np.mean(np.abs(data))
+        if dense_size is None:
+            dense_size = data.size
+        mean_topk = np.sum(np.abs(data)) / max(dense_size, 1)
         out_ = np.where(data > 0.0, mean_topk, 0.0)
         out = np.where(data < 0.0, -mean_topk, out_)
-        int_array, int2float_map = self._float_to_int(out)
-        metadata = {"int_to_float": int2float_map}
-        return int_array, metadata
+        int_array, int2float_map = codebook.float_to_int(
+            out, levels=np.unique([-mean_topk, 0.0, mean_topk])
+        )
+        metadata = {"int_to_float": int2float_map, "int_list": [int_array.size]}
+        packed_codes = codebook.pack_codes(int_array, len(int2float_map))
+        return packed_codes, metadata
 
     def backward(self, data, metadata, **kwargs):
         """Recover data array back to the original numerical type.
 
         Args:
-            data: an numpy array with non-zero values.
+            data: the packed codes, or an numpy array of codes.
             metadata: dictionary to contain information for recovering back
                 to original data array.
 
         Returns:
-            metadata: dictionary to contain information for recovering back
-                to original data array.
             data: an numpy array with original numerical type.
         """
-        # TODO
-        data = copy.deepcopy(data)
         int2float_map = metadata["int_to_float"]
-        for key in int2float_map:
-            indices = data == key
-            data[indices] = int2float_map[key]
-        return data
-
-    @staticmethod
-    def _float_to_int(np_array):
-        """Create look-up table for conversion between floating and integer
-        types.
-
-        Args:
-            np_array: A numpy array.
-
-        Returns:
-            int_array: The input numpy float array converted to an integer
-                array.
-            int_to_float_map: The dictionary mapping integers to floats.
-        """
-        flatten_array = np_array.reshape(-1)
-        unique_value_array = np.unique(flatten_array)
-        int_array = np.zeros(flatten_array.shape, dtype=np.int32)
-        int_to_float_map = {}
-        float_to_int_map = {}
-        # create table
-        for idx, u_value in enumerate(unique_value_array):
-            int_to_float_map.update({idx: u_value})
-            float_to_int_map.update({u_value: idx})
-            # assign to the integer array
-            indices = np.where(flatten_array == u_value)
-            int_array[indices] = idx
-        int_array = int_array.reshape(np_array.shape)
-        return int_array, int_to_float_map
+        if data.dtype == np.uint8:
+            count = metadata["int_list"][0]
+            data = codebook.unpack_codes(data, len(int2float_map), count)
+        return codebook.int_to_float(data, int2float_map)
 
 
 class GZIPTransformer(Transformer):
     """GZIP transformer class for losslessly compressing data.
 
+    Deprecated, use ChunkedCompressionTransformer instead.
+
     Attributes:
         lossy (bool): A flag indicating if the transformation is lossy.
     """
 
     def __init__(self):
         """Initialize."""
+        warnings.warn(
+            "GZIPTransformer is deprecated, use ChunkedCompressionTransformer instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         self.lossy = False
 
     def forward(self, data, **kwargs):
@@ -194,9 +192,14 @@ class GZIPTransformer(Transformer):
             metadata: dictionary to contain information for recovering back
                 to original data array
         """
-        bytes_ = data.astype(np.float32).tobytes()
+        if data.dtype == np.uint8:
+            # Packed codes are compressed as they are
+            bytes_ = data.tobytes()
+            metadata = {"bool_list": [True]}
+        else:
+            bytes_ = data.astype(np.float32).tobytes()
+            metadata = {}
         compressed_bytes = gz.compress(bytes_)
-        metadata = {}
         return compressed_bytes, metadata
 
     def backward(self, data, metadata, **kwargs):
@@ -212,7 +215,8 @@ class GZIPTransformer(Transformer):
                 decompression.
         """
         decompressed_bytes_ = gz.decompress(data)
-        data = np.frombuffer(decompressed_bytes_, dtype=np.float32)
+        dtype = np.uint8 if metadata.get("bool_list") else np.float32
+        data = np.frombuffer(decompressed_bytes_, dtype=dtype)
         return data
 
 
@@ -222,15 +226,21 @@ class STCPipeline(TransformationPipeline):
 
     Attributes:
         p (float): The sparsity factor.
+        codec (str): The lossless codec.
+        n_threads (int): The number of threads compressing the data.
     """
 
-    def __init__(self, p_sparsity=0.1, n_clusters=6, **kwargs):
+    def __init__(self, p_sparsity=0.1, n_clusters=6, codec="zlib", n_threads=None, **kwargs):
         """Initialize a pipeline of transformers.
 
         Args:
             p_sparsity (float, optional): The sparsity factor. Defaults to 0.1.
             n_clusters (int, optional): The number of K-mean clusters.
                 Defaults to 6.
+            codec (str, optional): The lossless codec, one of 'zlib', 'zstd'
+                or 'lz4'. Defaults to 'zlib'.
+            n_threads (int, optional): The number of threads compressing the
+                data. Defaults to None, i.e. the number of CPUs.
             **kwargs: Additional keyword arguments for the pipeline.
 
         Returns:
@@ -238,9 +248,24 @@ class STCPipeline(TransformationPipeline):
         """
         # instantiate each transformer
         self.p = p_sparsity
+        self.codec = codec
+        self.n_threads = n_threads
         transformers = [
-            SparsityTransformer(self.p),
+            TopKSparsityTransformer(self.p, avoid_zeros=True),
             TernaryTransformer(),
-            GZIPTransformer(),
+            ChunkedCompressionTransformer(self.codec, n_threads=self.n_threads),
         ]
         super().__init__(transformers=transformers, **kwargs)
+
+    def forward(self, data, **kwargs):
+        """Forward pass of the pipeline.
+
+        Args:
+            data: The data to be transformed.
+            **kwargs: Additional keyword arguments for the transformation.
+
+        Returns:
+            data: The transformed data.
+            transformer_metadata: The metadata for the transformation.
+        """
+        return super().forward(data, dense_size=np.size(data), **kwargs)
@@ -4,11 +4,16 @@
 
 """TensorCodec module."""
 
+import logging
+import time
+
 import numpy as np
 
 from openfl.pipelines import NoCompressionPipeline
 from openfl.utilities import TensorKey, change_tags
 
+logger = logging.getLogger(__name__)
+
 
 class TensorCodec:
     """TensorCodec is responsible for the following.
@@ -21,6 +26,8 @@ class TensorCodec:
     Attributes:
         compression_pipeline: The pipeline used for compression.
         lossless_pipeline: The pipeline used for lossless compression.
+        compression_stats (dict): The compression ratio and encode time in
+            seconds of the last compression of each tensor, by tensor name.
     """
 
     def __init__(self, compression_pipeline):
@@ -34,6 +41,7 @@ class TensorCodec:
             self.lossless_pipeline = NoCompressionPipeline()
         else:
             self.lossless_pipeline = compression_pipeline
+        self.compression_stats = {}
 
     def set_lossless_pipeline(self, lossless_pipeline):
         """
@@ -68,13 +76,22 @@ class TensorCodec:
             compressed_nparray: The compressed tensor.
             metadata: metadata associated with compressed tensor.
         """
+        tensor_name, origin, round_number, report, tags = tensor_key
+        start = time.monotonic()
         if require_lossless:
-            compressed_nparray, metadata = self.lossless_pipeline.forward(data, **kwargs)
+            compressed_nparray, metadata = self.lossless_pipeline.forward(
+                data, tensor_name=tensor_name, **kwargs
+            )
         else:
-            compressed_nparray, metadata = self.compression_pipeline.forward(data, **kwargs)
+            compressed_nparray, metadata = self.compression_pipeline.forward(
+                data, tensor_name=tensor_name, **kwargs
+            )
+        encode_time = time.monotonic() - start
+        ratio = np.asarray(data).nbytes / max(len(compressed_nparray), 1)
+        self.compression_stats[tensor_name] = {"ratio": ratio, "encode_time": encode_time}
+        logger.debug("Compressed %s by %.2fx in %.2f ms", tensor_name, ratio, encode_time * 1000)
         # Define the compressed tensorkey that should be
         # returned ('trained.delta'->'trained.delta.lossy_compressed')
-        tensor_name, origin, round_number, report, tags = tensor_key
         if not self.compression_pipeline.is_lossy() or require_lossless:
             new_tags = change_tags(tags, add_field="compressed")
         else:
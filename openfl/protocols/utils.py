@@ -3,6 +3,8 @@
 
 """Proto utils."""
 
+import os
+
 from openfl.protocols import base_pb2
 from openfl.utilities import TensorKey
 
@@ -165,7 +167,9 @@ def construct_proto(tensor_dict, model_id, model_version, is_delta, compression_
     bytes_dict = {}
     metadata_dict = {}
     for key, array in tensor_dict.items():
-        bytes_dict[key], metadata_dict[key] = compression_pipeline.forward(data=array)
+        bytes_dict[key], metadata_dict[key] = compression_pipeline.forward(
+            data=array, tensor_name=key
+        )
 
     # convert the compressed_tensor_dict and metadata to protobuf, and make the new model proto
     model_proto = bytes_and_metadata_to_model_proto(
@@ -194,7 +198,7 @@ def construct_model_proto(tensor_dict, round_number, tensor_pipe):
     # TODO: Hold-out tensors from the tensor compression pipeline.
     named_tensors = []
     for key, nparray in tensor_dict.items():
-        bytes_data, transformer_metadata = tensor_pipe.forward(data=nparray)
+        bytes_data, transformer_metadata = tensor_pipe.forward(data=nparray, tensor_name=key)
         tensor_key = TensorKey(key, "agg", round_number, False, ("model",))
         named_tensors.append(
             construct_named_tensor(
@@ -284,18 +288,105 @@ def load_proto(fpath):
 def dump_proto(model_proto, fpath):
     """Dump the protobuf to a file.
 
+    The protobuf is written to a temporary file in the same directory, which
+    then replaces the file, so that a crash while dumping never leaves a
+    truncated model behind.
+
     Args:
         model_proto: The protobuf of the model.
         fpath: The file path to dump the protobuf.
     """
     s = model_proto.SerializeToString()
-    with open(fpath, "wb") as f:
-        f.write(s)
+    tmp_path = f"{fpath}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(s)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, fpath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    # Persist the rename itself
+    dir_fd = os.open(os.path.dirname(os.path.abspath(fpath)), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+class DataStreamReader:
+    """Assemble the chunks of a data stream as they are received.
+
+    If the first chunk announces the total size of the stream, the chunks are
+    copied into a buffer preallocated to that size, otherwise they are joined
+    once at the end.
+    """
+
+    def __init__(self):
+        """Initialize the DataStreamReader."""
+        self._buffer = None
+        self._chunks = []
+        self._offset = 0
+
+    def add(self, chunk):
+        """Add the next chunk of the stream.
+
+        Args:
+            chunk (base_pb2.DataStream): The chunk.
+
+        Raises:
+            RuntimeError: If the stream is larger than announced.
+        """
+        if self._buffer is None and not self._chunks and chunk.total_size > 0:
+            self._buffer = memoryview(bytearray(chunk.total_size))
+        if self._buffer is None:
+            self._chunks.append(chunk.npbytes)
+            return
+        end = self._offset + len(chunk.npbytes)
+        if end > len(self._buffer):
+            raise RuntimeError(f"Received more than the announced {len(self._buffer)} bytes")
+        self._buffer[self._offset : end] = chunk.npbytes
+        self._offset = end
+
+    def to_proto(self, proto, logger=None):
+        """Parse the received stream into a protobuf.
+
+        Args:
+            proto: The protobuf to be filled with the data stream.
+            logger (optional): The logger for logging information.
+
+        Returns:
+            proto: The protobuf filled with the data stream.
+
+        Raises:
+            RuntimeError: If the stream is empty or incomplete.
+        """
+        if self._buffer is None:
+            npbytes = b"".join(self._chunks)
+        elif self._offset < len(self._buffer):
+            raise RuntimeError(
+                f"Received incomplete stream message of type {type(proto)}: "
+                f"{self._offset} of {len(self._buffer)} bytes"
+            )
+        else:
+            npbytes = self._buffer
+
+        if len(npbytes) > 0:
+            proto.ParseFromString(npbytes)
+            if logger is not None:
+                logger.debug("datastream_to_proto parsed a %s.", type(proto))
+            return proto
+        else:
+            raise RuntimeError(f"Received empty stream message of type {type(proto)}")
 
 
 def datastream_to_proto(proto, stream, logger=None):
     """Convert the datastream to the protobuf.
 
+    See `DataStreamReader`.
+
     Args:
         proto: The protobuf to be filled with the data stream.
         stream: The data stream.
@@ -304,27 +395,26 @@ def datastream_to_proto(proto, stream, logger=None):
     Returns:
         proto: The protobuf filled with the data stream.
     """
-    npbytes = b""
+    reader = DataStreamReader()
     for chunk in stream:
-        npbytes += chunk.npbytes
-
-    if len(npbytes) > 0:
-        proto.ParseFromString(npbytes)
-        if logger is not None:
-            logger.debug("datastream_to_proto parsed a %s.", type(proto))
-        return proto
-    else:
-        raise RuntimeError(f"Received empty stream message of type {type(proto)}")
+        reader.add(chunk)
+    return reader.to_proto(proto, logger)
 
 
-def proto_to_datastream(proto, logger, max_buffer_size=(2 * 1024 * 1024)):
+def proto_to_datastream(proto, logger, max_buffer_size=(2 * 1024 * 1024), announce_size=True):
     """Convert the protobuf to the datastream for the remote connection.
 
+    Chunks are generated lazily, so only one of them is held in memory next
+    to the serialized protobuf. The first chunk also carries the total size
+    of the stream.
+
     Args:
         proto: The protobuf to be converted into a data stream.
         logger: The logger for logging information.
         max_buffer_size (optional): The maximum buffer size for the data
             stream. Defaults to 2*1024*1024.
+        announce_size (bool, optional): Whether the first chunk carries the
+            total size of the stream. Defaults to True.
 
     Yields:
         reply: Chunks of the data stream for the remote connection.
@@ -341,9 +431,33 @@ def proto_to_datastream(proto, logger, max_buffer_size=(2 * 1024 * 1024)):
     for i in range(0, data_size, buffer_size):
         chunk = npbytes[i : i + buffer_size]
         reply = base_pb2.DataStream(npbytes=chunk, size=len(chunk))
+        if i == 0 and announce_size:
+            reply.total_size = data_size
         yield reply
 
 
+def protos_to_datastream(protos, logger, max_buffer_size=(2 * 1024 * 1024)):
+    """Convert a sequence of protobufs to the datastream of their merge.
+
+    Serialized protobufs of a type concatenate into the serialization of
+    their merge, in which repeated fields are concatenated. Each protobuf is
+    only serialized once the previous one has been streamed, so that they
+    can be produced while the stream is sent. The total size of the stream
+    is not known in advance, so it is not announced.
+
+    Args:
+        protos: An iterable of protobufs of the same type.
+        logger: The logger for logging information.
+        max_buffer_size (optional): The maximum buffer size for the data
+            stream. Defaults to 2*1024*1024.
+
+    Yields:
+        reply: Chunks of the data stream for the remote connection.
+    """
+    for proto in protos:
+        yield from proto_to_datastream(proto, logger, max_buffer_size, announce_size=False)
+
+
 def get_headers(context) -> dict:
     """Get headers from context.
 
@@ -2,4 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-from openfl.transport.grpc import AggregatorGRPCClient, AggregatorGRPCServer
+from openfl.transport.grpc import (
+    AggregatorGRPCClient,
+    AggregatorGRPCServer,
+    AsyncAggregatorGRPCServer,
+)
@@ -4,3 +4,4 @@
 
 from openfl.transport.grpc.aggregator_client import AggregatorGRPCClient
 from openfl.transport.grpc.aggregator_server import AggregatorGRPCServer
+from openfl.transport.grpc.async_aggregator_server import AsyncAggregatorGRPCServer
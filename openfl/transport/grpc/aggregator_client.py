@@ -4,8 +4,10 @@
 
 """AggregatorGRPCClient module."""
 
+import itertools
 import time
 from logging import getLogger
+from threading import Condition
 from typing import Optional, Tuple
 
 import grpc
@@ -134,13 +136,24 @@ class RetryOnRpcErrorClientInterceptor(
 
 
 def _atomic_connection(func):
+    # The calls in flight are counted, so that the channel is not replaced
+    # or closed under a call of another thread. With atomic connections, the
+    # first call opens the channel and the last one closes it.
     def wrapper(self, *args, **kwargs):
-        if not self.enable_atomic_connections:
+        with self._connection:
+            self._connection.wait_for(lambda: self._reconnections_pending == 0)
+            if self.enable_atomic_connections and self._calls_in_flight == 0:
+                self.reconnect()
+            self._calls_in_flight += 1
+        try:
             return func(self, *args, **kwargs)
-        self.reconnect()
-        response = func(self, *args, **kwargs)
-        self.disconnect()
-        return response
+        finally:
+            with self._connection:
+                self._calls_in_flight -= 1
+                if self._calls_in_flight == 0:
+                    if self.enable_atomic_connections:
+                        self.disconnect()
+                    self._connection.notify_all()
 
     return wrapper
 
@@ -173,7 +186,9 @@ class AggregatorGRPCClient:
     """Client to the aggregator over gRPC-TLS.
 
     This class implements a gRPC client for communicating with an aggregator
-    over a secure (TLS) connection.
+    over a secure (TLS) connection. Its calls to the aggregator can be made
+    from several threads at once, e.g. the concurrent fetches and the
+    prefetch of the collaborator, which share the channel.
 
     Attributes:
         uri (str): The URI of the aggregator.
@@ -190,6 +205,10 @@ class AggregatorGRPCClient:
         federation_uuid (str): The UUID of the federation.
         single_col_cert_common_name (str): The common name on the
             collaborator's certificate.
+        aggregated_model_streaming (bool): Whether aggregated tensors are
+            fetched with a single GetAggregatedModel call.
+        rounds_to_train (int): The number of rounds of the experiment, as
+            last sent by the aggregator, or 0 if unknown.
     """
 
     def __init__(
@@ -228,7 +247,10 @@ class AggregatorGRPCClient:
             federation_uuid (str, optional): The UUID of the federation.
             single_col_cert_common_name (str, optional): The common name on
                 the collaborator's certificate.
-            **kwargs: Additional keyword arguments.
+            **kwargs: Additional keyword arguments. `tasks_wait_timeout` is
+                the number of seconds the aggregator may hold a GetTasks
+                request until tasks are available (long polling). Defaults
+                to 0, i.e. the collaborator polls every `sleep_time` seconds.
         """
         self.uri = f"{agg_addr}:{agg_port}"
         self.use_tls = use_tls
@@ -241,9 +263,15 @@ class AggregatorGRPCClient:
             getLogger(__name__),
             self.uri,
         )
+        self.tasks_wait_timeout = int(kwargs.get("tasks_wait_timeout", 0))
         self.logger = getLogger(__name__)
         self.enable_atomic_connections = enable_atomic_connections
         self.resend_data_on_reconnection = resend_data_on_reconnection
+        # Guards the channel against the calls of other threads, e.g. the
+        # pipelined sends of the collaborator
+        self._connection = Condition()
+        self._calls_in_flight = 0
+        self._reconnections_pending = 0
 
         if not self.use_tls:
             self.logger.warning("gRPC is running on insecure channel with TLS disabled.")
@@ -263,6 +291,10 @@ class AggregatorGRPCClient:
         self.single_col_cert_common_name = single_col_cert_common_name
         self.refetch_server_cert_callback = refetch_server_cert_callback
         self.stub = aggregator_pb2_grpc.AggregatorStub(self.channel)
+        # Set to False if the aggregator turns out not to implement
+        # GetAggregatedModel
+        self.aggregated_model_streaming = True
+        self.rounds_to_train = 0
 
     def create_insecure_channel(self, uri):
         """Set an insecure gRPC channel (i.e. no TLS) if desired.
@@ -362,25 +394,36 @@ class AggregatorGRPCClient:
         self.channel.close()
 
     def reconnect(self):
-        """Create a new channel with the gRPC server."""
-        # channel.close() is idempotent. Call again here in case it wasn't
-        # issued previously
-        self.disconnect()
+        """Create a new channel with the gRPC server.
 
-        if not self.use_tls:
-            self.channel = self.create_insecure_channel(self.uri)
-        else:
-            self.channel = self.create_tls_channel(
-                self.uri,
-                self.root_certificate,
-                self.require_client_auth,
-                self.certificate,
-                self.private_key,
-            )
+        Waits for the calls in flight on the current channel to complete,
+        while new calls wait for the new channel.
+        """
+        with self._connection:
+            self._reconnections_pending += 1
+            try:
+                self._connection.wait_for(lambda: self._calls_in_flight == 0)
+            finally:
+                self._reconnections_pending -= 1
+                self._connection.notify_all()
+            # channel.close() is idempotent. Call again here in case it wasn't
+            # issued previously
+            self.disconnect()
+
+            if not self.use_tls:
+                self.channel = self.create_insecure_channel(self.uri)
+            else:
+                self.channel = self.create_tls_channel(
+                    self.uri,
+                    self.root_certificate,
+                    self.require_client_auth,
+                    self.certificate,
+                    self.private_key,
+                )
 
-        self.logger.info("Connecting to gRPC at %s", self.uri)
+            self.logger.info("Connecting to gRPC at %s", self.uri)
 
-        self.stub = aggregator_pb2_grpc.AggregatorStub(self.channel)
+            self.stub = aggregator_pb2_grpc.AggregatorStub(self.channel)
 
     @_resend_data_on_reconnection
     @_atomic_connection
@@ -396,9 +439,12 @@ class AggregatorGRPCClient:
                 indicating whether to quit.
         """
         self._set_header(collaborator_name)
-        request = aggregator_pb2.GetTasksRequest(header=self.header)
+        request = aggregator_pb2.GetTasksRequest(
+            header=self.header, wait_timeout=self.tasks_wait_timeout
+        )
         response = self.stub.GetTasks(request)
         self.validate_response(response, collaborator_name)
+        self.rounds_to_train = response.rounds_to_train
 
         return (
             response.tasks,
@@ -448,6 +494,69 @@ class AggregatorGRPCClient:
 
         return response.tensor
 
+    @_resend_data_on_reconnection
+    @_atomic_connection
+    def get_aggregated_model(self, collaborator_name, tensor_requests, on_tensor=None):
+        """
+        Get a set of aggregated tensors from the aggregator in a single call.
+
+        Args:
+            collaborator_name (str): The name of the collaborator.
+            tensor_requests (List[Tuple[TensorKey, bool]]): The keys of the
+                requested tensors, each with whether lossless compression is
+                required.
+            on_tensor (Callable[[int, aggregator_pb2.TensorProto], None],
+                optional): Called with the index and the tensor of each
+                tensor as soon as it is received, so that it can be processed
+                while the others are in flight. Tensors received again when
+                the call is retried are passed again.
+
+        Returns:
+            List[aggregator_pb2.TensorProto]: The aggregated tensors, in the
+                order they were requested, or None if the aggregator does not
+                support fetching them in a single call.
+        """
+        if not self.aggregated_model_streaming:
+            return None
+        self._set_header(collaborator_name)
+
+        request = aggregator_pb2.GetAggregatedModelRequest(
+            header=self.header,
+            tensors=[
+                aggregator_pb2.TensorRequest(
+                    tensor_name=tensor_name,
+                    round_number=round_number,
+                    report=report,
+                    tags=tags,
+                    require_lossless=require_lossless,
+                )
+                for (tensor_name, _, round_number, report, tags), require_lossless in (
+                    tensor_requests
+                )
+            ],
+        )
+        named_tensors = []
+        try:
+            for response in self.stub.GetAggregatedModel(request):
+                self.validate_response(response, collaborator_name)
+                if on_tensor is not None:
+                    for i, tensor in enumerate(response.tensors, len(named_tensors)):
+                        on_tensor(i, tensor)
+                named_tensors.extend(response.tensors)
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+            self.logger.info(
+                "Aggregator at %s does not support GetAggregatedModel, "
+                "falling back to fetching tensors one by one",
+                self.uri,
+            )
+            self.aggregated_model_streaming = False
+            return None
+
+        check_equal(len(named_tensors), len(tensor_requests), self.logger)
+        return named_tensors
+
     @_resend_data_on_reconnection
     @_atomic_connection
     def send_local_task_results(
@@ -467,21 +576,39 @@ class AggregatorGRPCClient:
             task_name (str): The name of the task.
             data_size (int): The size of the data.
             named_tensors (List[aggregator_pb2.NamedTensorProto]): The list of
-                named tensors.
+                named tensors, or an iterable producing them, which is
+                streamed tensor by tensor as they are produced.
         """
         self._set_header(collaborator_name)
-        request = aggregator_pb2.TaskResults(
-            header=self.header,
-            round_number=round_number,
-            task_name=task_name,
-            data_size=data_size,
-            tensors=named_tensors,
-        )
+        if isinstance(named_tensors, list):
+            request = aggregator_pb2.TaskResults(
+                header=self.header,
+                round_number=round_number,
+                task_name=task_name,
+                data_size=data_size,
+                tensors=named_tensors,
+            )
 
-        # convert (potentially) long list of tensors into stream
-        stream = []
-        stream += utils.proto_to_datastream(request, self.logger)
-        response = self.stub.SendLocalTaskResults(iter(stream))
+            # convert (potentially) long list of tensors into a lazily
+            # generated stream
+            stream = utils.proto_to_datastream(request, self.logger)
+        else:
+            request = aggregator_pb2.TaskResults(
+                header=self.header,
+                round_number=round_number,
+                task_name=task_name,
+                data_size=data_size,
+            )
+            # The aggregator parses the stream as the merge of the header and
+            # of a message per tensor
+            stream = utils.protos_to_datastream(
+                itertools.chain(
+                    [request],
+                    (aggregator_pb2.TaskResults(tensors=[tensor]) for tensor in named_tensors),
+                ),
+                self.logger,
+            )
+        response = self.stub.SendLocalTaskResults(stream)
 
         # also do other validation, like on the round_number
         self.validate_response(response, collaborator_name)
@@ -23,6 +23,61 @@ from openfl.utilities import check_equal, check_is_in
 
 logger = logging.getLogger(__name__)
 
+# Tensors streamed by GetAggregatedModel are packed into messages of about this
+# many bytes
+MODEL_STREAM_CHUNK_SIZE = 32 * 2**20
+
+
+class AggregatedModelPacker:
+    """Pack tensors into GetAggregatedModel responses.
+
+    Attributes:
+        header (aggregator_pb2.MessageHeader): The header of the responses.
+        tensors (list[NamedTensor]): The tensors of the next response.
+    """
+
+    def __init__(self, header):
+        """Initialize the AggregatedModelPacker.
+
+        Args:
+            header (aggregator_pb2.MessageHeader): The header of the responses.
+        """
+        self.header = header
+        self.tensors = []
+        self._size = 0
+
+    def add(self, named_tensor):
+        """Add a tensor to the next response.
+
+        Args:
+            named_tensor (NamedTensor): The tensor.
+
+        Returns:
+            aggregator_pb2.GetAggregatedModelResponse: The pending tensors if
+                they would exceed MODEL_STREAM_CHUNK_SIZE bytes with this
+                one, otherwise None.
+        """
+        response = None
+        tensor_size = named_tensor.ByteSize()
+        if self.tensors and self._size + tensor_size > MODEL_STREAM_CHUNK_SIZE:
+            response = self.flush()
+        self.tensors.append(named_tensor)
+        self._size += tensor_size
+        return response
+
+    def flush(self):
+        """Return a response with the pending tensors.
+
+        Returns:
+            aggregator_pb2.GetAggregatedModelResponse: The response.
+        """
+        response = aggregator_pb2.GetAggregatedModelResponse(
+            header=self.header, tensors=self.tensors
+        )
+        self.tensors = []
+        self._size = 0
+        return response
+
 
 class AggregatorGRPCServer(aggregator_pb2_grpc.AggregatorServicer):
     """GRPC server class for the Aggregator.
@@ -194,8 +249,25 @@ class AggregatorGRPCServer(aggregator_pb2_grpc.AggregatorServicer):
         self.check_request(request)
         collaborator_name = request.header.sender
         tasks, round_number, sleep_time, time_to_quit = self.aggregator.get_tasks(
-            request.header.sender
+            request.header.sender, request.wait_timeout
         )
+        return self.get_tasks_response(
+            collaborator_name, tasks, round_number, sleep_time, time_to_quit
+        )
+
+    def get_tasks_response(self, collaborator_name, tasks, round_number, sleep_time, time_to_quit):
+        """Compose the response to a GetTasks request.
+
+        Args:
+            collaborator_name (str): The name of the collaborator.
+            tasks (list): Tasks returned by the aggregator.
+            round_number (int): Actual round number.
+            sleep_time (int): Sleep time.
+            time_to_quit (bool): Whether it's time to quit.
+
+        Returns:
+            aggregator_pb2.GetTasksResponse: The response to the request.
+        """
         if tasks:
             if isinstance(tasks[0], str):
                 # backward compatibility
@@ -224,6 +296,7 @@ class AggregatorGRPCServer(aggregator_pb2_grpc.AggregatorServicer):
             tasks=tasks_proto,
             sleep_time=sleep_time,
             quit=time_to_quit,
+            rounds_to_train=self.aggregator.rounds_to_train,
         )
 
     def GetAggregatedTensor(self, request, context):  # NOQA:N802
@@ -265,6 +338,57 @@ class AggregatorGRPCServer(aggregator_pb2_grpc.AggregatorServicer):
             tensor=named_tensor,
         )
 
+    def GetAggregatedModel(self, request, context):  # NOQA:N802
+        """Stream a set of aggregated tensors to a collaborator.
+
+        This method handles a request from a collaborator for all the
+        aggregated tensors it needs for a task, so that they can be fetched
+        in a single call instead of one GetAggregatedTensor call per tensor.
+
+        Args:
+            request (aggregator_pb2.GetAggregatedModelRequest): The request
+                from the collaborator.
+            context (grpc.ServicerContext): The context of the request.
+
+        Yields:
+            aggregator_pb2.GetAggregatedModelResponse: The requested tensors,
+                in the order they were requested.
+        """
+        self.validate_collaborator(request, context)
+        self.check_request(request)
+        collaborator_name = request.header.sender
+
+        named_tensors = (
+            self.aggregator.get_aggregated_tensor(
+                collaborator_name,
+                tensor_request.tensor_name,
+                tensor_request.round_number,
+                tensor_request.report,
+                tuple(tensor_request.tags),
+                tensor_request.require_lossless,
+            )
+            for tensor_request in request.tensors
+        )
+        yield from self.get_aggregated_model_responses(collaborator_name, named_tensors)
+
+    def get_aggregated_model_responses(self, collaborator_name, named_tensors):
+        """Pack tensors into GetAggregatedModel responses.
+
+        Args:
+            collaborator_name (str): The name of the collaborator.
+            named_tensors (Iterable[NamedTensor]): The requested tensors.
+
+        Yields:
+            aggregator_pb2.GetAggregatedModelResponse: Responses of about
+                MODEL_STREAM_CHUNK_SIZE bytes.
+        """
+        packer = AggregatedModelPacker(self.get_header(collaborator_name))
+        for named_tensor in named_tensors:
+            response = packer.add(named_tensor)
+            if response is not None:
+                yield response
+        yield packer.flush()
+
     def SendLocalTaskResults(self, request, context):  # NOQA:N802
         """Request a model download from aggregator.
 
@@ -305,6 +429,46 @@ class AggregatorGRPCServer(aggregator_pb2_grpc.AggregatorServicer):
             header=self.get_header(collaborator_name)
         )
 
+    def add_port(self, grpc_server):
+        """Add the port the aggregator is served on to a gRPC server.
+
+        Args:
+            grpc_server (grpc.Server): The gRPC server.
+        """
+        if not self.use_tls:
+            self.logger.warning("gRPC is running on insecure channel with TLS disabled.")
+            port = grpc_server.add_insecure_port(self.uri)
+            self.logger.info("Insecure port: %s", port)
+            return
+
+        with open(self.private_key, "rb") as f:
+            private_key_b = f.read()
+        with open(self.certificate, "rb") as f:
+            certificate_b = f.read()
+        with open(self.root_certificate, "rb") as f:
+            root_certificate_b = f.read()
+
+        if not self.require_client_auth:
+            self.logger.warning("Client-side authentication is disabled.")
+        cert_config = ssl_server_certificate_configuration(
+            ((private_key_b, certificate_b),), root_certificates=root_certificate_b
+        )
+
+        def certificate_configuration_fetcher():
+            root_cert = root_certificate_b
+            if self.root_certificate_refresher_cb is not None:
+                root_cert = self.root_certificate_refresher_cb()
+            return ssl_server_certificate_configuration(
+                ((private_key_b, certificate_b),), root_certificates=root_cert
+            )
+
+        self.server_credentials = dynamic_ssl_server_credentials(
+            cert_config,
+            certificate_configuration_fetcher,
+            require_client_authentication=self.require_client_auth,
+        )
+        grpc_server.add_secure_port(self.uri, self.server_credentials)
+
     def get_server(self):
         """
         Return gRPC server.
@@ -315,43 +479,14 @@ class AggregatorGRPCServer(aggregator_pb2_grpc.AggregatorServicer):
         Returns:
             grpc.Server: The gRPC server.
         """
-        self.server = server(ThreadPoolExecutor(max_workers=cpu_count()), options=channel_options)
+        # Long-polling GetTasks requests hold a thread each, on top of the
+        # ones serving the other requests
+        max_workers = cpu_count() + len(self.aggregator.authorized_cols)
+        self.server = server(ThreadPoolExecutor(max_workers=max_workers), options=channel_options)
 
         aggregator_pb2_grpc.add_AggregatorServicer_to_server(self, self.server)
 
-        if not self.use_tls:
-            self.logger.warning("gRPC is running on insecure channel with TLS disabled.")
-            port = self.server.add_insecure_port(self.uri)
-            self.logger.info("Insecure port: %s", port)
-
-        else:
-            with open(self.private_key, "rb") as f:
-                private_key_b = f.read()
-            with open(self.certificate, "rb") as f:
-                certificate_b = f.read()
-            with open(self.root_certificate, "rb") as f:
-                root_certificate_b = f.read()
-
-            if not self.require_client_auth:
-                self.logger.warning("Client-side authentication is disabled.")
-            cert_config = ssl_server_certificate_configuration(
-                ((private_key_b, certificate_b),), root_certificates=root_certificate_b
-            )
-
-            def certificate_configuration_fetcher():
-                root_cert = root_certificate_b
-                if self.root_certificate_refresher_cb is not None:
-                    root_cert = self.root_certificate_refresher_cb()
-                return ssl_server_certificate_configuration(
-                    ((private_key_b, certificate_b),), root_certificates=root_cert
-                )
-
-            self.server_credentials = dynamic_ssl_server_credentials(
-                cert_config,
-                certificate_configuration_fetcher,
-                require_client_authentication=self.require_client_auth,
-            )
-            self.server.add_secure_port(self.uri, self.server_credentials)
+        self.add_port(self.server)
 
         return self.server
 
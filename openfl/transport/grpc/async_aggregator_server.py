@@ -0,0 +1,350 @@
+# Copyright 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""AsyncAggregatorGRPCServer module."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import cpu_count
+from random import random
+
+from grpc import StatusCode, aio
+
+from openfl.component.aggregator.aggregator import AGGREGATED_TENSOR_TIMEOUT
+from openfl.protocols import aggregator_pb2, aggregator_pb2_grpc, utils
+from openfl.transport.grpc.aggregator_server import AggregatedModelPacker, AggregatorGRPCServer
+from openfl.transport.grpc.grpc_channel_options import channel_options
+
+
+class AsyncAggregatorGRPCServer(AggregatorGRPCServer):
+    """Asyncio gRPC server class for the Aggregator.
+
+    Requests are served on an asyncio event loop instead of a thread per
+    request. Waiting for a tensor that is not aggregated yet does not hold a
+    thread, and the CPU-heavy aggregator work (decoding task results,
+    aggregation, compression) is offloaded to a thread pool, so a large
+    number of collaborators can be connected at once.
+
+    Attributes:
+        executor (ThreadPoolExecutor): The pool running the aggregator calls.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the AsyncAggregatorGRPCServer.
+
+        Takes the same arguments as `AggregatorGRPCServer`.
+        """
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(
+            max_workers=cpu_count(), thread_name_prefix="aggregator_server"
+        )
+
+    async def _run(self, func, *args):
+        """Run a blocking aggregator call on the executor.
+
+        Args:
+            func (Callable): The function to call.
+            *args: Its arguments.
+
+        Returns:
+            The return value of `func`.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    async def validate_collaborator(self, request, context):
+        """Validate the collaborator.
+
+        Args:
+            request (aggregator_pb2.MessageHeader): The request from the
+                collaborator.
+            context (grpc.aio.ServicerContext): The context of the request.
+
+        Raises:
+            grpc.RpcError: If the collaborator or collaborator certificate is
+                not authorized.
+        """
+        if self.use_tls:
+            collaborator_common_name = request.header.sender
+            if self.require_client_auth:
+                common_name = context.auth_context()["x509_common_name"][0].decode("utf-8")
+            else:
+                common_name = collaborator_common_name
+
+            if not self.aggregator.valid_collaborator_cn_and_id(
+                common_name, collaborator_common_name
+            ):
+                # Random delay in authentication failures
+                await asyncio.sleep(5 * random())  # nosec
+                await context.abort(
+                    StatusCode.UNAUTHENTICATED,
+                    f"Invalid collaborator. CN: |{common_name}| "
+                    f"collaborator_common_name: |{collaborator_common_name}|",
+                )
+
+    @staticmethod
+    async def _wait_for_callback(add_callback, remove_callback, timeout):
+        """Wait until a callback registered with the aggregator is called.
+
+        Args:
+            add_callback (Callable): Registers the callback.
+            remove_callback (Callable): Removes the callback if it was not
+                called.
+            timeout (float): Seconds to wait.
+
+        Returns:
+            bool: Whether the callback was called within `timeout` seconds.
+        """
+        loop = asyncio.get_running_loop()
+        called = loop.create_future()
+
+        def callback():
+            loop.call_soon_threadsafe(lambda: called.done() or called.set_result(None))
+
+        add_callback(callback)
+        try:
+            await asyncio.wait_for(called, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            remove_callback(callback)
+
+    async def wait_for_tensor(self, tensor_name, round_number, report, tags):
+        """Wait until the tensor served for a request is aggregated.
+
+        Args:
+            tensor_name (str): Name of the tensor.
+            round_number (int): Actual round number.
+            report (bool): Whether to report.
+            tags (tuple[str, ...]): Tags.
+
+        Raises:
+            ValueError: if the tensor is not aggregated within
+                AGGREGATED_TENSOR_TIMEOUT seconds.
+        """
+        agg_tensor_key = self.aggregator.get_aggregated_tensor_key(
+            tensor_name, round_number, report, tags
+        )
+        tensor_db = self.aggregator.tensor_db
+        if not await self._wait_for_callback(
+            partial(tensor_db.add_tensor_callback, agg_tensor_key),
+            partial(tensor_db.remove_tensor_callback, agg_tensor_key),
+            AGGREGATED_TENSOR_TIMEOUT,
+        ):
+            raise ValueError(f"Aggregator does not have an aggregated tensor for {agg_tensor_key}")
+
+    def is_aggregated(self, tensor_request):
+        """Check whether the tensor served for a request is aggregated.
+
+        Args:
+            tensor_request (aggregator_pb2.TensorRequest): The tensor request.
+
+        Returns:
+            bool: Whether the tensor is in the TensorDB.
+        """
+        agg_tensor_key = self.aggregator.get_aggregated_tensor_key(
+            tensor_request.tensor_name,
+            tensor_request.round_number,
+            tensor_request.report,
+            tuple(tensor_request.tags),
+        )
+        return agg_tensor_key in self.aggregator.tensor_db
+
+    async def get_aggregated_tensor(self, collaborator_name, tensor_request):
+        """Get the NamedTensor for a request once it is aggregated.
+
+        Args:
+            collaborator_name (str): The name of the collaborator.
+            tensor_request (aggregator_pb2.GetAggregatedTensorRequest or
+                aggregator_pb2.TensorRequest): The tensor request.
+
+        Returns:
+            NamedTensor: The aggregated tensor.
+        """
+        tags = tuple(tensor_request.tags)
+        await self.wait_for_tensor(
+            tensor_request.tensor_name, tensor_request.round_number, tensor_request.report, tags
+        )
+        return await self._run(
+            self.aggregator.get_aggregated_tensor,
+            collaborator_name,
+            tensor_request.tensor_name,
+            tensor_request.round_number,
+            tensor_request.report,
+            tags,
+            tensor_request.require_lossless,
+        )
+
+    async def GetTasks(self, request, context):  # NOQA:N802
+        """Request a job from aggregator.
+
+        Args:
+            request (aggregator_pb2.GetTasksRequest): The request from the
+                collaborator.
+            context (grpc.aio.ServicerContext): The context of the request.
+
+        Returns:
+            aggregator_pb2.GetTasksResponse: The response to the request.
+        """
+        await self.validate_collaborator(request, context)
+        self.check_request(request)
+        collaborator_name = request.header.sender
+        tasks, round_number, sleep_time, time_to_quit = await self._run(
+            self.aggregator.get_tasks, collaborator_name
+        )
+        if not tasks and not time_to_quit and request.wait_timeout > 0:
+            # Long polling, see Aggregator.get_tasks
+            await self._wait_for_callback(
+                partial(self.aggregator.add_round_callback, round_number),
+                partial(self.aggregator.remove_round_callback, round_number),
+                request.wait_timeout,
+            )
+            tasks, round_number, sleep_time, time_to_quit = await self._run(
+                self.aggregator.get_tasks, collaborator_name
+            )
+            if not tasks:
+                sleep_time = 0
+        return self.get_tasks_response(
+            collaborator_name, tasks, round_number, sleep_time, time_to_quit
+        )
+
+    async def GetAggregatedTensor(self, request, context):  # NOQA:N802
+        """Request an aggregated tensor from the aggregator.
+
+        Args:
+            request (aggregator_pb2.GetAggregatedTensorRequest): The request
+                from the collaborator.
+            context (grpc.aio.ServicerContext): The context of the request.
+
+        Returns:
+            aggregator_pb2.GetAggregatedTensorResponse: The response to the
+                request.
+        """
+        await self.validate_collaborator(request, context)
+        self.check_request(request)
+        collaborator_name = request.header.sender
+
+        named_tensor = await self.get_aggregated_tensor(collaborator_name, request)
+
+        return aggregator_pb2.GetAggregatedTensorResponse(
+            header=self.get_header(collaborator_name),
+            round_number=request.round_number,
+            tensor=named_tensor,
+        )
+
+    async def GetAggregatedModel(self, request, context):  # NOQA:N802
+        """Stream a set of aggregated tensors to a collaborator.
+
+        Args:
+            request (aggregator_pb2.GetAggregatedModelRequest): The request
+                from the collaborator.
+            context (grpc.aio.ServicerContext): The context of the request.
+
+        Yields:
+            aggregator_pb2.GetAggregatedModelResponse: The requested tensors,
+                in the order they were requested.
+        """
+        await self.validate_collaborator(request, context)
+        self.check_request(request)
+        collaborator_name = request.header.sender
+
+        # The tensors are sent as soon as they are ready: the pending ones are
+        # flushed before waiting for a tensor that is not aggregated yet
+        packer = AggregatedModelPacker(self.get_header(collaborator_name))
+        responses = 0
+        for tensor_request in request.tensors:
+            if packer.tensors and not self.is_aggregated(tensor_request):
+                responses += 1
+                yield packer.flush()
+            named_tensor = await self.get_aggregated_tensor(collaborator_name, tensor_request)
+            response = packer.add(named_tensor)
+            if response is not None:
+                responses += 1
+                yield response
+        if packer.tensors or not responses:
+            yield packer.flush()
+
+    async def SendLocalTaskResults(self, request, context):  # NOQA:N802
+        """Receive the results of a local task from a collaborator.
+
+        Args:
+            request (AsyncIterator[base_pb2.DataStream]): The stream of
+                TaskResults chunks from the collaborator.
+            context (grpc.aio.ServicerContext): The context of the request.
+
+        Returns:
+            aggregator_pb2.SendLocalTaskResultsResponse: The response to the
+                request.
+        """
+        # The chunks are copied into the buffer as they arrive, only the
+        # parsing is offloaded to the executor
+        reader = utils.DataStreamReader()
+        try:
+            async for chunk in request:
+                reader.add(chunk)
+            proto = await self._run(reader.to_proto, aggregator_pb2.TaskResults())
+        except RuntimeError:
+            raise RuntimeError(
+                "Empty stream message, reestablishing connection from client to resume training..."
+            )
+
+        await self.validate_collaborator(proto, context)
+        # all messages get sanity checked
+        self.check_request(proto)
+
+        collaborator_name = proto.header.sender
+        await self._run(
+            self.aggregator.send_local_task_results,
+            collaborator_name,
+            proto.round_number,
+            proto.task_name,
+            proto.data_size,
+            proto.tensors,
+        )
+        return aggregator_pb2.SendLocalTaskResultsResponse(
+            header=self.get_header(collaborator_name)
+        )
+
+    def get_server(self):
+        """Return the asyncio gRPC server.
+
+        Must be called from within the event loop that serves it.
+
+        Returns:
+            grpc.aio.Server: The gRPC server.
+        """
+        self.server = aio.server(options=channel_options)
+
+        aggregator_pb2_grpc.add_AggregatorServicer_to_server(self, self.server)
+
+        self.add_port(self.server)
+
+        return self.server
+
+    async def _serve(self):
+        """Serve requests until all quit jobs have been sent."""
+        self.get_server()
+
+        self.logger.info("Starting Aggregator asyncio gRPC Server")
+        await self.server.start()
+
+        try:
+            while not self.aggregator.all_quit_jobs_sent():
+                await asyncio.sleep(5)
+        finally:
+            await self.server.stop(0)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def serve(self):
+        """Start an aggregator asyncio gRPC service.
+
+        This method starts the gRPC server and handles requests until all quit
+        jobs have been sent.
+        """
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            pass
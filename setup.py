@@ -95,6 +95,10 @@ setup(
         'protobuf>=4.22,<6.0.0',
         'grpcio>=1.56.2,<1.66.0',
     ],
+    extras_require={
+        # The zstd and lz4 codecs of the lossless compression transformer
+        'compression': ['zstandard', 'lz4'],
+    },
     python_requires='>=3.10, <3.13',
     project_urls={
         'Bug Tracker': 'https://github.com/securefederatedai/openfl/issues',
@@ -0,0 +1,183 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Load test of the aggregator gRPC servers.
+
+Many concurrent collaborators first wait for a tensor that the aggregator only
+caches after a delay (as at a round boundary), then fetch the model tensors in
+a loop. Reports the wake-up latency and the sustained request throughput of
+the synchronous and asyncio servers.
+
+    python -m tests.github.test_aggregator_load --collaborators 500 --server both
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from grpc import aio
+
+from openfl.component.aggregator import Aggregator
+from openfl.component.assigner import RandomGroupedAssigner
+from openfl.interface.aggregation_functions import WeightedAverage
+from openfl.protocols import aggregator_pb2, aggregator_pb2_grpc
+from openfl.transport import AggregatorGRPCServer, AsyncAggregatorGRPCServer
+from openfl.transport.grpc.grpc_channel_options import channel_options
+from openfl.utilities import TensorKey
+
+AGGREGATOR_UUID = 'aggregator_load_test'
+FEDERATION_UUID = 'federation_load_test'
+
+
+def create_aggregator(collaborators, tensors, tensor_size):
+    """Create an aggregator holding a random model."""
+    tasks = {'train': {'function': 'train', 'kwargs': {}, 'aggregation_type': WeightedAverage()}}
+    assigner = RandomGroupedAssigner(
+        task_groups=[{'name': 'learning', 'percentage': 1.0, 'tasks': list(tasks)}],
+        tasks=tasks,
+        authorized_cols=collaborators,
+        rounds_to_train=2,
+    )
+    rng = np.random.default_rng(0)
+    model = {
+        f'tensor_{i}': rng.standard_normal(tensor_size).astype(np.float32) for i in range(tensors)
+    }
+    workspace = tempfile.mkdtemp()
+    return Aggregator(
+        AGGREGATOR_UUID,
+        FEDERATION_UUID,
+        collaborators,
+        None,
+        os.path.join(workspace, 'best.pbuf'),
+        os.path.join(workspace, 'last.pbuf'),
+        assigner,
+        rounds_to_train=2,
+        initial_tensor_dict=model,
+        persist_checkpoint=False,
+    ), model
+
+
+def start_sync_server(aggregator, port):
+    """Start the synchronous server and return it."""
+    server = AggregatorGRPCServer(aggregator=aggregator, agg_port=port, use_tls=False)
+    server.get_server().start()
+    return server
+
+
+async def start_async_server(aggregator, port):
+    """Start the asyncio server on the running event loop and return it.
+
+    gRPC asyncio objects are bound to one event loop, so the server shares
+    the loop of the collaborators.
+    """
+    server = AsyncAggregatorGRPCServer(aggregator=aggregator, agg_port=port, use_tls=False)
+    server.get_server()
+    await server.server.start()
+    return server
+
+
+def tensor_request(collaborator, tensor_name, round_number):
+    """Compose a GetAggregatedTensor request for a model tensor."""
+    return aggregator_pb2.GetAggregatedTensorRequest(
+        header=aggregator_pb2.MessageHeader(
+            sender=collaborator, receiver=AGGREGATOR_UUID, federation_uuid=FEDERATION_UUID
+        ),
+        tensor_name=tensor_name,
+        round_number=round_number,
+        tags=['model'],
+        require_lossless=True,
+    )
+
+
+async def collaborator(stub, name, tensor_names, deadline, released):
+    """Wait for the next round model, then fetch tensors until the deadline."""
+    await stub.GetAggregatedTensor(tensor_request(name, tensor_names[0], 1))
+    wake_up_latency = time.monotonic() - released[0]
+    requests = 0
+    while time.monotonic() < deadline:
+        tensor_name = tensor_names[requests % len(tensor_names)]
+        await stub.GetAggregatedTensor(tensor_request(name, tensor_name, 0))
+        requests += 1
+    return wake_up_latency, requests
+
+
+async def run_collaborators(server_kind, port, collaborators, aggregator, model, args):
+    """Run all collaborators concurrently and collect their statistics."""
+    if server_kind == 'sync':
+        server = start_sync_server(aggregator, port)
+    else:
+        server = await start_async_server(aggregator, port)
+
+    tensor_names = list(model)
+    channels = [
+        aio.insecure_channel(f'localhost:{port}', options=channel_options)
+        for _ in range(args.channels)
+    ]
+    stubs = [aggregator_pb2_grpc.AggregatorStub(channel) for channel in channels]
+    released = [float('inf')]
+    deadline = time.monotonic() + args.delay + args.duration
+    tasks = [
+        asyncio.create_task(
+            collaborator(stubs[i % len(stubs)], name, tensor_names, deadline, released)
+        )
+        for i, name in enumerate(collaborators)
+    ]
+
+    # Release the tensor every collaborator is waiting for
+    await asyncio.sleep(args.delay)
+    released[0] = time.monotonic()
+    tensor_key = TensorKey(tensor_names[0], AGGREGATOR_UUID, 1, False, ('model',))
+    aggregator.tensor_db.cache_tensor({tensor_key: model[tensor_names[0]]})
+
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for channel in channels:
+            await channel.close()
+        if server_kind == 'sync':
+            server.server.stop(0)
+        else:
+            await server.server.stop(0)
+            server.executor.shutdown()
+
+
+def run(server_kind, args, port):
+    """Run the load test against one server."""
+    collaborators = [f'col{i}' for i in range(args.collaborators)]
+    aggregator, model = create_aggregator(collaborators, args.tensors, args.tensor_size)
+    results = asyncio.run(
+        run_collaborators(server_kind, port, collaborators, aggregator, model, args)
+    )
+
+    latencies = sorted(latency for latency, _ in results)
+    requests = sum(count for _, count in results)
+    print(
+        f'{server_kind:>5} server, {args.collaborators} collaborators: '
+        f'wake-up latency p50 {statistics.median(latencies) * 1000:.0f} ms, '
+        f'max {latencies[-1] * 1000:.0f} ms; '
+        f'throughput {requests / args.duration:.0f} requests/s'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--server', choices=['sync', 'async', 'both'], default='both')
+    parser.add_argument('--collaborators', type=int, default=200)
+    parser.add_argument('--channels', type=int, default=16)
+    parser.add_argument('--tensors', type=int, default=10)
+    parser.add_argument('--tensor-size', type=int, default=10000)
+    parser.add_argument('--delay', type=float, default=2.0)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=50151)
+    args = parser.parse_args()
+
+    servers = ['sync', 'async'] if args.server == 'both' else [args.server]
+    for i, server_kind in enumerate(servers):
+        run(server_kind, args, args.port + i)
+
+
+if __name__ == '__main__':
+    main()
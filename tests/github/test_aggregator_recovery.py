@@ -0,0 +1,122 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark of the aggregator recovery time.
+
+Collaborators send their task results to an aggregator with a persistent
+checkpoint, which is then restarted mid-round. Reports the time to recover
+the round by restoring the decoded task results, and by replaying the task
+results through the codec pipeline, against the number of collaborators.
+
+    python -m tests.github.test_aggregator_recovery --collaborators 10 50 100
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+from openfl.component.aggregator import Aggregator
+from openfl.component.assigner import RandomGroupedAssigner
+from openfl.databases import PersistentTensorDB
+from openfl.interface.aggregation_functions import WeightedAverage
+from openfl.pipelines import NoCompressionPipeline, TensorCodec
+from openfl.protocols import utils
+from openfl.utilities import TensorKey
+
+AGGREGATOR_UUID = 'aggregator_recovery_test'
+
+
+def create_aggregator(collaborators, workspace, model):
+    """Create an aggregator with a persistent checkpoint in the workspace."""
+    tasks = {'train': {'function': 'train', 'kwargs': {}, 'aggregation_type': WeightedAverage()}}
+    assigner = RandomGroupedAssigner(
+        task_groups=[{'name': 'learning', 'percentage': 1.0, 'tasks': list(tasks)}],
+        tasks=tasks,
+        authorized_cols=collaborators,
+        rounds_to_train=2,
+    )
+    return Aggregator(
+        AGGREGATOR_UUID,
+        'federation_recovery_test',
+        collaborators,
+        None,
+        os.path.join(workspace, 'best.pbuf'),
+        os.path.join(workspace, 'last.pbuf'),
+        assigner,
+        rounds_to_train=2,
+        initial_tensor_dict=dict(model),
+        persistent_db_path=os.path.join(workspace, 'tensor.db'),
+    )
+
+
+def trained_named_tensors(collaborator, model, rng):
+    """Compose the task results of a collaborator, sent as model deltas."""
+    codec = TensorCodec(NoCompressionPipeline())
+    named_tensors = []
+    for tensor_name, nparray in model.items():
+        trained = nparray + rng.standard_normal(nparray.shape).astype(np.float32)
+        tensor_key = TensorKey(tensor_name, collaborator, 0, False, ('trained',))
+        delta_key, delta = codec.generate_delta(tensor_key, trained, nparray)
+        compressed_key, compressed, metadata = codec.compress(delta_key, delta, lossless=True)
+        named_tensors.append(
+            utils.construct_named_tensor(compressed_key, compressed, metadata, lossless=True)
+        )
+    return named_tensors
+
+
+def run(num_collaborators, args):
+    """Return the recovery time in seconds, restoring and replaying task results."""
+    # One collaborator does not report, so the round is still running
+    collaborators = [f'col{i}' for i in range(num_collaborators + 1)]
+    rng = np.random.default_rng(0)
+    model = {
+        f'tensor_{i}': rng.standard_normal(args.tensor_size).astype(np.float32)
+        for i in range(args.tensors)
+    }
+    workspace = tempfile.mkdtemp()
+    aggregator = create_aggregator(collaborators, workspace, model)
+    for collaborator in collaborators[:-1]:
+        named_tensors = trained_named_tensors(collaborator, model, rng)
+        aggregator.send_local_task_results(collaborator, 0, 'train', 10, named_tensors)
+    aggregator.persistent_db.close()
+
+    start = time.monotonic()
+    aggregator = create_aggregator(collaborators, workspace, model)
+    restore_time = time.monotonic() - start
+    assert len(aggregator.collaborators_done) == num_collaborators
+    aggregator.persistent_db.close()
+
+    # Without the decoded tensors, all task results are replayed
+    conn = sqlite3.connect(os.path.join(workspace, 'tensor.db'))
+    conn.execute(f'DELETE FROM {PersistentTensorDB.DECODED_TASK_RESULT_TENSORS_TABLE}')
+    conn.commit()
+    conn.close()
+    start = time.monotonic()
+    aggregator = create_aggregator(collaborators, workspace, model)
+    replay_time = time.monotonic() - start
+    assert len(aggregator.collaborators_done) == num_collaborators
+    aggregator.persistent_db.close()
+
+    return restore_time, replay_time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--collaborators', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--tensors', type=int, default=10)
+    parser.add_argument('--tensor-size', type=int, default=100000)
+    args = parser.parse_args()
+
+    for num_collaborators in args.collaborators:
+        restore_time, replay_time = run(num_collaborators, args)
+        print(
+            f'{num_collaborators:>4} collaborators: restore decoded task results '
+            f'{restore_time:.2f} s, replay task results {replay_time:.2f} s'
+        )
+
+
+if __name__ == '__main__':
+    main()
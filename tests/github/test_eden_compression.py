@@ -0,0 +1,61 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark of the Eden compression engines.
+
+Compresses and decompresses random model deltas with the NumPy engine of
+the Eden pipeline, and with the torch engine if torch is installed. Reports
+the throughput of compression and decompression against the layer size.
+
+    python -m tests.github.test_eden_compression --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import time
+from importlib import util
+
+import numpy as np
+
+from openfl.pipelines import EdenPipeline
+
+
+def run(pipeline, data, repeats):
+    """Return the compression and decompression times."""
+    compress_time = decompress_time = 0.0
+    for _ in range(repeats):
+        start = time.monotonic()
+        compressed, metadata = pipeline.forward(data)
+        compress_time += time.monotonic() - start
+
+        start = time.monotonic()
+        restored = pipeline.backward(compressed, metadata)
+        decompress_time += time.monotonic() - start
+    assert restored.shape == data.shape
+    return compress_time / repeats, decompress_time / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--n-bits', type=int, default=8)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    engines = ['numpy']
+    if util.find_spec('torch') is not None:
+        engines.append('torch')
+    pipelines = {engine: EdenPipeline(n_bits=args.n_bits, engine=engine) for engine in engines}
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        data = rng.standard_normal(size).astype(np.float32)
+        for engine, pipeline in pipelines.items():
+            compress_time, decompress_time = run(pipeline, data, args.repeats)
+            megabytes = data.nbytes / 2**20
+            print(
+                f'{size:>10} elements, {engine:>5}: '
+                f'compress {megabytes / compress_time:8.1f} MB/s, '
+                f'decompress {megabytes / decompress_time:8.1f} MB/s'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark of the k-means quantization of a layer.
+
+Quantizes random layers with scikit-learn KMeans, as the KC and SKC pipelines
+used to, and with the one-dimensional k-means they use now. Reports the
+latency per layer and the mean squared quantization error against the layer
+size.
+
+    python -m tests.github.test_kmeans_quantizer --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn import cluster
+
+from openfl.pipelines import kmeans
+
+
+def sklearn_kmeans(data, args):
+    """Return the quantized data, clustered with scikit-learn KMeans."""
+    k_means = cluster.KMeans(n_clusters=args.n_clusters, n_init=args.n_clusters)
+    k_means.fit(data.reshape((-1, 1)))
+    return k_means.cluster_centers_.squeeze()[k_means.labels_]
+
+
+def kmeans_1d(data, args):
+    """Return the quantized data, clustered with the one-dimensional k-means."""
+    centers, labels = kmeans.kmeans_1d(data, args.n_clusters, args.sample_size, args.max_iter)
+    return centers[labels]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--n-clusters', type=int, default=6)
+    parser.add_argument('--sample-size', type=int, default=kmeans.DEFAULT_SAMPLE_SIZE)
+    parser.add_argument('--max-iter', type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        data = rng.standard_normal(size).astype(np.float32)
+        for name, quantize in [('sklearn', sklearn_kmeans), ('kmeans_1d', kmeans_1d)]:
+            start = time.monotonic()
+            quantized = quantize(data, args)
+            latency = time.monotonic() - start
+            error = np.mean((quantized - data) ** 2)
+            print(f'{size:>10} elements, {name:>9}: {latency * 1000:9.1f} ms, mse {error:.5f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark of the lossless compression of a layer.
+
+Compresses random model deltas with gzip, as the KC, SKC and STC pipelines
+used to, and with the chunked compression of each installed codec, with and
+without byte shuffling. Reports the compression ratio and the throughput of
+compression and decompression.
+
+    python -m tests.github.test_lossless_compression --size 10000000 --n-threads 8
+"""
+
+import argparse
+import gzip as gz
+import time
+from importlib import util
+
+import numpy as np
+
+from openfl.pipelines.lossless import ChunkedCompressionTransformer
+
+
+def report(name, data, compress, decompress):
+    """Print the compression ratio and throughput of a codec."""
+    start = time.monotonic()
+    compressed = compress(data)
+    compress_time = time.monotonic() - start
+
+    start = time.monotonic()
+    restored = decompress(compressed)
+    decompress_time = time.monotonic() - start
+    assert np.array_equal(restored, data)
+
+    megabytes = data.nbytes / 2**20
+    print(
+        f'{name:>14}: ratio {data.nbytes / len(compressed[0]):6.3f}, '
+        f'compress {megabytes / compress_time:8.1f} MB/s, '
+        f'decompress {megabytes / decompress_time:8.1f} MB/s'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=10000000)
+    parser.add_argument('--n-threads', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1 << 20)
+    args = parser.parse_args()
+
+    data = (np.random.default_rng(0).standard_normal(args.size) * 0.01).astype(np.float32)
+    report(
+        'gzip',
+        data,
+        lambda data: (gz.compress(data.tobytes()),),
+        lambda compressed: np.frombuffer(gz.decompress(compressed[0]), dtype=np.float32),
+    )
+
+    codecs = ['zlib']
+    if util.find_spec('zstandard') is not None:
+        codecs.append('zstd')
+    if util.find_spec('lz4') is not None:
+        codecs.append('lz4')
+    for codec in codecs:
+        for shuffle in [False, True]:
+            t = ChunkedCompressionTransformer(
+                codec, chunk_size=args.chunk_size, shuffle=shuffle, n_threads=args.n_threads
+            )
+            name = f'{codec}{"+shuffle" if shuffle else ""}'
+            report(name, data, t.forward, lambda compressed: t.backward(*compressed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark of the memory used to exchange the state of a PyTorch model.
+
+Gets the tensor dict of a model trained with Adam, including the optimizer
+state, and sets it back, as a collaborator does every round. Each way of
+doing it runs in its own process, which reports its peak RSS above the RSS
+of the trained model. 'copy' reproduces the deep copies the task runner used
+to make, 'runner' is PyTorchTaskRunner as it is.
+
+    python -m tests.github.test_pytorch_state_memory --n-params 100000000
+"""
+
+import argparse
+import multiprocessing
+import threading
+from copy import deepcopy
+from unittest import mock
+
+import psutil
+import torch
+
+from openfl.federated.task import runner_pt
+
+
+def copy_get_tensor_dict(model):
+    """Return the tensor dict of a model with the deep copies of before."""
+    state = deepcopy(model.state_dict())
+    state = {k: v.cpu().numpy() for k, v in state.items()}
+    opt_state_dict = deepcopy(model.optimizer.state_dict())
+    return {**state, **runner_pt._derive_opt_state_dict(opt_state_dict)}
+
+
+def copy_set_tensor_dict(model, tensor_dict):
+    """Set the tensor dict of a model with the copies of before."""
+    new_state = {k: torch.tensor(tensor_dict.pop(k)) for k in model.state_dict()}
+    model.load_state_dict(new_state)
+    if tensor_dict.pop('__opt_state_needed') == 'true':
+        runner_pt._set_optimizer_state(model.optimizer, 'cpu', tensor_dict)
+
+
+def exchange(mode, n_params, queue):
+    """Exchange the state of a model and report the peak RSS increase."""
+    layer_size = 1000
+    model = runner_pt.PyTorchTaskRunner(device='cpu', data_loader=mock.Mock())
+    model.layers = torch.nn.Sequential(
+        *[torch.nn.Linear(layer_size, layer_size) for _ in range(n_params // layer_size**2)]
+    )
+    model.optimizer = torch.optim.Adam(model.parameters())
+    model.layers(torch.ones(1, layer_size)).sum().backward()
+    model.optimizer.step()
+
+    process = psutil.Process()
+    baseline = process.memory_info().rss
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.wait(0.001):
+            peak = max(peak, process.memory_info().rss)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    if mode == 'copy':
+        tensor_dict = copy_get_tensor_dict(model)
+        copy_set_tensor_dict(model, tensor_dict)
+    else:
+        tensor_dict = model.get_tensor_dict(with_opt_vars=True)
+        model.set_tensor_dict(tensor_dict, with_opt_vars=True)
+    done.set()
+    sampler.join()
+    queue.put(max(peak, process.memory_info().rss) - baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n-params', type=int, default=100000000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    model_megabytes = args.n_params * 4 / 2**20
+    print(f'{args.n_params} parameters, {model_megabytes:.0f} MB of float32 weights')
+    for mode in ['copy', 'runner']:
+        queue = context.Queue()
+        process = context.Process(target=exchange, args=(mode, args.n_params, queue))
+        process.start()
+        peak = queue.get()
+        process.join()
+        print(
+            f'{mode:>6}: peak RSS increase {peak / 2**20:8.0f} MB, '
+            f'{peak / 2**20 / model_megabytes:4.1f} model copies'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Benchmark of the STC and SKC pipelines.
+
+Compresses random model deltas with the pipelines, which pass on the values
+kept by the top-k sparsification and their indices, and with the reference
+pipelines of the deprecated transformers, which sort the whole tensor and pass
+on a dense array with zeros in place of the values dropped, compressed with
+GZIP. Reports the throughput of compression and decompression, and the ratio
+of the tensor size to the size of the serialized NamedTensor.
+
+    python -m tests.github.test_sparsity_compression --sizes 100000 1000000 10000000
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from openfl.pipelines import SKCPipeline, STCPipeline, skc_pipeline, stc_pipeline
+from openfl.pipelines.pipeline import TransformationPipeline
+from openfl.protocols import utils
+from openfl.utilities import TensorKey
+
+TENSOR_KEY = TensorKey('tensor', 'col1', 0, False, ('trained', 'delta', 'lossy_compressed'))
+
+
+def run(pipeline, data, repeats):
+    """Return the compression and decompression times, and the compressed size."""
+    compress_time = decompress_time = 0.0
+    for _ in range(repeats):
+        start = time.monotonic()
+        compressed, metadata = pipeline.forward(data)
+        named_tensor = utils.construct_named_tensor(TENSOR_KEY, compressed, metadata, False)
+        compress_time += time.monotonic() - start
+
+        start = time.monotonic()
+        metadata = [
+            {
+                'int_to_float': proto.int_to_float,
+                'int_list': proto.int_list,
+                'bool_list': proto.bool_list,
+            }
+            for proto in named_tensor.transformer_metadata
+        ]
+        recovered = pipeline.backward(named_tensor.data_bytes, metadata)
+        decompress_time += time.monotonic() - start
+    assert recovered.shape == data.shape
+    return compress_time / repeats, decompress_time / repeats, named_tensor.ByteSize()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--p-sparsity', type=float, default=0.01)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        pipelines = {
+            'STC argsort': TransformationPipeline(
+                [
+                    stc_pipeline.SparsityTransformer(args.p_sparsity),
+                    stc_pipeline.TernaryTransformer(),
+                    stc_pipeline.GZIPTransformer(),
+                ]
+            ),
+            'STC': STCPipeline(p_sparsity=args.p_sparsity),
+            'SKC argsort': TransformationPipeline(
+                [
+                    skc_pipeline.SparsityTransformer(args.p_sparsity),
+                    skc_pipeline.KmeansTransformer(),
+                    skc_pipeline.GZIPTransformer(),
+                ]
+            ),
+            'SKC': SKCPipeline(p_sparsity=args.p_sparsity),
+        }
+    rng = np.random.default_rng(0)
+    for size in args.sizes:
+        data = rng.standard_normal(size).astype(np.float32)
+        for name, pipeline in pipelines.items():
+            compress_time, decompress_time, compressed_size = run(pipeline, data, args.repeats)
+            megabytes = data.nbytes / 2**20
+            print(
+                f'{size:>10} elements, {name:>12}: '
+                f'compress {megabytes / compress_time:8.1f} MB/s, '
+                f'decompress {megabytes / decompress_time:8.1f} MB/s, '
+                f'ratio {data.nbytes / compressed_size:6.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
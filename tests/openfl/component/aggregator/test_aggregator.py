@@ -2,14 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 """Aggregator tests module."""
 
+from concurrent.futures import Future
+from threading import Event, Timer
 from unittest import mock
 
+import numpy as np
 import pytest
 
 from openfl.component import aggregator
 from openfl.component.assigner import Assigner
+from openfl.interface.aggregation_functions import WeightedAverage
 from openfl.protocols import base_pb2
-from openfl.utilities import TaskResultKey
+from openfl.utilities import TaskResultKey, TensorKey
 
 
 @pytest.fixture
@@ -41,19 +45,30 @@ def assigner():
 
 
 @pytest.fixture
-def agg(mocker, model, assigner):
-    """Initialize the aggregator."""
+def make_aggregator(mocker, model, assigner):
+    """Return a function initializing an aggregator with some settings overridden."""
     mocker.patch('openfl.protocols.utils.load_proto', return_value=model)
-    agg = aggregator.Aggregator(
-        'some_uuid',
-        'federation_uuid',
-        ['col1', 'col2'],
-        'init_state_path',
-        'best_state_path',
-        'last_state_path',
-        assigner,
-        )
-    return agg
+
+    def make(**overrides):
+        settings = {
+            'aggregator_uuid': 'some_uuid',
+            'federation_uuid': 'federation_uuid',
+            'authorized_cols': ['col1', 'col2'],
+            'init_state_path': 'init_state_path',
+            'best_state_path': 'best_state_path',
+            'last_state_path': 'last_state_path',
+            'assigner': assigner,
+        }
+        settings.update(overrides)
+        return aggregator.Aggregator(**settings)
+
+    return make
+
+
+@pytest.fixture
+def agg(make_aggregator):
+    """Initialize the aggregator."""
+    return make_aggregator()
 
 @pytest.mark.parametrize(
     'cert_common_name,collaborator_common_name,authorized_cols,single_cccn,expected_is_valid', [
@@ -135,8 +150,37 @@ def test_get_tasks(agg, col_name, tasks, time_to_quit,
     assert (tasks, sleep_time, time_to_quit) == (exp_tasks, exp_sleep_time, exp_time_to_quit)
 
 
-def test_get_aggregated_tensor(agg):
+def test_get_tasks_long_polling(agg):
+    """Test that get_tasks waits for the tasks of the next round."""
+    agg.assigner.get_tasks_for_collaborator = mock.Mock(
+        side_effect=lambda col_name, round_number: ['task_name'] if round_number else [])
+
+    def end_round():
+        agg.round_number += 1
+        agg._call_round_callbacks()
+
+    timer = Timer(0.1, end_round)
+    timer.start()
+    tasks, round_number, sleep_time, time_to_quit = agg.get_tasks('col1', wait_timeout=10)
+    timer.join()
+
+    assert (tasks, round_number, sleep_time, time_to_quit) == (['task_name'], 1, 0, False)
+    assert agg._round_callbacks == []
+
+
+def test_get_tasks_long_polling_timeout(agg):
+    """Test that get_tasks returns without tasks when the wait times out."""
+    agg.assigner.get_tasks_for_collaborator = mock.Mock(return_value=[])
+
+    tasks, round_number, sleep_time, time_to_quit = agg.get_tasks('col1', wait_timeout=0.01)
+
+    assert (tasks, round_number, sleep_time, time_to_quit) == (None, 0, 0, False)
+    assert agg._round_callbacks == []
+
+
+def test_get_aggregated_tensor(mocker, agg):
     """Test that test_get_tasks is failed without a correspond data."""
+    mocker.patch('openfl.component.aggregator.aggregator.AGGREGATED_TENSOR_TIMEOUT', 0.1)
     collaborator_name = 'col1'
     tensor_name = 'test_tensor_name'
     require_lossless = False
@@ -148,6 +192,54 @@ def test_get_aggregated_tensor(agg):
             collaborator_name, tensor_name, round_number, report, tags, require_lossless)
 
 
+def test_get_aggregated_tensor_cached(agg):
+    """Test that the NamedTensor is built once and served from the cache."""
+    tensor_key = TensorKey('tensor_name', 'some_uuid', 0, False, ('model',))
+    agg.tensor_db.cache_tensor({tensor_key: np.arange(4, dtype=np.float32)})
+    build = mock.Mock(wraps=agg._nparray_to_named_tensor)
+    agg._nparray_to_named_tensor = build
+
+    first = agg.get_aggregated_tensor('col1', 'tensor_name', 0, False, ('model',), True)
+    second = agg.get_aggregated_tensor('col2', 'tensor_name', 0, False, ('model',), True)
+
+    assert first is second
+    build.assert_called_once()
+
+    agg.tensor_db.cache_tensor({tensor_key: np.ones(4, dtype=np.float32)})
+    agg.get_aggregated_tensor('col1', 'tensor_name', 0, False, ('model',), True)
+    assert build.call_count == 2
+
+
+def test_get_aggregated_tensor_waits(agg):
+    """Test that a request for a tensor that is not aggregated yet waits for it."""
+    tensor_key = TensorKey('tensor_name', 'some_uuid', 1, False, ('model',))
+    timer = Timer(
+        0.1, agg.tensor_db.cache_tensor, args=({tensor_key: np.ones(2, dtype=np.float32)},))
+    timer.start()
+
+    named_tensor = agg.get_aggregated_tensor('col1', 'tensor_name', 1, False, ('model',), True)
+    timer.join()
+
+    assert named_tensor.name == 'tensor_name'
+
+
+def test_get_aggregated_delta_after_clean_up(agg):
+    """Test that the aggregated delta is served once the base model is cleaned up."""
+    base_model = np.zeros(4, dtype=np.float32)
+    agg.tensor_db.cache_tensor(
+        {TensorKey('tensor_name', 'some_uuid', 0, False, ('model',)): base_model}
+    )
+    agg._prepare_trained('tensor_name', 'some_uuid', 0, False, base_model + 1)
+    agg.tensor_db.clean_up(1)
+
+    named_tensor = agg.get_aggregated_tensor(
+        'col1', 'tensor_name', 1, False, ('aggregated', 'delta'), True
+    )
+
+    assert 'delta' in named_tensor.tags
+    assert named_tensor.round_number == 1
+
+
 def test_collaborator_task_completed_none(agg):
     """Test that returns False if there are not collaborator tasks results."""
     round_num = 0
@@ -168,3 +260,167 @@ def test_collaborator_task_completed_true(agg):
         col1, task_name, round_num)
 
     assert is_completed is True
+
+
+@pytest.fixture
+def incremental_agg(make_aggregator):
+    """Initialize the aggregator in incremental aggregation mode."""
+    return make_aggregator(persist_checkpoint=False, incremental_aggregation=True)
+
+
+def test_collaborator_task_received_pending(agg):
+    """Test that pending task results count as received but not completed."""
+    task_key = TaskResultKey('task_name', 'col1', 0)
+    agg._pending_task_results = {task_key: Future()}
+
+    assert agg._collaborator_task_received('col1', 'task_name', 0) is True
+    assert agg._collaborator_task_completed('col1', 'task_name', 0) is False
+    agg._pending_task_results = {}
+
+
+def test_process_task_results_incremental(incremental_agg):
+    """Test that task results are folded on the worker pool in incremental mode."""
+    agg = incremental_agg
+    agg.assigner.get_tasks_for_collaborator = mock.Mock(return_value=['train'])
+    agg.assigner.get_aggregation_type_for_task = mock.Mock(return_value=WeightedAverage())
+    agg._end_of_round_with_stragglers_check = mock.Mock()
+    tensor_key = TensorKey('tensor_name', 'some_uuid', 0, False, ('col1', 'trained'))
+    agg._process_named_tensor = mock.Mock(return_value=(tensor_key, np.ones(2)))
+
+    agg.process_task_results('col1', 0, 'train', 10, [mock.Mock()])
+    agg._wait_for_pending_task_results()
+
+    task_key = TaskResultKey('train', 'col1', 0)
+    assert agg.collaborator_tasks_results[task_key] == [tensor_key]
+    assert agg._pending_task_results == {}
+    assert agg.collaborators_done == ['col1']
+    agg._end_of_round_with_stragglers_check.assert_called_once()
+
+
+def test_send_local_task_results_incremental_error(incremental_agg):
+    """Test that task results that fail to be folded are reported and accepted again."""
+    agg = incremental_agg
+    agg.assigner.get_tasks_for_collaborator = mock.Mock(return_value=['train'])
+    agg.assigner.get_aggregation_type_for_task = mock.Mock(return_value=WeightedAverage())
+    agg._end_of_round_with_stragglers_check = mock.Mock()
+    tensor_key = TensorKey('tensor_name', 'some_uuid', 0, False, ('col1', 'trained'))
+    agg._process_named_tensor = mock.Mock(
+        side_effect=[ValueError('corrupted tensor'), (tensor_key, np.ones(2))])
+
+    with pytest.raises(ValueError):
+        agg.send_local_task_results('col1', 0, 'train', 10, [mock.Mock()])
+    assert agg._collaborator_task_received('col1', 'train', 0) is False
+
+    agg.send_local_task_results('col1', 0, 'train', 10, [mock.Mock()])
+
+    assert agg._collaborator_task_completed('col1', 'train', 0) is True
+    assert agg.collaborators_done == ['col1']
+
+
+def test_recover_decoded_task_results(mocker, make_aggregator, assigner, tmp_path):
+    """Test that recovery restores decoded task results without decoding them again."""
+    assigner.get_tasks_for_collaborator = mock.Mock(return_value=['train'])
+    assigner.get_aggregation_type_for_task = mock.Mock(return_value=WeightedAverage())
+
+    def create_aggregator():
+        return make_aggregator(
+            persistent_db_path=str(tmp_path / 'tensor.db'), persist_decoded_task_results=True
+        )
+
+    agg = create_aggregator()
+    tensor_key = TensorKey('tensor_name', 'some_uuid', 0, False, ('col1', 'trained'))
+    agg._process_named_tensor = mock.Mock(return_value=(tensor_key, np.arange(4.)))
+    agg.send_local_task_results('col1', 0, 'train', 10, [base_pb2.NamedTensor()])
+    agg.persistent_db.close()
+
+    process_named_tensor = mocker.patch.object(aggregator.Aggregator, '_process_named_tensor')
+    agg = create_aggregator()
+
+    process_named_tensor.assert_not_called()
+    task_key = TaskResultKey('train', 'col1', 0)
+    assert agg.collaborator_tasks_results[task_key] == [tensor_key]
+    assert agg.collaborator_task_weight[task_key] == 10
+    assert agg.collaborators_done == ['col1']
+    np.testing.assert_array_equal(agg.tensor_db.get_tensor_from_cache(tensor_key), np.arange(4.))
+    agg.persistent_db.close()
+
+
+def test_decoded_task_results_not_persisted(make_aggregator, assigner, tmp_path):
+    """Test that the decoded task results are not persisted by default."""
+    assigner.get_tasks_for_collaborator = mock.Mock(return_value=['train'])
+    assigner.get_aggregation_type_for_task = mock.Mock(return_value=WeightedAverage())
+    agg = make_aggregator(persistent_db_path=str(tmp_path / 'tensor.db'))
+    tensor_key = TensorKey('tensor_name', 'some_uuid', 0, False, ('col1', 'trained'))
+    agg._process_named_tensor = mock.Mock(return_value=(tensor_key, np.arange(4.)))
+
+    agg.send_local_task_results('col1', 0, 'train', 10, [base_pb2.NamedTensor()])
+
+    assert agg.persistent_db.load_decoded_task_results() == {}
+    assert len(agg.persistent_db.list_task_results()) == 1
+    agg.persistent_db.close()
+
+
+def test_unknown_aggregation_executor(make_aggregator):
+    """Test that an unknown aggregation executor is rejected."""
+    with pytest.raises(ValueError):
+        make_aggregator(persist_checkpoint=False, aggregation_executor='fork')
+
+
+def test_compute_task_metrics_parallel(make_aggregator):
+    """Test that tensors aggregated in parallel are reported in order."""
+    agg = make_aggregator(persist_checkpoint=False, aggregation_workers=4)
+    agg.assigner.get_collaborators_for_task = mock.Mock(return_value=['col1', 'col2'])
+    agg.assigner.get_aggregation_type_for_task = mock.Mock(return_value=WeightedAverage())
+    agg._prepare_trained = mock.Mock()
+    agg.collaborators_done = ['col1', 'col2']
+
+    metric_names = [f'metric_{i}' for i in range(8)]
+    for col, data_size, value in [('col1', 1, 1.0), ('col2', 3, 3.0)]:
+        task_key = TaskResultKey('validate', col, 0)
+        agg.collaborator_task_weight[task_key] = data_size
+        agg.collaborator_tasks_results[task_key] = []
+        for i, name in enumerate(metric_names):
+            tensor_key = TensorKey(name, 'some_uuid', 0, True, (col, 'metric'))
+            agg.tensor_db.cache_tensor({tensor_key: np.array(value * i)})
+            agg.collaborator_tasks_results[task_key].append(tensor_key)
+    trained_key = TensorKey('weights', 'some_uuid', 0, False, ('col1', 'trained'))
+    agg.tensor_db.cache_tensor({
+        trained_key: np.ones(2),
+        trained_key._replace(tags=('col2', 'trained')): np.ones(2),
+    })
+    agg.collaborator_tasks_results[TaskResultKey('validate', 'col1', 0)].append(trained_key)
+
+    metrics = agg._compute_validation_related_task_metrics('validate')
+
+    assert list(metrics) == [f'aggregator/validate/{name}' for name in metric_names]
+    assert list(metrics.values()) == [2.5 * i for i in range(8)]
+    agg._prepare_trained.assert_called_once()
+    agg.stop()
+
+
+def test_save_model_in_background(mocker, make_aggregator, tmp_path):
+    """Test that the model is taken right away and written in the background."""
+    agg = make_aggregator(
+        best_state_path=str(tmp_path / 'best.pbuf'),
+        last_state_path=str(tmp_path / 'last.pbuf'),
+        persistent_db_path=str(tmp_path / 'tensor.db'),
+    )
+    tensor_key = TensorKey('test-tensor-name', 'some_uuid', 1, False, ('model',))
+    agg.tensor_db.cache_tensor({tensor_key: np.arange(4.)})
+    agg.persistent_db.save_task_results('col1', 1, 'train', 10, [b'tensor'])
+    agg.best_model_score = 0.5
+    written = Event()
+    dump_proto = mocker.patch(
+        'openfl.protocols.utils.dump_proto', side_effect=lambda *args: written.wait(10)
+    )
+
+    agg._save_model(1, agg.last_state_path)
+
+    np.testing.assert_array_equal(agg.last_tensor_dict['test-tensor-name'], np.arange(4.))
+    written.set()
+    agg._wait_for_checkpoints()
+    dump_proto.assert_called_once_with(agg.model, agg.last_state_path)
+    assert agg.model.tensors[0].round_number == 1
+    assert agg.persistent_db.is_task_table_empty()
+    agg.stop()
+    agg.persistent_db.close()
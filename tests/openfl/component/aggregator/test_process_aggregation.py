@@ -0,0 +1,64 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Process pool aggregation tests module."""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pytest
+
+from openfl.component.aggregator.process_aggregation import ProcessPoolAggregation
+from openfl.databases import TensorDB
+from openfl.interface.aggregation_functions import AggregationFunction, Median
+from openfl.utilities import LocalTensor, TensorKey
+
+
+@pytest.fixture(scope='module')
+def executor():
+    """Initialize the process pool."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        yield executor
+
+
+def test_process_pool_aggregation(executor):
+    """Test that aggregating in a worker process matches the wrapped function."""
+    rng = np.random.default_rng(0)
+    local_tensors = [
+        LocalTensor(col_name=f'col{i}', tensor=rng.standard_normal((3, 5)), weight=0.25)
+        for i in range(4)
+    ]
+    local_tensors.append(
+        LocalTensor(col_name='col4', tensor=np.arange(15, dtype=np.int8).reshape(3, 5), weight=0.)
+    )
+    history = [{'tensor_name': 'other', 'round': 0, 'tags': ('model',), 'nparray': None}]
+    aggregation_function = ProcessPoolAggregation(Median(), executor)
+
+    agg_nparray = aggregation_function(
+        local_tensors, iter(history), 'tensor', 0, ('trained',))
+
+    expected = Median()(local_tensors, iter(history), 'tensor', 0, ('trained',))
+    assert np.array_equal(agg_nparray, expected)
+
+
+class CountHistory(AggregationFunction):
+    """Return the number of rows of the history of the tensor."""
+
+    def call(self, local_tensors, db_iterator, *_):
+        return np.array(len(list(db_iterator)))
+
+
+def test_process_pool_aggregation_history(executor):
+    """Test that the worker process gets the history of the aggregated tensor only."""
+    tensor_db = TensorDB()
+    tensor_db.cache_tensor({
+        TensorKey('tensor', 'agg', 0, False, ('model',)): np.zeros(2),
+        TensorKey('tensor', 'agg', 0, False, ('col1', 'trained')): np.ones(2),
+        TensorKey('other', 'agg', 0, False, ('model',)): np.zeros(2),
+    })
+
+    agg_nparray = tensor_db.get_aggregated_tensor(
+        TensorKey('tensor', 'agg', 0, False, ('trained',)), {'col1': 1.0},
+        ProcessPoolAggregation(CountHistory(), executor))
+
+    assert agg_nparray == 2
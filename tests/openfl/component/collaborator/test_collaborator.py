@@ -8,6 +8,8 @@ import numpy
 import pytest
 
 from openfl.component.collaborator import Collaborator
+from openfl.component.collaborator.collaborator import _NamedTensorStream
+from openfl.databases import ModelCache
 from openfl.protocols import base_pb2
 from openfl.utilities.types import TensorKey
 
@@ -18,6 +20,7 @@ def collaborator_mock():
     col = Collaborator('col1', 'some_uuid', 'federation_uuid',
                        mock.Mock(), mock.Mock(), mock.Mock(), opt_treatment='RESET')
     col.tensor_db = mock.Mock()
+    col.client.rounds_to_train = 0
 
     return col
 
@@ -273,6 +276,76 @@ def test_get_numpy_dict_for_tensorkeys(collaborator_mock, tensor_key):
     assert numpy_dict == {tensor_key.tensor_name: expected_nparray}
 
 
+def test_get_numpy_dict_for_tensorkeys_prefetch(collaborator_mock, tensor_key, named_tensor):
+    """Test that aggregated tensors are fetched in a single call when supported."""
+    tensor_key = tensor_key._replace(origin='some_uuid')
+    collaborator_mock.tensor_db.get_tensor_from_cache = mock.Mock(return_value=None)
+    collaborator_mock.client.get_aggregated_model = mock.Mock(return_value=[named_tensor])
+    collaborator_mock.client.get_aggregated_tensor = mock.Mock()
+
+    numpy_dict = collaborator_mock.get_numpy_dict_for_tensorkeys([tensor_key])
+
+    collaborator_mock.client.get_aggregated_model.assert_called_once_with(
+        collaborator_mock.collaborator_name, [(tensor_key, True)])
+    collaborator_mock.client.get_aggregated_tensor.assert_not_called()
+    assert numpy_dict == {tensor_key.tensor_name: named_tensor.data_bytes}
+    assert collaborator_mock._prefetched_tensors == {}
+
+
+def test_get_numpy_dict_for_tensorkeys_prefetch_unsupported(collaborator_mock, tensor_key,
+                                                            named_tensor):
+    """Test that tensors are fetched one by one if the aggregator can't stream them."""
+    tensor_key = tensor_key._replace(origin='some_uuid')
+    collaborator_mock.tensor_db.get_tensor_from_cache = mock.Mock(return_value=None)
+    collaborator_mock.client.get_aggregated_model = mock.Mock(return_value=None)
+    collaborator_mock.client.get_aggregated_tensor = mock.Mock(return_value=named_tensor)
+
+    numpy_dict = collaborator_mock.get_numpy_dict_for_tensorkeys([tensor_key])
+
+    collaborator_mock.client.get_aggregated_tensor.assert_called_once()
+    assert numpy_dict == {tensor_key.tensor_name: named_tensor.data_bytes}
+
+
+def test_get_numpy_dict_for_tensorkeys_concurrent(collaborator_mock, tensor_key, named_tensor):
+    """Test that tensors are resolved by a pool of workers as they are streamed."""
+    tensor_keys = [tensor_key._replace(origin='some_uuid', tensor_name=f't{i}') for i in range(8)]
+    named_tensors = []
+    for i in range(8):
+        tensor = base_pb2.NamedTensor()
+        tensor.CopyFrom(named_tensor)
+        tensor.name = f't{i}'
+        named_tensors.append(tensor)
+
+    def get_aggregated_model(collaborator_name, tensor_requests, on_tensor):
+        # The last tensor is left to be fetched on its own
+        for i, tensor in enumerate(named_tensors[:-1]):
+            on_tensor(i, tensor)
+        return None
+
+    collaborator_mock.fetch_concurrency = 4
+    collaborator_mock.tensor_db.get_tensor_from_cache = mock.Mock(return_value=None)
+    collaborator_mock.client.get_aggregated_model = mock.Mock(side_effect=get_aggregated_model)
+    collaborator_mock.client.get_aggregated_tensor = mock.Mock(return_value=named_tensors[-1])
+    collaborator_mock.named_tensor_to_nparray = mock.Mock(side_effect=lambda tensor: tensor.name)
+
+    numpy_dict = collaborator_mock.get_numpy_dict_for_tensorkeys(tensor_keys)
+
+    assert numpy_dict == {f't{i}': f't{i}' for i in range(8)}
+    collaborator_mock.client.get_aggregated_tensor.assert_called_once()
+    assert collaborator_mock._prefetched_tensors == {}
+
+
+def test_get_numpy_dict_for_tensorkeys_concurrent_error(collaborator_mock, tensor_key):
+    """Test that errors of the streaming call are raised by the workers."""
+    collaborator_mock.fetch_concurrency = 2
+    collaborator_mock.tensor_db.get_tensor_from_cache = mock.Mock(return_value=None)
+    collaborator_mock.client.get_aggregated_model = mock.Mock(
+        side_effect=RuntimeError('connection lost'))
+
+    with pytest.raises(RuntimeError):
+        collaborator_mock.get_numpy_dict_for_tensorkeys([tensor_key._replace(origin='some_uuid')])
+
+
 def test_run_time_to_quit(collaborator_mock):
     """Test that run works correctly if is time to quit."""
     collaborator_mock.get_tasks = mock.Mock(return_value=([], 0, 0, True))
@@ -305,3 +378,153 @@ def test_run_simulation(collaborator_mock):
     collaborator_mock.do_task = mock.Mock()
     collaborator_mock.run_simulation()
     collaborator_mock.do_task.assert_called_with('task', round_number)
+
+
+def test_pipelined_send(tensor_key):
+    """Test that task results are streamed in the background and waited for."""
+    col = Collaborator('col1', 'some_uuid', 'federation_uuid',
+                       mock.Mock(), mock.Mock(), mock.Mock(), opt_treatment='RESET',
+                       pipelined_send=True)
+    col.tensor_db = mock.Mock()
+    tensor_key = tensor_key._replace(report=True)
+    result = {tensor_key: numpy.array(1.0)}, {}
+    task = mock.Mock()
+    task.function_name = 'func_name'
+    task.name = 'task_name'
+    task.task_type = 'train'
+    col.task_runner.TASK_REGISTRY = {'func_name': mock.Mock(return_value=result)}
+    col.task_runner.get_required_tensorkeys_for_function = mock.Mock(return_value=[])
+    col.nparray_to_named_tensor = mock.Mock(side_effect=lambda k, v: k)
+    sent = []
+    col.client.send_local_task_results = mock.Mock(
+        side_effect=lambda *args: sent.append(list(args[-1])))
+
+    metrics = col.do_task(task, 0)
+    col.wait_for_sends()
+
+    assert metrics == {'col1/task_name/tensor_name': 1.0}
+    assert sent == [[tensor_key]]
+    timings = col._pop_phase_timings()
+    assert {'col1/task_name/time/compute', 'col1/task_name/time/compress',
+            'col1/task_name/time/send', 'col1/round/time/send_wait'} <= set(timings)
+
+
+def test_pipelined_send_error(collaborator_mock):
+    """Test that errors of sends in the background are raised at the end of the round."""
+    collaborator_mock._send_executor = mock.Mock()
+    future = mock.Mock()
+    future.result.side_effect = RuntimeError('connection lost')
+    collaborator_mock._pending_sends = [future]
+
+    with pytest.raises(RuntimeError):
+        collaborator_mock.wait_for_sends()
+    assert collaborator_mock._pending_sends == []
+
+
+def test_named_tensor_stream_replays():
+    """Test that named tensors are built once and replayed when the send is retried."""
+    build = mock.Mock(side_effect=lambda k, v: k + v)
+    stream = _NamedTensorStream(build, [(1, 1), (2, 2)])
+
+    assert build.call_count == 0
+    assert next(iter(stream)) == 2
+    assert list(stream) == [2, 4]
+    assert list(stream) == [2, 4]
+    assert build.call_count == 2
+
+
+def test_prefetch_next_round(collaborator_mock, tensor_key):
+    """Test that the model tensors of a round are fetched for the next round in the background."""
+    model_key = tensor_key._replace(origin='some_uuid')
+    collaborator_mock.prefetch_next_round = True
+    collaborator_mock._get_numpy_dict_sequentially = mock.Mock()
+
+    collaborator_mock._add_round_model_tensorkeys([model_key, tensor_key])
+    collaborator_mock._start_next_round_prefetch(0)
+    collaborator_mock.wait_for_next_round_prefetch()
+
+    collaborator_mock._get_numpy_dict_sequentially.assert_called_once_with(
+        [model_key._replace(round_number=1)])
+    assert collaborator_mock._round_model_tensorkeys == set()
+    assert 'col1/round/time/prefetch_wait' in collaborator_mock._pop_phase_timings()
+
+
+def test_prefetch_next_round_retries(collaborator_mock, tensor_key):
+    """Test that the prefetch is retried until the model is aggregated."""
+    collaborator_mock.prefetch_next_round = True
+    collaborator_mock._get_numpy_dict_sequentially = mock.Mock(
+        side_effect=[ValueError('not aggregated yet'), {}])
+
+    with mock.patch('openfl.component.collaborator.collaborator.PREFETCH_RETRY_INTERVAL', 0):
+        collaborator_mock._add_round_model_tensorkeys([tensor_key._replace(origin='some_uuid')])
+        collaborator_mock._start_next_round_prefetch(0)
+        collaborator_mock._next_round_prefetch.join()
+
+    assert collaborator_mock._get_numpy_dict_sequentially.call_count == 2
+
+
+def test_prefetch_next_round_last_round(collaborator_mock, tensor_key):
+    """Test that nothing is prefetched after the last round."""
+    collaborator_mock.prefetch_next_round = True
+    collaborator_mock.client.rounds_to_train = 1
+
+    collaborator_mock._add_round_model_tensorkeys([tensor_key._replace(origin='some_uuid')])
+    collaborator_mock._start_next_round_prefetch(0)
+
+    assert collaborator_mock._next_round_prefetch is None
+    assert collaborator_mock._round_model_tensorkeys == set()
+
+
+def test_prefetch_next_round_stopped_at_quit(collaborator_mock, tensor_key):
+    """Test that the prefetch is stopped when the aggregator signals quit."""
+    collaborator_mock.prefetch_next_round = True
+    collaborator_mock._get_numpy_dict_sequentially = mock.Mock(
+        side_effect=ValueError('not aggregated yet'))
+    collaborator_mock.get_tasks = mock.Mock(return_value=([], 0, 0, True))
+
+    collaborator_mock._add_round_model_tensorkeys([tensor_key._replace(origin='some_uuid')])
+    collaborator_mock._start_next_round_prefetch(0)
+    thread = collaborator_mock._next_round_prefetch
+    collaborator_mock.run()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert collaborator_mock._next_round_prefetch is None
+
+
+def test_prefetch_next_round_disabled(collaborator_mock, tensor_key):
+    """Test that nothing is prefetched by default."""
+    collaborator_mock._add_round_model_tensorkeys([tensor_key._replace(origin='some_uuid')])
+    collaborator_mock._start_next_round_prefetch(0)
+
+    assert collaborator_mock._next_round_prefetch is None
+
+
+def test_get_data_for_tensorkey_model_cache(tmp_path, tensor_key):
+    """Test that deltas apply to the model cache of a previous collaborator process."""
+    tensor_key = tensor_key._replace(origin='some_uuid', round_number=1)
+    ModelCache(str(tmp_path / 'federation_uuid')).put('tensor_name', 0, numpy.ones(3))
+    col = Collaborator('col1', 'some_uuid', 'federation_uuid',
+                       mock.Mock(), mock.Mock(), mock.Mock(), opt_treatment='RESET',
+                       delta_updates=True, model_cache_path=str(tmp_path))
+    col.get_aggregated_tensor_from_aggregator = mock.Mock(return_value=numpy.full(3, 2.0))
+
+    nparray = col.get_data_for_tensorkey(tensor_key)
+
+    col.get_aggregated_tensor_from_aggregator.assert_called_once_with(
+        TensorKey('tensor_name', 'some_uuid', 1, False, ('aggregated', 'delta', 'compressed')))
+    numpy.testing.assert_array_equal(nparray, numpy.full(3, 3.0))
+    numpy.testing.assert_array_equal(col.model_cache.get('tensor_name', 1), nparray)
+    assert col.model_cache.get('tensor_name', 0) is None
+
+
+def test_bytes_downloaded(collaborator_mock, tensor_key, named_tensor):
+    """Test that the bytes received from the aggregator are reported once per round."""
+    collaborator_mock.client.get_aggregated_tensor = mock.Mock(return_value=named_tensor)
+
+    collaborator_mock.get_aggregated_tensor_from_aggregator(tensor_key)
+    collaborator_mock.get_aggregated_tensor_from_aggregator(tensor_key)
+
+    assert collaborator_mock._pop_bytes_downloaded() == {
+        'col1/round/bytes_downloaded': 2 * named_tensor.ByteSize()}
+    assert collaborator_mock._pop_bytes_downloaded() == {'col1/round/bytes_downloaded': 0}
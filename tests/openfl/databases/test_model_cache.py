@@ -0,0 +1,76 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""ModelCache tests module."""
+
+import os
+
+import numpy as np
+
+from openfl.databases import ModelCache
+
+
+def test_put_get(tmp_path):
+    """Test that a tensor is returned for its round only."""
+    cache = ModelCache(str(tmp_path))
+    nparray = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+    cache.put('conv1/weight', 3, nparray)
+
+    np.testing.assert_array_equal(cache.get('conv1/weight', 3), nparray)
+    assert cache.get('conv1/weight', 2) is None
+    assert cache.get('conv2/weight', 3) is None
+
+
+def test_put_replaces(tmp_path):
+    """Test that only the last tensor put is kept."""
+    cache = ModelCache(str(tmp_path))
+
+    cache.put('weight', 1, np.zeros(4))
+    cache.put('weight', 2, np.ones(4))
+    assert cache.get('weight', 1) is None
+    np.testing.assert_array_equal(cache.get('weight', 2), np.ones(4))
+
+    cache.put('weight', 2, np.full(4, 2.0))
+    np.testing.assert_array_equal(cache.get('weight', 2), np.full(4, 2.0))
+    cache.put('weight', 0, np.zeros(4))
+    assert cache.get('weight', 2) is None
+    assert os.listdir(tmp_path) == ['weight.0.npy']
+
+
+def test_reload(tmp_path):
+    """Test that the cache is loaded back by another instance."""
+    ModelCache(str(tmp_path)).put('dense.weight', 5, np.arange(3.0))
+    (tmp_path / 'dense.bias.5.npy.tmp').write_bytes(b'partial')
+
+    cache = ModelCache(str(tmp_path))
+
+    np.testing.assert_array_equal(cache.get('dense.weight', 5), np.arange(3.0))
+    assert sorted(os.listdir(tmp_path)) == ['dense.weight.5.npy']
+
+
+def test_max_size(tmp_path):
+    """Test that the least recently used tensors are evicted."""
+    nparray = np.zeros(100, dtype=np.float32)
+    file_size = 400 + 128
+    cache = ModelCache(str(tmp_path), max_size=2 * file_size)
+
+    cache.put('a', 0, nparray)
+    cache.put('b', 0, nparray)
+    cache.get('a', 0)
+    cache.put('c', 0, nparray)
+    cache.put('d', 0, np.zeros(1000, dtype=np.float32))
+
+    assert cache.get('b', 0) is None
+    assert cache.get('a', 0) is not None
+    assert cache.get('c', 0) is not None
+    assert cache.get('d', 0) is None
+
+
+def test_unreadable_file(tmp_path):
+    """Test that a corrupted file is dropped."""
+    cache = ModelCache(str(tmp_path))
+    cache.put('weight', 1, np.zeros(4))
+    (tmp_path / 'weight.1.npy').write_bytes(b'garbage')
+
+    assert cache.get('weight', 1) is None
+    assert os.listdir(tmp_path) == []
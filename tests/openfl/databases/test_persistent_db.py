@@ -1,3 +1,6 @@
+import pickle
+import sqlite3
+
 import numpy as np
 import pytest
 
@@ -120,3 +123,127 @@ def test_finalize_round_and_load_tensors(persistent_db, tensor_key, random_array
                 np.testing.assert_array_equal(arr, next_round_tensors[key])
                 found = True
         assert found, "Expected tensor2 not found in the next round tensors table."
+
+
+def test_tensor_serialization(persistent_db, tensor_key):
+    """Test that arrays are stored as raw buffers and other values are pickled."""
+    tensors = {
+        tensor_key: np.arange(12, dtype=np.float16).reshape(3, 4).T,
+        TensorKey("scalar", "origin1", 1, True, ("metric",)): np.float32(0.5),
+        TensorKey("0d", "origin1", 1, True, ("metric",)): np.array(3, dtype=np.int64),
+        TensorKey("objects", "origin1", 1, False, ()): np.array([{"a": 1}], dtype=object),
+    }
+    persistent_db.finalize_round(tensors, {}, 1, 0.5)
+
+    cursor = persistent_db.conn.cursor()
+    cursor.execute("SELECT tensor_name, dtype, shape FROM tensors")
+    columns = {tensor_name: (dtype, shape) for tensor_name, dtype, shape in cursor.fetchall()}
+    assert columns["tensor1"] == ("<f2", "[4, 3]")
+    assert columns["scalar"] == (None, None)
+
+    loaded = persistent_db.load_tensors(persistent_db.get_tensors_table_name())
+    for key, value in tensors.items():
+        assert type(loaded[key]) is type(value)
+        np.testing.assert_array_equal(loaded[key], value)
+    assert not loaded[tensor_key].flags.writeable
+
+
+def test_task_results_bytes(persistent_db):
+    """Test that serialized NamedTensors are stored as they are."""
+    named_tensors = [b"tensor", b""]
+    task_result_id = persistent_db.save_task_results("collab1", 1, "taskA", 100, named_tensors)
+
+    assert persistent_db.get_task_result_by_id(task_result_id)["named_tensors"] == named_tensors
+
+
+def test_decoded_task_results(persistent_db, tensor_key):
+    """Test that decoded task results are stored until the round is finalized."""
+    persistent_db.save_task_results("collab1", 1, "taskA", 100, [b"tensor"])
+    tensors = {tensor_key: np.arange(3.0)}
+    persistent_db.save_decoded_task_results("collab1", 1, "taskA", tensors)
+
+    assert persistent_db.list_task_results() == [{
+        "id": 1, "collaborator_name": "collab1", "round_number": 1, "task_name": "taskA",
+        "data_size": 100,
+    }]
+    decoded = persistent_db.load_decoded_task_results()
+    assert list(decoded) == [("collab1", 1, "taskA")]
+    np.testing.assert_array_equal(decoded[("collab1", 1, "taskA")][tensor_key], tensors[tensor_key])
+
+    persistent_db.finalize_round({}, {}, 1, 0.5)
+    assert persistent_db.load_decoded_task_results() == {}
+
+
+def test_sidecar_files(tmp_path, tensor_key):
+    """Test that large arrays are stored in memory-mapped .npy files."""
+    db_path = str(tmp_path / "tensor.db")
+    db = PersistentTensorDB(db_path, sidecar_threshold=1024)
+    large_array = np.arange(1000, dtype=np.float32)
+    small_key = TensorKey("small", "origin1", 1, False, ("model",))
+    db.finalize_round({tensor_key: large_array, small_key: np.ones(3)}, {}, 1, 0.5)
+    assert len(list((tmp_path / "tensor.db-tensors").iterdir())) == 1
+    db.close()
+
+    db = PersistentTensorDB(db_path, sidecar_threshold=1024)
+    loaded = db.load_tensors(db.get_tensors_table_name())
+    assert isinstance(loaded[tensor_key], np.memmap)
+    np.testing.assert_array_equal(loaded[tensor_key], large_array)
+    np.testing.assert_array_equal(loaded[small_key], np.ones(3))
+
+    # Files of removed tensors are deleted
+    next_key = TensorKey("tensor1", "origin1", 3, False, ("tag1",))
+    db.finalize_round({next_key: large_array}, {}, 3, 0.5)
+    db.clean_up(1)
+    assert len(list((tmp_path / "tensor.db-tensors").iterdir())) == 1
+    db.close()
+
+
+def test_finalize_round_file_removal_error(tmp_path, tensor_key, mocker):
+    """Test that a file that cannot be removed does not fail a committed round."""
+    db = PersistentTensorDB(str(tmp_path / "tensor.db"), sidecar_threshold=1024)
+    large_array = np.arange(1000, dtype=np.float32)
+    db.finalize_round({}, {tensor_key: large_array}, 1, 0.5)
+    remove = mocker.patch("os.remove", side_effect=PermissionError("file in use"))
+
+    db.finalize_round({}, {}, 2, 0.7)
+
+    remove.assert_called_once()
+    assert db.get_round_and_best_score() == (2, 0.7)
+    db.close()
+
+
+def test_legacy_database(tmp_path, tensor_key):
+    """Test that databases of pickled values are still loaded."""
+    db_path = str(tmp_path / "tensor.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE tensors (id INTEGER PRIMARY KEY AUTOINCREMENT, tensor_name TEXT NOT NULL,"
+        " origin TEXT NOT NULL, round INTEGER NOT NULL, report INTEGER NOT NULL, tags TEXT,"
+        " nparray BLOB NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE task_results (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " collaborator_name TEXT NOT NULL, round_number INTEGER NOT NULL,"
+        " task_name TEXT NOT NULL, data_size INTEGER NOT NULL, named_tensors BLOB NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO tensors (tensor_name, origin, round, report, tags, nparray)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        ("tensor1", "origin1", 1, 0, '["tag1"]', pickle.dumps(np.ones(3))),
+    )
+    conn.execute(
+        "INSERT INTO task_results (collaborator_name, round_number, task_name, data_size,"
+        " named_tensors) VALUES (?, ?, ?, ?, ?)",
+        ("collab1", 1, "taskA", 100, pickle.dumps([b"tensor"])),
+    )
+    conn.commit()
+    conn.close()
+
+    db = PersistentTensorDB(db_path)
+    loaded = db.load_tensors(db.get_tensors_table_name())
+    np.testing.assert_array_equal(loaded[tensor_key], np.ones(3))
+    assert db.get_task_result_by_id(1)["named_tensors"] == [b"tensor"]
+
+    db.finalize_round({tensor_key: np.zeros(3)}, {}, 2, 0.5)
+    assert db.is_task_table_empty()
+    db.close()
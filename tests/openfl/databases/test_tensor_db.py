@@ -2,11 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 """Collaborator tests module."""
 
+import pickle
+from threading import Timer
+
 import numpy as np
 import pytest
 from pandas.testing import assert_frame_equal
 
 from openfl.interface.aggregation_functions import AggregationFunction
+from openfl.interface.aggregation_functions import FedCurvWeightedAverage
+from openfl.interface.aggregation_functions import Median
 from openfl.interface.aggregation_functions import WeightedAverage
 from openfl.databases.tensor_db import TensorDB
 from openfl.protocols import base_pb2
@@ -83,7 +88,7 @@ def test_clean_up(nparray, tensor_key):
     db = TensorDB()
 
     db.cache_tensor({tensor_key: nparray})
-    db.tensor_db['round'] = 2
+    db.cache_tensor({tensor_key._replace(round_number=2): nparray})
     db.clean_up()
     cached_nparray = db.get_tensor_from_cache(tensor_key)
 
@@ -94,14 +99,14 @@ def test_clean_up_round_placeholder(nparray, tensor_key):
     """Test that clean_up remove old records."""
     db = TensorDB()
 
+    db.cache_tensor({tensor_key._replace(round_number=ROUND_PLACEHOLDER): nparray})
+    db.cache_tensor({tensor_key._replace(round_number=ROUND_PLACEHOLDER - 1): nparray})
     db.cache_tensor({tensor_key: nparray})
-    db.cache_tensor({tensor_key: nparray})
-    db.tensor_db['round'][0] = ROUND_PLACEHOLDER
-    db.tensor_db['round'][1] = ROUND_PLACEHOLDER - 1
     db.clean_up()
     cached_nparray = db.get_tensor_from_cache(tensor_key)
 
     assert cached_nparray is None
+    assert len(db) == 2
 
 
 def test_clean_up_not_old(nparray, tensor_key):
@@ -115,19 +120,121 @@ def test_clean_up_not_old(nparray, tensor_key):
     assert np.array_equal(nparray, cached_nparray)
 
 
+def test_clean_up_keeps_reports(nparray, tensor_key):
+    """Test that clean_up never removes reported tensors."""
+    db = TensorDB()
+    report_key = tensor_key._replace(report=True)
+
+    db.cache_tensor({report_key: nparray})
+    db.cache_tensor({tensor_key._replace(round_number=2): nparray})
+    db.clean_up()
+    cached_nparray = db.get_tensor_from_cache(report_key)
+
+    assert np.array_equal(nparray, cached_nparray)
+
+
 def test_clean_up_not_clean_up_with_negative_argument(nparray, tensor_key):
     """Test that clean_up don't remove if records remove_older_than is negative."""
     db = TensorDB()
 
     db.cache_tensor({tensor_key: nparray})
-    db.tensor_db['round'] = 2
+    db.cache_tensor({tensor_key._replace(round_number=2): nparray})
     db.clean_up(remove_older_than=-1)
-    db.tensor_db['round'] = 0
     cached_nparray = db.get_tensor_from_cache(tensor_key)
 
     assert np.array_equal(nparray, cached_nparray)
 
 
+def test_cache_tensor_overwrites(nparray, tensor_key):
+    """Test that caching a tensor under an existing key replaces its value."""
+    db = TensorDB()
+
+    db.cache_tensor({tensor_key: nparray})
+    db.cache_tensor({tensor_key: nparray * 2})
+    cached_nparray = db.get_tensor_from_cache(tensor_key)
+
+    assert len(db) == 1
+    assert np.array_equal(nparray * 2, cached_nparray)
+
+
+def test_wait_for_tensor(nparray, tensor_key):
+    """Test that wait_for_tensor wakes up when the tensor is cached."""
+    db = TensorDB()
+    timer = Timer(0.1, db.cache_tensor, args=({tensor_key: nparray},))
+    timer.start()
+
+    cached_nparray = db.wait_for_tensor(tensor_key, timeout=10)
+    timer.join()
+
+    assert np.array_equal(nparray, cached_nparray)
+
+
+def test_wait_for_tensor_timeout(tensor_key):
+    """Test that wait_for_tensor returns None if the tensor is not cached in time."""
+    db = TensorDB()
+
+    assert db.wait_for_tensor(tensor_key, timeout=0.01) is None
+
+
+def test_tensor_callback(nparray, tensor_key):
+    """Test that tensor callbacks are called once the tensor is cached."""
+    db = TensorDB()
+    calls = []
+    db.add_tensor_callback(tensor_key, lambda: calls.append('waiting'))
+    removed = lambda: calls.append('removed')  # noqa: E731
+    db.add_tensor_callback(tensor_key, removed)
+    db.remove_tensor_callback(tensor_key, removed)
+    assert calls == []
+
+    db.cache_tensor({tensor_key: nparray})
+    db.cache_tensor({tensor_key: nparray})
+    assert calls == ['waiting']
+
+    db.add_tensor_callback(tensor_key, lambda: calls.append('cached'))
+    assert calls == ['waiting', 'cached']
+    assert db._tensor_callbacks == {}
+
+
+def test_encoded_tensor_cache(nparray, tensor_key):
+    """Test that encoded tensors are cached until the tensor is replaced."""
+    db = TensorDB()
+
+    db.cache_encoded_tensor(tensor_key, (True,), b'missing')
+    assert db.get_encoded_tensor_from_cache(tensor_key, (True,)) is None
+
+    db.cache_tensor({tensor_key: nparray})
+    db.cache_encoded_tensor(tensor_key, (True,), b'encoded')
+    assert db.get_encoded_tensor_from_cache(tensor_key, (True,)) == b'encoded'
+    assert db.get_encoded_tensor_from_cache(tensor_key, (False,)) is None
+
+    db.cache_tensor({tensor_key: nparray + 1})
+    assert db.get_encoded_tensor_from_cache(tensor_key, (True,)) is None
+
+
+def test_clean_up_encoded_tensor(nparray, tensor_key):
+    """Test that clean_up removes the encoded forms of old tensors."""
+    db = TensorDB()
+    new_tensor_key = tensor_key._replace(round_number=2)
+
+    db.cache_tensor({tensor_key: nparray, new_tensor_key: nparray})
+    db.cache_encoded_tensor(tensor_key, (True,), b'old')
+    db.cache_encoded_tensor(new_tensor_key, (True,), b'new')
+    db.clean_up()
+
+    assert db.get_encoded_tensor_from_cache(tensor_key, (True,)) is None
+    assert db.get_encoded_tensor_from_cache(new_tensor_key, (True,)) == b'new'
+
+
+def test_get_tensors_by_round_and_tags(tensor_db):
+    """Test that get_tensors_by_round_and_tags uses both round and tags."""
+    tensor_dict = tensor_db.get_tensors_by_round_and_tags(0, ('col1',))
+
+    assert list(tensor_dict) == [TensorKey('tensor_name', 'agg', 0, False, ('col1',))]
+    assert np.array_equal(tensor_dict[TensorKey('tensor_name', 'agg', 0, False, ('col1',))],
+                          np.array([0, 1, 2, 3, 4]))
+    assert tensor_db.get_tensors_by_round_and_tags(1, ('col1',)) == {}
+
+
 def test_get_aggregated_tensor_directly(nparray, tensor_key):
     """Test that get_aggregated_tensor returns tensors directly."""
     db = TensorDB()
@@ -265,6 +372,27 @@ def test_get_aggregated_tensor_privileged_function(tensor_db):
     assert np.array_equal(agg_nparray, np.array([2, 4, 6, 8, 10]))
 
 
+def test_get_aggregated_tensor_privileged_function_writes(tensor_db):
+    """Test that writes of a privileged agg function are kept in TensorDB."""
+    collaborator_weight_dict = {'col1': 0.1, 'col2': 0.9}
+
+    class PrivilegedStore(AggregationFunction):
+        def __init__(self):
+            super().__init__()
+            self._privileged = True
+
+        def call(self, local_tensors, db, tensor_name, fl_round, tags):
+            db.store(tensor_name, 'agg', fl_round, False, ('extra',), np.array([1]))
+            return local_tensors[0].tensor
+
+    tensor_key = TensorKey('tensor_name', 'agg', 0, False, ())
+    tensor_db.get_aggregated_tensor(tensor_key, collaborator_weight_dict, PrivilegedStore())
+
+    extra_tensor_key = TensorKey('tensor_name', 'agg', 0, False, ('extra',))
+    assert np.array_equal(tensor_db.get_tensor_from_cache(extra_tensor_key), np.array([1]))
+    assert np.array_equal(tensor_db.get_tensor_from_cache(tensor_key), np.array([0, 1, 2, 3, 4]))
+
+
 def test_get_aggregated_tensor_iterate_input(tensor_db):
     """Test that get_aggregated_tensor works correctly with db_iterator enabled."""
     collaborator_weight_dict = {'col1': 0.1, 'col2': 0.9}
@@ -284,6 +412,15 @@ def test_get_aggregated_tensor_iterate_input(tensor_db):
     assert np.array_equal(agg_nparray, np.array([2, 4, 6, 8, 10]))
 
 
+def test_iterate_order(tensor_db):
+    """Test that _iterate yields rows sorted by round, newest first."""
+    tensor_db.cache_tensor({TensorKey('tensor_name', 'agg', 1, False, ('model',)): np.ones(5)})
+    rounds = [row['round'] for row in tensor_db._iterate()]
+
+    assert rounds == [1, 0, 0]
+    assert [row['tags'] for row in tensor_db._iterate(tensor_name='other')] == []
+
+
 def test_retrieve(tensor_db):
     """Test that TensorDB's retrieve method works correctly."""
     ret = _retrieve(tensor_db.tensor_db, 'tensor_name', 'agg', 0, False, ('col1',))
@@ -300,46 +437,151 @@ def test_retrieve_no_result(tensor_db):
 
 def test_search(tensor_db):
     """Test that TensorDB's search method works correctly."""
-    ret = _search(tensor_db.tensor_db, 'tensor_name', 'agg', 0, False, ('col1',))
+    df = tensor_db.tensor_db
+    ret = _search(df, 'tensor_name', 'agg', 0, False, ('col1',))
 
-    assert_frame_equal(ret, tensor_db.tensor_db.drop([1]))
+    assert_frame_equal(ret, df.drop([1]))
 
 
 def test_search_no_result(tensor_db):
     """Test that TensorDB's search method finds no result."""
-    ret = _search(tensor_db.tensor_db, 'tensor_name', 'agg', 1, False, ('col3',))
+    df = tensor_db.tensor_db
+    ret = _search(df, 'tensor_name', 'agg', 1, False, ('col3',))
 
-    assert_frame_equal(ret, tensor_db.tensor_db)
+    assert_frame_equal(ret, df)
 
 
 def test_store(tensor_db):
     """Test that TensorDB's store method works correctly."""
-    _store(tensor_db.tensor_db, 'tensor_name', 'agg', 0,
+    df = tensor_db.tensor_db
+    _store(df, 'tensor_name', 'agg', 0,
            False, ('col1',), np.array([5, 6, 7, 8, 9]))
 
-    assert np.array_equal(tensor_db.tensor_db.loc[0]['nparray'], np.array([5, 6, 7, 8, 9]))
+    assert np.array_equal(df.loc[0]['nparray'], np.array([5, 6, 7, 8, 9]))
 
 
 def test_store_no_nparray(tensor_db):
     """Test that TensorDB's store method returns directly when no nparray provided."""
-    origin_tensor = tensor_db.tensor_db.copy(deep=True)
-    _store(tensor_db.tensor_db)
+    df = tensor_db.tensor_db
+    origin_tensor = df.copy(deep=True)
+    _store(df)
 
-    assert_frame_equal(origin_tensor, tensor_db.tensor_db)
+    assert_frame_equal(origin_tensor, df)
 
 
 def test_store_not_overwrite(tensor_db):
     """Test that TensorDB's store method changes nothing when disabling overwrite."""
-    origin_tensor = tensor_db.tensor_db.copy(deep=True)
-    _store(tensor_db.tensor_db, 'tensor_name', 'agg', 0, False,
+    df = tensor_db.tensor_db
+    origin_tensor = df.copy(deep=True)
+    _store(df, 'tensor_name', 'agg', 0, False,
            ('col1',), np.array([5, 6, 7, 8, 9]), overwrite=False)
 
-    assert_frame_equal(origin_tensor, tensor_db.tensor_db)
+    assert_frame_equal(origin_tensor, df)
 
 
 def test_store_append_at_the_end(tensor_db):
     """Test that TensorDB's store method appends new tensor at the end."""
-    _store(tensor_db.tensor_db, 'tensor_name', 'agg', 0, False,
+    df = tensor_db.tensor_db
+    _store(df, 'tensor_name', 'agg', 0, False,
            ('col3',), np.array([5, 6, 7, 8, 9]))
 
-    assert np.array_equal(tensor_db.tensor_db.loc[2]['nparray'], np.array([5, 6, 7, 8, 9]))
+    assert np.array_equal(df.loc[2]['nparray'], np.array([5, 6, 7, 8, 9]))
+
+
+def test_accumulate_tensor_weighted_average():
+    """Test that a streamed weighted average matches the stacked computation."""
+    db = TensorDB()
+    tensor_key = TensorKey('tensor_name', 'agg', 0, False, ('trained',))
+    arrays = {'col1': np.array([0., 1., 2.]), 'col2': np.array([2., 3., 4.])}
+    data_sizes = {'col1': 10, 'col2': 30}
+    for col, array in arrays.items():
+        db.cache_tensor({tensor_key._replace(tags=('trained', col)): array})
+        db.accumulate_tensor(tensor_key, col, array, data_sizes[col], WeightedAverage())
+
+    collaborator_weight_dict = {'col1': 0.25, 'col2': 0.75}
+    agg_nparray = db.get_aggregated_tensor(
+        tensor_key, collaborator_weight_dict, WeightedAverage())
+
+    control_nparray = np.average(
+        list(arrays.values()), weights=list(collaborator_weight_dict.values()), axis=0)
+    assert np.allclose(agg_nparray, control_nparray)
+    assert tensor_key not in db._accumulators
+
+
+def test_accumulate_tensor_fallback_on_different_collaborators():
+    """Test that the stacked path is used if the accumulator has extra collaborators."""
+    db = TensorDB()
+    tensor_key = TensorKey('tensor_name', 'agg', 0, False, ('trained',))
+    db.cache_tensor({tensor_key._replace(tags=('col1', 'trained')): np.array([1., 1.])})
+    db.accumulate_tensor(tensor_key, 'col1', np.array([1., 1.]), 1, WeightedAverage())
+    db.accumulate_tensor(tensor_key, 'col2', np.array([3., 3.]), 1, WeightedAverage())
+
+    agg_nparray = db.get_aggregated_tensor(tensor_key, {'col1': 1.0}, WeightedAverage())
+
+    assert np.array_equal(agg_nparray, np.array([1., 1.]))
+
+
+def test_accumulate_tensor_fedcurv_sum():
+    """Test that FedCurv Fisher variables are streamed as a plain sum of their type."""
+    db = TensorDB()
+    tensor_key = TensorKey('layer_u', 'agg', 0, False, ('trained',))
+    tensors = [np.array([1., 2.], dtype=np.float32), np.array([3., 4.], dtype=np.float32)]
+    db.accumulate_tensor(tensor_key, 'col1', tensors[0], 10, FedCurvWeightedAverage())
+    db.accumulate_tensor(tensor_key, 'col2', tensors[1], 30, FedCurvWeightedAverage())
+
+    agg_nparray = db.get_aggregated_tensor(
+        tensor_key, {'col1': 0.25, 'col2': 0.75}, FedCurvWeightedAverage())
+
+    assert np.array_equal(agg_nparray, np.array([4., 6.]))
+    assert agg_nparray.dtype == np.sum(tensors, axis=0).dtype == np.float32
+
+
+def test_accumulate_tensor_ignored_for_non_linear_function():
+    """Test that non-linear aggregation functions are not streamed."""
+    db = TensorDB()
+    tensor_key = TensorKey('tensor_name', 'agg', 0, False, ('trained',))
+    db.accumulate_tensor(tensor_key, 'col1', np.array([1., 2.]), 1, Median())
+
+    assert db._accumulators == {}
+
+
+def test_weighted_average_subclass_not_streamed():
+    """Test that overriding call on a WeightedAverage subclass disables streaming."""
+
+    class Max(WeightedAverage):
+        def call(self, local_tensors, *_):
+            return np.max([local_tensor.tensor for local_tensor in local_tensors], axis=0)
+
+    assert WeightedAverage()._streaming
+    assert FedCurvWeightedAverage()._streaming
+    assert not Max()._streaming
+
+
+def test_iterate_rows(tensor_db):
+    """Test that rows are filtered by name and read as items or attributes."""
+    tensor_db.cache_tensor({TensorKey('other', 'agg', 1, False, ('model',)): np.ones(5)})
+
+    rows = list(tensor_db._iterate(tensor_name='other'))
+
+    assert len(rows) == 1
+    assert rows[0].tensor_name == rows[0]['tensor_name'] == 'other'
+    assert rows[0].round == 1
+    assert pickle.loads(pickle.dumps(rows[0])).tags == ('model',)
+    with pytest.raises(AttributeError):
+        rows[0].origin
+
+
+def test_get_aggregated_tensor_iterates_tensor(tensor_db):
+    """Test that aggregation functions only iterate over the aggregated tensor."""
+    tensor_db.cache_tensor({TensorKey('other', 'agg', 0, False, ('model',)): np.ones(5)})
+
+    class Names(AggregationFunction):
+        def call(self, local_tensors, db_iterator, *_):
+            self.names = {row.tensor_name for row in db_iterator}
+            return local_tensors[0].tensor
+
+    names = Names()
+    tensor_db.get_aggregated_tensor(
+        TensorKey('tensor_name', 'agg', 0, False, ()), {'col1': 0.5, 'col2': 0.5}, names)
+
+    assert names.names == {'tensor_name'}
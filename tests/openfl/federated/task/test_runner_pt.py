@@ -0,0 +1,73 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""PyTorchTaskRunner tests module."""
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip('torch')
+
+from openfl.federated.task.runner_pt import PyTorchTaskRunner  # noqa: E402
+
+
+class Model(PyTorchTaskRunner):
+    """A linear model with a batch norm."""
+
+    def __init__(self):
+        """Initialize the model on the CPU."""
+        super().__init__(device='cpu', data_loader=mock.Mock())
+        self.linear = torch.nn.Linear(4, 3)
+        self.norm = torch.nn.BatchNorm1d(3)
+        self.optimizer = torch.optim.Adam(self.parameters())
+
+
+def train_step(model):
+    """Take an optimizer step, so that the optimizer has state."""
+    model.optimizer.zero_grad()
+    model.norm(model.linear(torch.ones(2, 4))).sum().backward()
+    model.optimizer.step()
+
+
+def test_get_tensor_dict_copies():
+    """Test that tensor dicts are not changed by later training."""
+    model = Model()
+    train_step(model)
+
+    tensor_dict = model.get_tensor_dict(with_opt_vars=True)
+    weight = tensor_dict['linear.weight'].copy()
+    exp_avg = tensor_dict['__opt_state_0_0_istensor_exp_avg'].copy()
+    train_step(model)
+
+    np.testing.assert_array_equal(tensor_dict['linear.weight'], weight)
+    np.testing.assert_array_equal(tensor_dict['__opt_state_0_0_istensor_exp_avg'], exp_avg)
+
+
+def test_set_tensor_dict_in_place():
+    """Test that tensors are copied into the storage of the parameters."""
+    model = Model()
+    train_step(model)
+    tensor_dict = model.get_tensor_dict(with_opt_vars=True)
+    other = Model()
+    storage = other.linear.weight.data_ptr()
+    weight = np.frombuffer(tensor_dict['linear.weight'].tobytes(), dtype=np.float32)
+    tensor_dict['linear.weight'] = weight.reshape(3, 4)
+
+    other.set_tensor_dict(tensor_dict, with_opt_vars=True)
+
+    assert other.linear.weight.data_ptr() == storage
+    np.testing.assert_array_equal(other.linear.weight.detach().numpy(), weight.reshape(3, 4))
+    assert other.norm.num_batches_tracked.item() == 1
+    train_step(other)
+    np.testing.assert_array_equal(weight.reshape(3, 4), model.linear.weight.detach().numpy())
+
+
+def test_set_tensor_dict_shape_mismatch():
+    """Test that tensors of the wrong shape are rejected."""
+    model = Model()
+    tensor_dict = model.get_tensor_dict()
+    tensor_dict['linear.weight'] = np.zeros((4, 3), dtype=np.float32)
+
+    with pytest.raises(RuntimeError):
+        model.set_tensor_dict(tensor_dict)
@@ -0,0 +1,73 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Codebook tests module."""
+
+import numpy as np
+import pytest
+
+from openfl.pipelines import codebook
+from openfl.pipelines.kc_pipeline import KmeansTransformer
+
+
+@pytest.mark.parametrize('n_levels,dtype,bits', [
+    (1, np.uint8, 1),
+    (3, np.uint8, 2),
+    (16, np.uint8, 4),
+    (17, np.uint8, 8),
+    (256, np.uint8, 8),
+    (257, np.uint16, 16),
+    (2**16 + 1, np.uint32, 32),
+])
+def test_code_size(n_levels, dtype, bits):
+    """Test that codes take the narrowest type and are packed for small codebooks."""
+    assert codebook.code_dtype(n_levels) == dtype
+    assert codebook.bits_per_code(n_levels) == bits
+
+
+def test_float_to_int_round_trip():
+    """Test that codes map back to the values they were made from."""
+    data = np.array([[0.5, -1.], [0.5, 2.]], dtype=np.float32)
+
+    int_array, int_to_float_map = codebook.float_to_int(data)
+
+    assert int_array.dtype == np.uint8
+    np.testing.assert_array_equal(int_array, [[1, 0], [1, 2]])
+    assert int_to_float_map == {0: -1., 1: 0.5, 2: 2.}
+    np.testing.assert_array_equal(codebook.int_to_float(int_array, int_to_float_map), data)
+
+
+@pytest.mark.parametrize('n_values', [3, 17, 300])
+def test_float_to_int_levels(n_values):
+    """Test that values are mapped to known levels as to their unique values."""
+    levels = np.linspace(-1., 1., n_values + 1)
+    data = np.random.default_rng(0).permutation(np.repeat(levels[:-1], 3))
+
+    int_array, int_to_float_map = codebook.float_to_int(data, levels=levels)
+    expected_array, expected_map = codebook.float_to_int(data)
+
+    np.testing.assert_array_equal(int_array, expected_array)
+    assert int_array.dtype == expected_array.dtype
+    assert int_to_float_map == {**expected_map, n_values: 1.}
+
+
+@pytest.mark.parametrize('n_levels', [2, 3, 6, 16, 200, 1000])
+@pytest.mark.parametrize('count', [0, 1, 7, 1001])
+def test_pack_codes_round_trip(n_levels, count):
+    """Test that packed codes are unpacked to the same codes."""
+    codes = np.random.default_rng(0).integers(n_levels, size=count)
+
+    packed = codebook.pack_codes(codes, n_levels)
+
+    assert packed.dtype == np.uint8
+    assert packed.size == -(-count * codebook.bits_per_code(n_levels) // 8)
+    np.testing.assert_array_equal(codebook.unpack_codes(packed, n_levels, count), codes)
+
+
+def test_kmeans_backward_float_codes():
+    """Test that codes sent as float32 are still mapped back to their values."""
+    t = KmeansTransformer()
+    metadata = {'int_to_float': {0: -1., 1: 2.}, 'int_list': [2, 2]}
+
+    data = t.backward(np.array([1., 0., 0., 1.], dtype=np.float32), metadata)
+
+    np.testing.assert_array_equal(data, [[2., -1.], [-1., 2.]])
@@ -0,0 +1,96 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""EdenPipeline tests module."""
+
+import numpy as np
+import pytest
+
+from openfl.pipelines import EdenPipeline
+from openfl.pipelines.eden_pipeline import NumpyEden
+
+
+def eden_metadata(seed, scale_list, dim_list, total_dim):
+    """Compose the metadata EdenTransformer sends for a compressed vector."""
+    metadata = {0: float(seed), 1: float(total_dim)}
+    for k, (scale, dim) in enumerate(zip(scale_list, dim_list)):
+        metadata[2 * k + 2] = scale
+        metadata[2 * k + 3] = float(dim)
+    return metadata
+
+
+@pytest.mark.parametrize('size', [8, 13, 1000])
+def test_rand_diag(size):
+    """Test that the random signs are drawn as by the torch engine."""
+    mask32 = (1 << 32) - 1
+    seed = (12345 * 1664525 + 1013904223) & mask32
+    seed = (seed * 8121 + 28411) & mask32
+    expected = []
+    words = []
+    for i in range(size // 8 + (size % 8 != 0)):
+        r = (1103515245 * (i + seed) + 12345 + seed) & mask32
+        r = (1140671485 * r + 12820163 + seed) & mask32
+        r += 0x9E3779B9
+        r = (r ^ (r >> 16)) * 0x85EBCA6B & mask32
+        r = (r ^ (r >> 13)) * 0xC2B2AE35 & mask32
+        words.append((r ^ (r >> 16)) & mask32)
+    for nibble in range(8):
+        expected.extend(1. if (word >> 4 * nibble) & 15 >= 8 else -1. for word in words)
+
+    np.testing.assert_array_equal(NumpyEden.rand_diag(size, 12345), expected[:size])
+
+
+def test_bits_round_trip():
+    """Test that bins are packed into little-endian bit planes."""
+    eden = NumpyEden(nbits=2)
+    bins = np.array([1, 2, 3, 0, 0, 0, 0, 1])
+
+    bits = eden.to_bits(bins)
+
+    np.testing.assert_array_equal(bits, [0b10000101, 0b00000110])
+    np.testing.assert_array_equal(eden.from_bits(bits), bins)
+
+
+@pytest.mark.parametrize('size', [8, 100, 1000, 4096])
+def test_compress_round_trip(size):
+    """Test that vectors are restored with a small error."""
+    eden = NumpyEden(nbits=8)
+    vec = np.random.default_rng(0).standard_normal(size).astype(np.float32)
+
+    bits, scale_list, dim_list, total_dim = eden.compress(vec, 7)
+    restored = eden.decompress(bits, eden_metadata(7, scale_list, dim_list, total_dim))
+
+    assert bits.nbytes == sum(dim_list)
+    assert restored.shape == vec.shape
+    assert np.mean((restored - vec) ** 2) < 1e-3
+
+
+@pytest.mark.parametrize('shape', [(10,), (60, 70)])
+def test_eden_pipeline_without_torch(shape):
+    """Test that EdenPipeline compresses on the CPU with the NumPy engine."""
+    pipeline = EdenPipeline(n_bits=4)
+    data = np.random.default_rng(0).standard_normal(shape).astype(np.float32)
+
+    compressed, metadata = pipeline.forward(data)
+    restored = pipeline.backward(compressed, metadata)
+
+    assert isinstance(pipeline.transformers[0].eden, NumpyEden)
+    assert restored.shape == shape
+    assert np.mean((restored - data) ** 2) < 0.05
+
+
+def test_torch_wire_format():
+    """Test that the NumPy and torch engines decompress each other's vectors."""
+    pytest.importorskip('torch')
+    from openfl.pipelines.eden_pipeline import Eden
+
+    numpy_eden = NumpyEden(nbits=4)
+    torch_eden = Eden(nbits=4)
+    vec = np.random.default_rng(0).standard_normal(3000).astype(np.float32)
+
+    for compressor, decompressor in [(numpy_eden, torch_eden), (torch_eden, numpy_eden)]:
+        bits, scale_list, dim_list, total_dim = compressor.compress(vec, 7)
+        metadata = eden_metadata(7, scale_list, dim_list, total_dim)
+        expected = compressor.decompress(bits.copy(), metadata)
+        np.testing.assert_allclose(
+            decompressor.decompress(bits.copy(), metadata), expected, atol=1e-4
+        )
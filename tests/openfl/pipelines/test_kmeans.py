@@ -0,0 +1,46 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""One-dimensional k-means tests module."""
+
+import numpy as np
+import pytest
+
+from openfl.pipelines import kmeans
+from openfl.pipelines.kc_pipeline import KmeansTransformer
+
+
+@pytest.mark.parametrize('sample_size', [None, 1000])
+def test_kmeans_1d_separated_clusters(sample_size):
+    """Test that well separated clusters are found."""
+    rng = np.random.default_rng(0)
+    levels = np.array([-10., 0., 3., 20.])
+    labels = rng.integers(4, size=10000)
+    data = (levels[labels] + rng.uniform(-0.1, 0.1, size=10000)).astype(np.float32)
+
+    centers, found_labels = kmeans.kmeans_1d(data, 4, sample_size=sample_size)
+
+    np.testing.assert_allclose(centers, levels, atol=0.02)
+    np.testing.assert_array_equal(found_labels, labels)
+
+
+def test_kmeans_1d_few_values():
+    """Test that data with fewer distinct values than clusters is quantized exactly."""
+    data = np.array([1., 1., 2., 2., 2., 5.])
+
+    centers, labels = kmeans.kmeans_1d(data, 6)
+
+    np.testing.assert_array_equal(centers[labels], data)
+
+
+@pytest.mark.parametrize('shape', [(3,), (40, 30)])
+def test_kmeans_transformer_round_trip(shape):
+    """Test that KmeansTransformer restores the shape and quantizes to n_cluster levels."""
+    t = KmeansTransformer(n_cluster=6, sample_size=100)
+    data = np.random.default_rng(0).standard_normal(shape).astype(np.float32)
+
+    packed_codes, metadata = t.forward(data)
+    recovered = t.backward(packed_codes, metadata)
+
+    assert recovered.shape == shape
+    assert len(np.unique(recovered)) <= 6
+    assert np.mean((recovered - data) ** 2) < 0.1
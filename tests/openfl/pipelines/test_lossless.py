@@ -0,0 +1,88 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Lossless compression tests module."""
+
+import gzip as gz
+from importlib import util
+
+import numpy as np
+import pytest
+
+from openfl.pipelines import KCPipeline, lossless
+from openfl.pipelines.lossless import ChunkedCompressionTransformer
+
+CODECS = [
+    'zlib',
+    pytest.param('zstd', marks=pytest.mark.skipif(
+        util.find_spec('zstandard') is None, reason='zstandard is not installed')),
+    pytest.param('lz4', marks=pytest.mark.skipif(
+        util.find_spec('lz4') is None, reason='lz4 is not installed')),
+]
+
+
+@pytest.mark.parametrize('codec', CODECS)
+@pytest.mark.parametrize('dtype', [np.float32, np.uint8])
+@pytest.mark.parametrize('size', [0, 1, 1000, 4097])
+def test_round_trip(codec, dtype, size):
+    """Test that chunks are decompressed into the original data."""
+    t = ChunkedCompressionTransformer(codec, chunk_size=1024, n_threads=4)
+    data = (np.random.default_rng(0).standard_normal(size) * 10).astype(dtype)
+
+    compressed, metadata = t.forward(data)
+    restored = t.backward(compressed, metadata)
+
+    assert isinstance(compressed, bytes)
+    assert len(metadata['int_list']) == 3 + -(-data.nbytes // 1024)
+    assert restored.dtype == dtype
+    np.testing.assert_array_equal(restored, data)
+
+
+def test_shared_executor():
+    """Test that the transformers with the same number of threads share a thread pool."""
+    data = np.arange(4096, dtype=np.float32)
+    first, second = (ChunkedCompressionTransformer(chunk_size=1024, n_threads=3) for _ in range(2))
+
+    first.forward(data)
+    executor = lossless._executors[3]
+    compressed, metadata = second.forward(data)
+
+    assert lossless._executors[3] is executor
+    assert len(executor._threads) <= 3
+    np.testing.assert_array_equal(first.backward(compressed, metadata), data)
+
+
+def test_byte_shuffle_round_trip():
+    """Test that the bytes of each element are grouped by position and back."""
+    data = np.arange(12, dtype=np.uint8)
+
+    shuffled = lossless.byte_shuffle(data, 4)
+
+    np.testing.assert_array_equal(shuffled[:3], [0, 4, 8])
+    np.testing.assert_array_equal(lossless.byte_unshuffle(shuffled, 4), data)
+
+
+def test_backward_gzip():
+    """Test that data compressed by the GZIP transformers is still decompressed."""
+    t = ChunkedCompressionTransformer()
+    data = np.arange(6, dtype=np.float32)
+
+    restored = t.backward(gz.compress(data.tobytes()), {})
+
+    np.testing.assert_array_equal(restored, data)
+
+
+def test_unknown_codec():
+    """Test that unknown codecs are rejected."""
+    with pytest.raises(ValueError):
+        ChunkedCompressionTransformer('brotli')
+
+
+def test_pipeline_codec():
+    """Test that the lossless codec of a pipeline can be set."""
+    pipeline = KCPipeline(codec='zlib', n_threads=2)
+    data = np.random.default_rng(0).standard_normal((64, 64)).astype(np.float32)
+
+    compressed, metadata = pipeline.forward(data)
+
+    assert pipeline.transformers[-1].n_threads == 2
+    assert pipeline.backward(compressed, metadata).shape == data.shape
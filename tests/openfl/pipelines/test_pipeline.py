@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 
 from openfl.pipelines.pipeline import Float32NumpyArrayToBytes
+from openfl.pipelines.pipeline import TopKSparsityTransformer
 from openfl.pipelines.pipeline import TransformationPipeline
 from openfl.pipelines.pipeline import Transformer
 from openfl.protocols import base_pb2
@@ -86,6 +87,49 @@ def test_f32natb_backward(named_tensor):
     assert data.shape == tuple(metadata['int_list'])
 
 
+def test_topk_sparsity_round_trip():
+    """Test that TopKSparsityTransformer keeps the elements of greatest magnitude."""
+    t = TopKSparsityTransformer(p=0.25)
+    data = np.array([[0.1, -4., 0.3, 2.], [-0.2, 0.5, 3., -0.1]])
+
+    values, metadata = t.forward(data)
+
+    assert values.dtype == np.float32
+    np.testing.assert_array_equal(values, [-4., 3.])
+    assert metadata['int_list'] == [2, 2, 4, 1, 5]
+    recovered = t.backward(values, metadata)
+    np.testing.assert_array_equal(recovered, [[0., -4., 0., 0.], [0., 0., 3., 0.]])
+
+
+@pytest.mark.parametrize('data', [np.float32(2.), np.zeros(0), np.arange(3.)])
+def test_topk_sparsity_all_elements(data):
+    """Test that TopKSparsityTransformer keeps all elements of small tensors."""
+    t = TopKSparsityTransformer(p=1.)
+
+    values, metadata = t.forward(data)
+
+    np.testing.assert_array_equal(t.backward(values, metadata), data)
+
+
+def test_topk_sparsity_avoid_zeros():
+    """Test that TopKSparsityTransformer shifts the values kept when asked to avoid zeros."""
+    t = TopKSparsityTransformer(p=0.5, avoid_zeros=True)
+    data = np.array([0., -4e-7, 0., 3e-7])
+
+    values, _ = t.forward(data)
+
+    np.testing.assert_allclose(values, [-3e-7, 4e-7], rtol=1e-5)
+
+
+def test_topk_sparsity_dense_backward():
+    """Test that TopKSparsityTransformer reshapes dense tensors without indices."""
+    t = TopKSparsityTransformer()
+
+    recovered = t.backward(np.arange(6.), {'int_list': [2, 3], 'bool_list': []})
+
+    np.testing.assert_array_equal(recovered, np.arange(6.).reshape(2, 3))
+
+
 def test_transformation_pipeline_forward(named_tensor):
     """Test that TransformationPipeline.forward works correctly."""
     transformer = Float32NumpyArrayToBytes()
@@ -0,0 +1,100 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""PolicyPipeline tests module."""
+
+import numpy as np
+import pytest
+
+from openfl.pipelines import NoCompressionPipeline, PolicyPipeline, STCPipeline, TensorCodec
+from openfl.protocols import utils
+from openfl.utilities.types import TensorKey
+
+
+@pytest.fixture
+def pipeline():
+    """Initialize a policy compressing large embeddings and large float32 tensors."""
+    return PolicyPipeline(
+        rules=[
+            {
+                'pattern': '*embedding*',
+                'min_size': 1000,
+                'pipeline': {
+                    'template': 'openfl.pipelines.STCPipeline',
+                    'settings': {'p_sparsity': 0.05},
+                },
+            },
+            {
+                'dtype': 'float32',
+                'min_size': 100,
+                'pipeline': {'template': 'openfl.pipelines.KCPipeline'},
+            },
+        ]
+    )
+
+
+@pytest.mark.parametrize('tensor_name,shape,dtype,index', [
+    ('encoder.embedding.weight', (100, 20), np.float32, 0),
+    ('encoder.embedding.weight', (10, 20), np.float32, 1),
+    ('dense.weight', (100, 20), np.float32, 1),
+    ('dense.bias', (20,), np.float32, 2),
+    ('dense.weight', (100, 20), np.float64, 2),
+    (None, (100, 20), np.float32, 1),
+])
+def test_select(pipeline, tensor_name, shape, dtype, index):
+    """Test that tensors get the pipeline of the first rule they match."""
+    assert pipeline.select(np.zeros(shape, dtype=dtype), tensor_name) == index
+
+
+def test_round_trip(pipeline):
+    """Test that the pipeline index sent in the metadata decompresses the tensor."""
+    data = np.random.default_rng(0).standard_normal(20).astype(np.float32)
+
+    data_bytes, metadata = pipeline.forward(data, tensor_name='dense.bias')
+
+    assert metadata[-1] == {'int_list': [2], 'bool_list': [True]}
+    np.testing.assert_array_equal(pipeline.backward(data_bytes, metadata), data)
+    assert pipeline.is_lossy()
+
+
+def test_round_trip_through_proto(pipeline):
+    """Test that tensors of a model proto are decompressed with their pipeline."""
+    rng = np.random.default_rng(0)
+    tensor_dict = {
+        'embedding': rng.standard_normal((100, 20)).astype(np.float32),
+        'bias': rng.standard_normal(20).astype(np.float32),
+    }
+
+    model_proto = utils.construct_model_proto(tensor_dict, 0, pipeline)
+    restored, _ = utils.deconstruct_model_proto(model_proto, pipeline)
+
+    np.testing.assert_array_equal(restored['bias'], tensor_dict['bias'])
+    assert np.count_nonzero(restored['embedding']) == 100
+
+
+def test_unknown_condition():
+    """Test that rules with unknown conditions are rejected."""
+    with pytest.raises(ValueError):
+        PolicyPipeline(rules=[{'name': 'bias', 'pipeline': NoCompressionPipeline()}])
+
+
+def test_default_pipeline():
+    """Test that pipeline instances are accepted as the default."""
+    pipeline = PolicyPipeline(default=STCPipeline())
+
+    assert pipeline.select(np.zeros(4)) == 0
+    assert pipeline.is_lossy()
+    assert not PolicyPipeline().is_lossy()
+
+
+def test_tensor_codec_stats(pipeline):
+    """Test that the codec records the compression of each tensor."""
+    tensor_codec = TensorCodec(pipeline)
+    tensor_key = TensorKey('embedding', 'col1', 0, False, ('trained',))
+    data = np.random.default_rng(0).standard_normal((100, 20)).astype(np.float32)
+
+    compressed_key, data_bytes, metadata = tensor_codec.compress(tensor_key, data)
+    _, restored = tensor_codec.decompress(compressed_key, data_bytes, metadata)
+
+    assert tensor_codec.compression_stats['embedding']['ratio'] > 1
+    assert tensor_codec.compression_stats['embedding']['encode_time'] >= 0
+    assert restored.shape == data.shape
@@ -0,0 +1,40 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""RandomShiftPipeline tests module."""
+
+import numpy as np
+
+from openfl.pipelines.random_shift_pipeline import RandomShiftPipeline, RandomShiftTransformer
+
+
+def test_random_shift_round_trip():
+    """Test that the shift is drawn again from the seed sent in the metadata."""
+    pipeline = RandomShiftPipeline()
+    data = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+    data_bytes, metadata = pipeline.forward(data)
+
+    assert len(metadata[0]['int_list']) == 6
+    assert 'int_to_float' not in metadata[0]
+    assert np.frombuffer(data_bytes, dtype=np.float32).tolist() != data.reshape(-1).tolist()
+    np.testing.assert_allclose(pipeline.backward(data_bytes, metadata), data, atol=1e-5)
+
+
+def test_random_shift_seeds_differ():
+    """Test that each tensor is shifted with its own seed."""
+    t = RandomShiftTransformer()
+    data = np.zeros(4, dtype=np.float32)
+
+    first, first_metadata = t.forward(data)
+    second, second_metadata = t.forward(data)
+
+    assert first_metadata['int_list'] != second_metadata['int_list']
+    assert not np.array_equal(first, second)
+
+
+def test_random_shift_backward_element_shifts():
+    """Test that shifts sent element by element are still removed."""
+    t = RandomShiftTransformer()
+    metadata = {'int_to_float': {0: 1., 1: -2.}, 'int_list': [2], 'bool_list': []}
+
+    np.testing.assert_array_equal(t.backward(np.array([3., 3.]), metadata), [2., 5.])
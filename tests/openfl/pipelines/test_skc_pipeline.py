@@ -0,0 +1,18 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""SKCPipeline tests module."""
+
+import numpy as np
+
+from openfl.pipelines import SKCPipeline
+
+
+def test_skc_round_trip():
+    """Test that the values kept are clustered on their own and the others restored as zeros."""
+    pipeline = SKCPipeline(p_sparsity=0.5, n_clusters=2)
+    data = np.array([5., 0.1, -5., 0.2, 5., -0.1, -5., 0.], dtype=np.float32)
+
+    compressed, metadata = pipeline.forward(data)
+    recovered = pipeline.backward(compressed, metadata)
+
+    np.testing.assert_allclose(recovered, [5., 0., -5., 0., 5., 0., -5., 0.], atol=1e-6)
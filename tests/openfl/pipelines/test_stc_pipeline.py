@@ -0,0 +1,46 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""STCPipeline tests module."""
+
+import numpy as np
+import pytest
+
+from openfl.pipelines import STCPipeline
+from openfl.pipelines.pipeline import TransformationPipeline
+from openfl.pipelines.stc_pipeline import GZIPTransformer, SparsityTransformer, TernaryTransformer
+
+
+def test_stc_round_trip():
+    """Test that the values kept are ternarized to the mean magnitude of the whole tensor."""
+    pipeline = STCPipeline(p_sparsity=0.25)
+    data = np.array([[0.1, -2., 0., 0.], [0., 4., 0.5, 0.]], dtype=np.float32)
+
+    compressed, metadata = pipeline.forward(data)
+    recovered = pipeline.backward(compressed, metadata)
+
+    np.testing.assert_allclose(recovered, [[0., -0.75, 0., 0.], [0., 0.75, 0., 0.]], rtol=1e-6)
+
+
+def test_ternary_without_dense_size():
+    """Test that the mean is taken over the data when the dense size is unknown."""
+    t = TernaryTransformer()
+    data = np.array([-2., 4.], dtype=np.float32)
+
+    codes, metadata = t.forward(data)
+
+    np.testing.assert_allclose(t.backward(codes, metadata), [-3., 3.])
+
+
+def test_deprecated_transformers():
+    """Test that the dense transformers still work, with a deprecation warning."""
+    with pytest.warns(DeprecationWarning):
+        sparsity = SparsityTransformer(p=0.25)
+    with pytest.warns(DeprecationWarning):
+        gzip = GZIPTransformer()
+    pipeline = TransformationPipeline([sparsity, TernaryTransformer(), gzip])
+    data = np.array([[0.1, -2., 0., 0.], [0., 4., 0.5, 0.]], dtype=np.float32)
+
+    compressed, metadata = pipeline.forward(data)
+    recovered = pipeline.backward(compressed, metadata)
+
+    np.testing.assert_allclose(recovered, [[0., -0.75, 0., 0.], [0., 0.75, 0., 0.]], rtol=1e-6)
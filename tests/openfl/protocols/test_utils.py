@@ -0,0 +1,93 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Protocol utilities tests module."""
+
+import logging
+
+import pytest
+
+from openfl.protocols import aggregator_pb2, base_pb2, utils
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def task_results():
+    """Initialize the task results."""
+    tensors = [
+        base_pb2.NamedTensor(name=f'tensor_{i}', data_bytes=bytes([i]) * 1000)
+        for i in range(10)
+    ]
+    return aggregator_pb2.TaskResults(task_name='train', data_size=10, tensors=tensors)
+
+
+def test_datastream_round_trip(task_results):
+    """Test that a protobuf is rebuilt from its data stream."""
+    stream = list(utils.proto_to_datastream(task_results, logger, max_buffer_size=1024))
+
+    assert len(stream) > 1
+    assert stream[0].total_size == task_results.ByteSize()
+    assert all(chunk.total_size == 0 for chunk in stream[1:])
+    proto = utils.datastream_to_proto(aggregator_pb2.TaskResults(), iter(stream))
+    assert proto == task_results
+
+
+def test_datastream_without_total_size(task_results):
+    """Test that streams from senders that don't announce their size are accepted."""
+    stream = list(utils.proto_to_datastream(task_results, logger, max_buffer_size=1024))
+    stream[0].total_size = 0
+
+    proto = utils.datastream_to_proto(aggregator_pb2.TaskResults(), iter(stream))
+    assert proto == task_results
+
+
+def test_datastream_incomplete(task_results):
+    """Test that a stream shorter than announced is rejected."""
+    stream = list(utils.proto_to_datastream(task_results, logger, max_buffer_size=1024))
+
+    with pytest.raises(RuntimeError):
+        utils.datastream_to_proto(aggregator_pb2.TaskResults(), iter(stream[:-1]))
+
+
+def test_datastream_reader_overflow(task_results):
+    """Test that a stream longer than announced is rejected as soon as it overflows."""
+    stream = list(utils.proto_to_datastream(task_results, logger, max_buffer_size=1024))
+    stream[0].total_size = 1024
+    reader = utils.DataStreamReader()
+    reader.add(stream[0])
+
+    with pytest.raises(RuntimeError):
+        reader.add(stream[1])
+
+
+def test_protos_datastream_merge(task_results):
+    """Test that a stream of a header and of a message per tensor is parsed as their merge."""
+    header = aggregator_pb2.TaskResults()
+    header.CopyFrom(task_results)
+    del header.tensors[:]
+    protos = [header] + [
+        aggregator_pb2.TaskResults(tensors=[tensor]) for tensor in task_results.tensors
+    ]
+
+    stream = list(utils.protos_to_datastream(iter(protos), logger, max_buffer_size=1024))
+
+    assert all(chunk.total_size == 0 for chunk in stream)
+    proto = utils.datastream_to_proto(aggregator_pb2.TaskResults(), iter(stream))
+    assert proto == task_results
+
+
+def test_datastream_empty():
+    """Test that an empty stream is rejected."""
+    with pytest.raises(RuntimeError):
+        utils.datastream_to_proto(aggregator_pb2.TaskResults(), iter([]))
+
+
+def test_dump_proto(tmp_path):
+    """Test that dumping a model replaces the file without leaving temporary files."""
+    fpath = str(tmp_path / 'model.pbuf')
+    for round_number in range(2):
+        model = base_pb2.ModelProto(tensors=[base_pb2.NamedTensor(round_number=round_number)])
+        utils.dump_proto(model, fpath)
+
+        assert utils.load_proto(fpath) == model
+    assert [path.name for path in tmp_path.iterdir()] == ['model.pbuf']
@@ -0,0 +1,146 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""AggregatorGRPCClient tests module."""
+
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+
+import grpc
+import pytest
+
+from openfl.protocols import aggregator_pb2, aggregator_pb2_grpc, base_pb2, utils
+from openfl.transport import AggregatorGRPCClient
+from openfl.utilities import TensorKey
+
+
+class Servicer(aggregator_pb2_grpc.AggregatorServicer):
+    """Aggregator holding GetTasks requests until task results are received."""
+
+    def __init__(self):
+        self.task_results_received = Event()
+        self.get_tasks_calls = 0
+        # Holds the tensor requests until they are all in flight
+        self.tensor_requests = Barrier(1)
+
+    def header(self, request):
+        return aggregator_pb2.MessageHeader(
+            sender='aggregator', receiver=request.header.sender, federation_uuid='federation'
+        )
+
+    def GetTasks(self, request, context):  # NOQA:N802
+        self.get_tasks_calls += 1
+        assert self.task_results_received.wait(10)
+        return aggregator_pb2.GetTasksResponse(
+            header=self.header(request), round_number=1, rounds_to_train=2
+        )
+
+    def GetAggregatedTensor(self, request, context):  # NOQA:N802
+        self.tensor_requests.wait(10)
+        return aggregator_pb2.GetAggregatedTensorResponse(
+            header=self.header(request),
+            round_number=request.round_number,
+            tensor=base_pb2.NamedTensor(name=request.tensor_name),
+        )
+
+    def GetAggregatedModel(self, request, context):  # NOQA:N802
+        self.tensor_requests.wait(10)
+        for tensor_request in request.tensors:
+            yield aggregator_pb2.GetAggregatedModelResponse(
+                header=self.header(request),
+                tensors=[base_pb2.NamedTensor(name=tensor_request.tensor_name)],
+            )
+
+    def SendLocalTaskResults(self, request, context):  # NOQA:N802
+        proto = utils.datastream_to_proto(aggregator_pb2.TaskResults(), request)
+        self.task_results_received.set()
+        return aggregator_pb2.SendLocalTaskResultsResponse(header=self.header(proto))
+
+
+@pytest.fixture
+def servicer():
+    """Serve the aggregator on a free port."""
+    servicer = Servicer()
+    server = grpc.server(ThreadPoolExecutor(max_workers=8))
+    aggregator_pb2_grpc.add_AggregatorServicer_to_server(servicer, server)
+    servicer.port = server.add_insecure_port('localhost:0')
+    server.start()
+    yield servicer
+    server.stop(0)
+
+
+def make_client(port, **kwargs):
+    """Connect a client to the aggregator."""
+    return AggregatorGRPCClient(
+        'localhost',
+        port,
+        None,
+        None,
+        None,
+        use_tls=False,
+        aggregator_uuid='aggregator',
+        federation_uuid='federation',
+        resend_data_on_reconnection=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize('enable_atomic_connections', [False, True])
+def test_concurrent_calls(servicer, enable_atomic_connections):
+    """Test that a call does not close the channel of a call of another thread."""
+    client = make_client(servicer.port, enable_atomic_connections=enable_atomic_connections)
+    tensors = [base_pb2.NamedTensor(name='tensor', data_bytes=b'0' * 1000)]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        get_tasks = executor.submit(client.get_tasks, 'col1')
+        while servicer.get_tasks_calls == 0:
+            assert not get_tasks.done(), get_tasks.exception()
+        client.send_local_task_results('col1', 1, 'train', 10, tensors)
+        _, round_number, _, _ = get_tasks.result(timeout=10)
+
+    assert round_number == 1
+    assert client.rounds_to_train == 2
+    assert servicer.get_tasks_calls == 1
+    assert client._calls_in_flight == 0
+
+
+def test_reconnect_waits_for_calls(servicer):
+    """Test that reconnecting waits for the calls in flight."""
+    client = make_client(servicer.port)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        get_tasks = executor.submit(client.get_tasks, 'col1')
+        while servicer.get_tasks_calls == 0:
+            assert not get_tasks.done(), get_tasks.exception()
+        reconnect = executor.submit(client.reconnect)
+        with pytest.raises(futures.TimeoutError):
+            reconnect.result(timeout=0.2)
+        servicer.task_results_received.set()
+        _, round_number, _, _ = get_tasks.result(timeout=10)
+        reconnect.result(timeout=10)
+
+    assert round_number == 1
+
+
+def test_concurrent_fetches(servicer):
+    """Test that concurrent fetches share the channel of atomic connections."""
+    servicer.tensor_requests = Barrier(5)
+    client = make_client(servicer.port, enable_atomic_connections=True)
+    tensor_requests = [
+        (TensorKey(f'tensor_{i}', 'aggregator', 1, False, ('model',)), False) for i in range(3)
+    ]
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        model = executor.submit(client.get_aggregated_model, 'col1', tensor_requests)
+        tensors = [
+            executor.submit(client.get_aggregated_tensor, 'col1', f't{i}', 1, False, [], False)
+            for i in range(4)
+        ]
+
+        assert [tensor.name for tensor in model.result(timeout=10)] == [
+            'tensor_0',
+            'tensor_1',
+            'tensor_2',
+        ]
+        assert [tensor.result(timeout=10).name for tensor in tensors] == ['t0', 't1', 't2', 't3']
+    assert client._calls_in_flight == 0
@@ -0,0 +1,190 @@
+# Copyright (C) 2020-2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""AsyncAggregatorGRPCServer tests module."""
+
+import asyncio
+import logging
+from threading import Timer
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from openfl.databases import TensorDB
+from openfl.protocols import aggregator_pb2, base_pb2, utils
+from openfl.transport import AsyncAggregatorGRPCServer
+from openfl.utilities import TensorKey
+
+logger = logging.getLogger(__name__)
+
+TENSOR_KEY = TensorKey('tensor', 'aggregator', 1, False, ('model',))
+
+
+@pytest.fixture
+def aggregator():
+    """Initialize the aggregator mock."""
+    aggregator = mock.Mock()
+    aggregator.uuid = 'aggregator'
+    aggregator.federation_uuid = 'federation'
+    aggregator.authorized_cols = ['col1']
+    aggregator.single_col_cert_common_name = ''
+    aggregator.rounds_to_train = 3
+    aggregator.tensor_db = TensorDB()
+    aggregator.get_aggregated_tensor_key.return_value = TENSOR_KEY
+    aggregator.get_aggregated_tensor.return_value = base_pb2.NamedTensor(name='tensor')
+    return aggregator
+
+
+@pytest.fixture
+def server(aggregator):
+    """Initialize the server."""
+    server = AsyncAggregatorGRPCServer(aggregator, 50051, use_tls=False)
+    yield server
+    server.executor.shutdown()
+
+
+def header():
+    """Compose the header of a request from the collaborator."""
+    return aggregator_pb2.MessageHeader(
+        sender='col1', receiver='aggregator', federation_uuid='federation'
+    )
+
+
+def tensor_request():
+    """Compose a GetAggregatedTensor request."""
+    return aggregator_pb2.GetAggregatedTensorRequest(
+        header=header(), tensor_name='tensor', round_number=1, tags=['model']
+    )
+
+
+def test_get_tasks(server, aggregator):
+    """Test that GetTasks returns the tasks of the aggregator."""
+    aggregator.get_tasks.return_value = (['train'], 1, 0, False)
+
+    response = asyncio.run(
+        server.GetTasks(aggregator_pb2.GetTasksRequest(header=header()), mock.Mock())
+    )
+
+    aggregator.get_tasks.assert_called_once_with('col1')
+    assert [task.name for task in response.tasks] == ['train']
+    assert response.round_number == 1
+    assert response.rounds_to_train == 3
+
+
+def test_get_tasks_long_polling(server, aggregator):
+    """Test that GetTasks waits for the end of the round if there are no tasks."""
+    aggregator.get_tasks.side_effect = [(None, 0, 10, False), (['train'], 1, 0, False)]
+    aggregator.add_round_callback.side_effect = (
+        lambda round_number, callback: Timer(0.1, callback).start()
+    )
+    request = aggregator_pb2.GetTasksRequest(header=header(), wait_timeout=10)
+
+    response = asyncio.run(server.GetTasks(request, mock.Mock()))
+
+    aggregator.add_round_callback.assert_called_once()
+    aggregator.remove_round_callback.assert_called_once()
+    assert [task.name for task in response.tasks] == ['train']
+    assert response.round_number == 1
+
+
+def test_get_aggregated_tensor_waits_for_tensor(server, aggregator):
+    """Test that GetAggregatedTensor responds once the tensor is aggregated."""
+
+    async def get_aggregated_tensor():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.1, aggregator.tensor_db.cache_tensor, {TENSOR_KEY: np.ones(2)})
+        return await server.GetAggregatedTensor(tensor_request(), mock.Mock())
+
+    response = asyncio.run(get_aggregated_tensor())
+
+    assert response.tensor.name == 'tensor'
+    aggregator.get_aggregated_tensor.assert_called_once_with(
+        'col1', 'tensor', 1, False, ('model',), False
+    )
+    assert aggregator.tensor_db._tensor_callbacks == {}
+
+
+@mock.patch('openfl.transport.grpc.async_aggregator_server.AGGREGATED_TENSOR_TIMEOUT', 0.01)
+def test_get_aggregated_tensor_timeout(server, aggregator):
+    """Test that GetAggregatedTensor fails if the tensor is not aggregated in time."""
+    with pytest.raises(ValueError):
+        asyncio.run(server.GetAggregatedTensor(tensor_request(), mock.Mock()))
+
+    aggregator.get_aggregated_tensor.assert_not_called()
+    assert aggregator.tensor_db._tensor_callbacks == {}
+
+
+def test_send_local_task_results(server, aggregator):
+    """Test that SendLocalTaskResults passes the streamed results to the aggregator."""
+    tensors = [base_pb2.NamedTensor(name='tensor', data_bytes=b'0' * 1000)]
+    task_results = aggregator_pb2.TaskResults(
+        header=header(), round_number=1, task_name='train', data_size=10, tensors=tensors
+    )
+
+    async def stream():
+        for chunk in utils.proto_to_datastream(task_results, logger, max_buffer_size=256):
+            yield chunk
+
+    asyncio.run(server.SendLocalTaskResults(stream(), mock.Mock()))
+
+    aggregator.send_local_task_results.assert_called_once_with(
+        'col1', 1, 'train', 10, task_results.tensors
+    )
+
+
+def test_get_aggregated_model_streams_ready_tensors(server, aggregator):
+    """Test that GetAggregatedModel sends the ready tensors before waiting for the others."""
+    keys = {
+        name: TensorKey(name, 'aggregator', 1, False, ('model',)) for name in ('ready', 'pending')
+    }
+    aggregator.get_aggregated_tensor_key.side_effect = lambda name, *args: keys[name]
+    aggregator.get_aggregated_tensor.side_effect = lambda col, name, *args: base_pb2.NamedTensor(
+        name=name
+    )
+    aggregator.tensor_db.cache_tensor({keys['ready']: np.ones(2)})
+    request = aggregator_pb2.GetAggregatedModelRequest(
+        header=header(),
+        tensors=[
+            aggregator_pb2.TensorRequest(tensor_name=name, round_number=1, tags=['model'])
+            for name in ('ready', 'pending')
+        ],
+    )
+
+    async def get_aggregated_model():
+        responses = server.GetAggregatedModel(request, mock.Mock())
+        first = await anext(responses)
+        # The pending tensor is aggregated only after the first response
+        assert keys['pending'] not in aggregator.tensor_db
+        aggregator.tensor_db.cache_tensor({keys['pending']: np.ones(2)})
+        return [first] + [response async for response in responses]
+
+    responses = asyncio.run(get_aggregated_model())
+
+    assert [[t.name for t in response.tensors] for response in responses] == [
+        ['ready'],
+        ['pending'],
+    ]
+
+
+def test_get_aggregated_model_empty(server):
+    """Test that GetAggregatedModel responds to a request without tensors."""
+    request = aggregator_pb2.GetAggregatedModelRequest(header=header())
+
+    async def get_aggregated_model():
+        return [response async for response in server.GetAggregatedModel(request, mock.Mock())]
+
+    responses = asyncio.run(get_aggregated_model())
+
+    assert len(responses) == 1
+    assert not responses[0].tensors
+
+
+def test_send_local_task_results_empty(server):
+    """Test that SendLocalTaskResults fails on an empty stream."""
+
+    async def stream():
+        return
+        yield
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(server.SendLocalTaskResults(stream(), mock.Mock()))